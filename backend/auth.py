@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import models
 import schemas
 from db import get_db
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
-from datetime import datetime, timedelta
-from jose import jwt, JWTError
+import hashing
+from principal_cache import principal_cache, snapshot_user, attach_user
+from revocation import revocation_store
+from login_throttle import LoginThrottled, client_address, login_throttle, throttle_keys
+from datetime import datetime, timedelta, timezone
+import logging
 import os
+import secrets
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,59 +20,79 @@ JWT_SECRET = os.getenv("JWT_SECRET", "change_me")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
 
-router = APIRouter()
-
-# Argon2 hasher instance
-ph = PasswordHasher()
+# AUTH_MODE=database (default): every request resolves the user row (through
+# the principal cache). AUTH_MODE=stateless: login issues a short-lived access
+# token whose role/is_active claims are trusted by get_current_principal, plus
+# a refresh token (ACCESS_TOKEN_EXPIRE_MINUTES) that /auth/refresh exchanges
+# after re-checking the user in the database.
+AUTH_MODE = os.getenv("AUTH_MODE", "database").lower()   # database | stateless
+STATELESS_ACCESS_TOKEN_MINUTES = int(os.getenv("STATELESS_ACCESS_TOKEN_MINUTES", 5))
 
+router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # JWT TOKEN CREATION
+# (python-jose and its crypto backends are imported on first use, keeping them
+# out of app and CLI script start-up)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
+    from jose import jwt
+
     to_encode = data.copy()
     now = datetime.utcnow()
     expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
 
-    to_encode.update({"exp": expire, "iat": now})
+    to_encode.update({
+        "exp": expire,
+        # Sub-second iat so a token issued right after a revocation is not caught by it
+        "iat": now.replace(tzinfo=timezone.utc).timestamp(),
+        "jti": secrets.token_hex(16),
+    })
 
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-# PASSWORD HASHING + VERIFYING (using Argon2)
+def issue_tokens(user: models.User) -> dict:
+    """Login/refresh response for the configured AUTH_MODE"""
+    claims = {"sub": user.username, "user_id": user.id, "role": models.RoleEnum(user.role).value}
+    if AUTH_MODE != "stateless":
+        return {"access_token": create_access_token(claims), "token_type": "bearer"}
+    access_token = create_access_token(
+        dict(claims, is_active=bool(user.is_active)),
+        timedelta(minutes=STATELESS_ACCESS_TOKEN_MINUTES),
+    )
+    refresh_token = create_access_token(dict(claims, type="refresh"))
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+# PASSWORD HASHING + VERIFYING (Argon2, on the bounded pool in hashing.py)
 
 def verify_password(plain_password: str, hashed_password: str):
-    try:
-        return ph.verify(hashed_password, plain_password)
-    except VerifyMismatchError:
-        return False
+    return hashing.verify_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str):
-    return ph.hash(password)
+    return hashing.hash_password(password)
 
 
 # AUTHENTICATE USER
 
-def authenticate_user(db: Session, username: str, password: str):
-    print(f"\n[DEBUG] Attempting login for username/staff_id: '{username}'")
-    print(f"[DEBUG] Password length: {len(password)}")
-    
+def find_user(db: Session, username: str):
     # Try to find user by username or staff_id
     user = db.query(models.User).filter(
         (models.User.username == username) | (models.User.staff_id == username)
     ).first()
-    if not user:
-        print(f"[DEBUG] User not found: '{username}'")
-        return None
-    
-    print(f"[DEBUG] User found: {user.username}")
-    print(f"[DEBUG] Stored hash starts with: {user.password_hash[:30]}...")
-    
-    verification_result = verify_password(password, user.password_hash)
-    print(f"[DEBUG] Password verification result: {verification_result}")
-    
-    if not verification_result:
+    logger.debug("Login lookup", extra={"event": "auth.login", "login": username, "found": user is not None})
+    return user
+
+def update_password_hash(db: Session, user: models.User, password_hash: str):
+    user.password_hash = password_hash
+    db.commit()
+
+def authenticate_user(db: Session, username: str, password: str):
+    user = find_user(db, username)
+    if not user or not verify_password(password, user.password_hash):
         return None
     return user
 
@@ -78,50 +102,174 @@ from fastapi.security import OAuth2PasswordBearer
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        user_id: int = payload.get("user_id")
-        role: str = payload.get("role")
 
-        if username is None or user_id is None:
-            raise credentials_exception
+def decode_access_token(token: str, token_type: str = "access") -> dict:
+    from jose import jwt, JWTError
 
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    if payload.get("sub") is None or payload.get("user_id") is None:
+        raise credentials_exception()
+    # Refresh tokens are only accepted by /auth/refresh, and vice versa
+    if payload.get("type", "access") != token_type:
+        raise credentials_exception()
+    return payload
+
 
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    # Recently validated token: no JWT decode, no user query
+    if principal_cache.enabled:
+        cached = principal_cache.get(token)
+        if cached is not None:
+            user_id, snapshot, claims = cached
+            if revocation_store.is_revoked(user_id, claims.get("jti"), claims.get("iat")):
+                raise credentials_exception()
+            return attach_user(db, snapshot)
+
+    payload = decode_access_token(token)
+    user_id: int = payload["user_id"]
+    if revocation_store.is_revoked(user_id, payload.get("jti"), payload.get("iat")):
+        raise credentials_exception()
+
+    generation = principal_cache.generation(user_id)
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
 
+    if principal_cache.enabled:
+        principal_cache.put(token, user_id, snapshot_user(user), generation, payload.get("exp"),
+                            claims={"jti": payload.get("jti"), "iat": payload.get("iat")})
     return user
 
 
 def get_current_active_user(current_user: models.User = Depends(get_current_user)):
     return current_user
 
+
+class Principal:
+    """Authenticated caller built from token claims; not a database row"""
+
+    def __init__(self, id: int, username: str, role: models.RoleEnum, is_active: bool):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.is_active = is_active
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    """Caller identity for authorization checks.
+
+    In stateless mode the role/is_active claims are trusted until the token
+    expires, so this makes no database query; revocations still apply. Routes
+    that read or modify the user row should use get_current_user instead.
+    """
+    if AUTH_MODE != "stateless":
+        return get_current_user(token, db)
+
+    payload = decode_access_token(token)
+    if "is_active" not in payload:
+        # Issued in database mode (e.g. before the switch): resolve the row
+        return get_current_user(token, db)
+    user_id: int = payload["user_id"]
+    if not payload["is_active"] or revocation_store.is_revoked(user_id, payload.get("jti"), payload.get("iat")):
+        raise credentials_exception()
+    try:
+        role = models.RoleEnum(payload.get("role"))
+    except ValueError:
+        raise credentials_exception()
+    return Principal(id=user_id, username=payload["sub"], role=role, is_active=True)
+
 # LOGIN
 
+async def _call(func, *args):
+    return func(*args)
+
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: schemas.LoginForm, db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: schemas.LoginForm, request: Request, db: Session = Depends(get_db)):
+    # Throttled before any hashing; with the shared store these calls do
+    # database I/O and run on the threadpool
+    keys = throttle_keys(form_data.username, client_address(request))
+    throttle = run_in_threadpool if login_throttle.shared else _call
+    try:
+        await throttle(login_throttle.check, keys)
+    except LoginThrottled as e:
+        logger.warning("Login throttled", extra={"event": "auth.throttled", "login": form_data.username})
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, please try again later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    # The lookup runs on the request threadpool; the Argon2 check is awaited on
+    # the hashing pool so waiting logins do not hold request threads
+    user = await run_in_threadpool(find_user, db, form_data.username)
     if not user:
+        await throttle(login_throttle.record_failure, keys)
         raise HTTPException(status_code=401, detail="Invalid username or password")
-
-    access_token = create_access_token(
-        {"sub": user.username, "user_id": user.id, "role": user.role}
-    )
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    valid, new_hash = await hashing.verify_and_rehash_async(form_data.password, user.password_hash)
+    if not valid:
+        await throttle(login_throttle.record_failure, keys)
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+    await throttle(login_throttle.record_success, keys)
+    if not user.is_active:
+        raise HTTPException(status_code=403, detail="Account is deactivated")
+    if new_hash:
+        # Hash made with older Argon2 parameters: upgrade it silently
+        await run_in_threadpool(update_password_hash, db, user, new_hash)
+
+    return issue_tokens(user)
+
+# REFRESH (stateless mode)
+
+@router.post("/refresh", response_model=schemas.Token)
+def refresh(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for new tokens after re-checking the user"""
+    payload = decode_access_token(body.refresh_token, token_type="refresh")
+    user_id: int = payload["user_id"]
+    if revocation_store.is_revoked(user_id, payload.get("jti"), payload.get("iat")):
+        raise credentials_exception()
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if user is None:
+        raise credentials_exception()
+    if not user.is_active:
+        raise HTTPException(status_code=403, detail="Account is deactivated")
+
+    # Refresh tokens are single use
+    revocation_store.revoke_token(db, payload["jti"], user_id, payload["exp"])
+    db.commit()
+    return issue_tokens(user)
+
+# LOGOUT
+
+@router.post("/logout")
+def logout(
+    body: schemas.RefreshRequest | None = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: models.User = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Revoke the token used for this request (and the refresh token, if sent)"""
+    payload = decode_access_token(token)
+    if payload.get("jti"):
+        revocation_store.revoke_token(db, payload["jti"], current_user.id, payload["exp"])
+    else:
+        # Tokens issued before jti existed can only be revoked per user
+        revocation_store.revoke_user(db, current_user.id)
+    if body is not None:
+        refresh_payload = decode_access_token(body.refresh_token, token_type="refresh")
+        if refresh_payload["user_id"] == current_user.id:
+            revocation_store.revoke_token(db, refresh_payload["jti"], current_user.id, refresh_payload["exp"])
+    db.commit()
+    return {"message": "Logged out"}
 
 # PROFILE
 
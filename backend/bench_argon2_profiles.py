@@ -0,0 +1,73 @@
+"""
+Benchmark: Argon2 profiles - login verifications/sec and peak RSS.
+
+Each profile in hashing.ARGON2_PROFILES runs in its own process (so peak RSS
+is per profile) and verifies passwords on the hashing pool with
+HASH_POOL_WORKERS concurrent callers, the way a login storm does.
+
+Usage: python bench_argon2_profiles.py [seconds] [profile ...]
+Peak RSS uses the resource module (Linux/macOS).
+"""
+import json
+import os
+import subprocess
+import sys
+
+DURATION = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+
+WORKER_SCRIPT = """
+import json, resource, sys, threading, time
+import hashing
+
+duration = float(sys.argv[1])
+password_hash = hashing.hash_password("password123")
+stop = threading.Event()
+counts = []
+
+def login_client():
+    n = 0
+    while not stop.is_set():
+        assert hashing.verify_password("password123", password_hash)
+        n += 1
+    counts.append(n)
+
+threads = [threading.Thread(target=login_client) for _ in range(hashing.HASH_POOL_WORKERS)]
+started = time.perf_counter()
+for t in threads:
+    t.start()
+time.sleep(duration)
+stop.set()
+for t in threads:
+    t.join()
+elapsed = time.perf_counter() - started
+
+scale = 1024 if sys.platform == "darwin" else 1   # ru_maxrss is bytes on macOS, KiB on Linux
+print(json.dumps({
+    "params": hashing.get_argon2_params(hashing.ARGON2_PROFILE),
+    "logins_per_sec": sum(counts) / elapsed,
+    "verify_ms": hashing.hashing_pool.stats()["hash_ms_avg"],
+    "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale / 1024,
+}))
+"""
+
+def run_profile(profile):
+    env = dict(os.environ, ARGON2_PROFILE=profile)
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER_SCRIPT, str(DURATION)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    from hashing import ARGON2_PROFILES, HASH_POOL_WORKERS
+
+    profiles = sys.argv[2:] or [name for name in ARGON2_PROFILES if name != "test"]
+    print("=" * 84)
+    print(f"ARGON2 PROFILE BENCHMARK ({DURATION:.0f}s per profile, {HASH_POOL_WORKERS} hash workers, {os.cpu_count()} CPUs)")
+    print("=" * 84)
+    print(f"{'profile':<22}{'t':>3}{'m (KiB)':>10}{'p':>3}{'logins/sec':>13}{'verify ms':>11}{'peak RSS MiB':>14}")
+    for profile in profiles:
+        result = run_profile(profile)
+        params = result["params"]
+        print(f"{profile:<22}{params['time_cost']:>3}{params['memory_cost']:>10}{params['parallelism']:>3}"
+              f"{result['logins_per_sec']:>13.1f}{result['verify_ms']:>11.1f}{result['peak_rss_mib']:>14.1f}")
@@ -0,0 +1,63 @@
+"""
+Benchmark: worker cold start.
+
+Starts N worker processes at once against a fresh throwaway SQLite database,
+the way `uvicorn --workers N` does. Each one imports main and runs the app
+lifespan; the script reports per-worker import and bootstrap times for:
+  auto - every worker bootstraps from the lifespan (under the database lock)
+  off  - `python bootstrap.py` ran first, workers skip the bootstrap
+
+Usage: python bench_cold_start.py [workers]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+WORKER_SCRIPT = """
+import asyncio, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+async def boot():
+    async with main.lifespan(main.app):
+        pass
+asyncio.run(boot())
+print(f"{(imported - started) * 1000:.1f} {(time.perf_counter() - imported) * 1000:.1f}")
+"""
+
+def start_workers(env):
+    workers = [
+        subprocess.Popen([sys.executable, "-c", WORKER_SCRIPT], env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(WORKERS)
+    ]
+    timings = []
+    for worker in workers:
+        output = worker.communicate()[0].strip().splitlines()
+        import_ms, startup_ms = map(float, output[-1].split())
+        timings.append((import_ms, startup_ms))
+    return timings
+
+def fresh_env(mode):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="inspectra_bench_"), "bench.db")
+    return dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", STARTUP_BOOTSTRAP=mode)
+
+def report(label, timings):
+    imports = [t[0] for t in timings]
+    startups = [t[1] for t in timings]
+    print(f"{label:<34}{statistics.median(imports):>12.1f}{statistics.median(startups):>12.1f}{max(startups):>12.1f}")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(f"COLD START BENCHMARK ({WORKERS} concurrent workers, fresh database)")
+    print("=" * 70)
+    print(f"{'mode':<34}{'import ms':>12}{'startup ms':>12}{'max ms':>12}")
+
+    report("auto (bootstrap in lifespan)", start_workers(fresh_env("auto")))
+
+    env = fresh_env("off")
+    subprocess.run([sys.executable, "bootstrap.py"], env=env, check=True, stdout=subprocess.DEVNULL)
+    report("off (after python bootstrap.py)", start_workers(env))
@@ -0,0 +1,182 @@
+"""
+Benchmark: /dashboard/stats, four separate COUNT queries over inspections,
+one conditional-aggregation pass over inspections, the maintained
+inspection_counters table (compute_dashboard_stats, bypassing the cache) and
+the route itself, whose repeated polls are served by stats_cache.
+
+Seeds a throwaway SQLite database with 1M inspections spread over two years
+and 50 inspectors (counters built with inspection_counters.rebuild), checks
+that every variant returns the same numbers, then times each for a manager
+and an inspector over several periods.
+
+Usage: python bench_dashboard_stats.py [inspections] [runs]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, case, func, text
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, create_db_engine
+import models
+import dashboard
+import inspection_counters
+from query_stats import track_queries
+from stats_cache import stats_cache
+
+INSPECTIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+RUNS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+INSPECTORS = 50
+STATUSES = ("scheduled", "pending_review", "completed", "rejected")
+
+def seed(engine):
+    Base.metadata.create_all(bind=engine)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO users (id, username, staff_id, password_hash, role, is_active) "
+                 "VALUES (:id, :username, :staff_id, 'x', :role, 1)"),
+            [{"id": 1, "username": "manager", "staff_id": "S001", "role": "manager"}] + [
+                {"id": i, "username": f"inspector{i}", "staff_id": f"S{i:03d}", "role": "inspector"}
+                for i in range(2, INSPECTORS + 2)
+            ],
+        )
+        batch = []
+        for i in range(INSPECTIONS):
+            day = today - timedelta(days=i % 730)
+            batch.append({
+                "title": f"Inspection {i}",
+                "status": STATUSES[i % 4],
+                "scheduled_date": day + timedelta(days=7),
+                "completion_date": day + timedelta(days=3) if i % 4 == 2 else None,
+                "inspector_id": 2 + i % INSPECTORS,
+                "created_at": datetime.combine(day, datetime.min.time()) + timedelta(seconds=i % 86400),
+            })
+            if len(batch) == 50_000:
+                insert_inspections(conn, batch)
+                batch = []
+        if batch:
+            insert_inspections(conn, batch)
+        inspection_counters.rebuild(conn)
+
+def insert_inspections(conn, rows):
+    conn.execute(text(
+        "INSERT INTO inspections (title, location, status, scheduled_date, completion_date, inspector_id, "
+        "rejection_count, created_at) VALUES (:title, 'Building A', :status, :scheduled_date, :completion_date, "
+        ":inspector_id, 0, :created_at)"
+    ), rows)
+
+def four_counts(db, current_user, period):
+    """The previous implementation: one COUNT(*) per figure"""
+    start_date = dashboard.get_start_date_from_period(period)
+    query = db.query(models.Inspection)
+    if current_user.role == models.RoleEnum.inspector:
+        query = query.filter(models.Inspection.inspector_id == current_user.id)
+    total_query = query
+    if start_date:
+        total_query = total_query.filter(models.Inspection.created_at >= start_date)
+    completed_query = query.filter(models.Inspection.status == models.InspectionStatusEnum.completed)
+    if start_date:
+        completed_query = completed_query.filter(models.Inspection.completion_date >= start_date)
+    scheduled_query = query.filter(models.Inspection.status == models.InspectionStatusEnum.scheduled)
+    if start_date:
+        scheduled_query = scheduled_query.filter(models.Inspection.scheduled_date >= start_date)
+    pending_query = query.filter(models.Inspection.status == models.InspectionStatusEnum.pending_review)
+    if start_date:
+        pending_query = pending_query.filter(models.Inspection.created_at >= start_date)
+    completed = completed_query.count()
+    return {
+        "total_inspections": total_query.count(),
+        "reports_generated": completed,
+        "pending_review": pending_query.count(),
+        "completed": completed,
+        "scheduled": scheduled_query.count(),
+        "filter_period": period,
+    }
+
+def single_pass(db, current_user, period):
+    """One COUNT(CASE ...) per figure in a single scan of inspections"""
+    start_date = dashboard.get_start_date_from_period(period)
+
+    def count_in_period(period_column, *conditions):
+        if start_date is not None:
+            conditions += (period_column >= start_date,)
+        return func.count(case((and_(*conditions), 1))) if conditions else func.count()
+
+    Inspection, Status = models.Inspection, models.InspectionStatusEnum
+    query = db.query(
+        count_in_period(Inspection.created_at).label("total"),
+        count_in_period(Inspection.completion_date, Inspection.status == Status.completed).label("completed"),
+        count_in_period(Inspection.scheduled_date, Inspection.status == Status.scheduled).label("scheduled"),
+        count_in_period(Inspection.created_at, Inspection.status == Status.pending_review).label("pending_review"),
+    ).select_from(Inspection)
+    if current_user.role == models.RoleEnum.inspector:
+        query = query.filter(Inspection.inspector_id == current_user.id)
+    counts = query.one()
+    return {
+        "total_inspections": counts.total,
+        "reports_generated": counts.completed,
+        "pending_review": counts.pending_review,
+        "completed": counts.completed,
+        "scheduled": counts.scheduled,
+        "filter_period": period,
+    }
+
+def counters(db, current_user, period):
+    """Every call reads inspection_counters (no stats cache)"""
+    inspector_id = current_user.id if current_user.role == models.RoleEnum.inspector else None
+    return dashboard.compute_dashboard_stats(db, period, dashboard.get_start_date_from_period(period), inspector_id)
+
+def cached_route(db, current_user, period):
+    """The route: the first call per period fills stats_cache, later ones are hits"""
+    return dashboard.get_dashboard_stats(period=period, current_user=current_user, db=db)
+
+def measure(Session, fn, user, period):
+    """Median latency over RUNS runs plus the statements one call issues"""
+    timings = []
+    for _ in range(RUNS):
+        db = Session()
+        started = time.perf_counter()
+        result = fn(db, user, period)
+        timings.append((time.perf_counter() - started) * 1000)
+        db.close()
+    db = Session()
+    with track_queries() as stats:
+        fn(db, user, period)
+    db.close()
+    return result, statistics.median(timings), stats.count
+
+if __name__ == "__main__":
+    db_path = os.path.join(tempfile.mkdtemp(prefix="inspectra_bench_"), "bench.db")
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    print(f"Seeding {INSPECTIONS} inspections...")
+    seed(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    manager_user, inspector_user = db.get(models.User, 1), db.get(models.User, 2)
+    db.expunge_all()
+    db.close()
+
+    stats_cache.clear()
+    variants = [("4 x COUNT", four_counts), ("1 pass", single_pass), ("counters", counters),
+                ("cached route", cached_route)]
+    print("=" * 94)
+    print(f"DASHBOARD STATS BENCHMARK ({INSPECTIONS} inspections, median ms of {RUNS} runs)")
+    print("=" * 94)
+    print(f"{'caller':<12}{'period':<8}" + "".join(f"{label:>16}" for label, _ in variants))
+    mismatches = 0
+    for user in (manager_user, inspector_user):
+        for period in ("all", "year", "month"):
+            results = [measure(Session, fn, user, period) for _, fn in variants]
+            for (label, _), (result, _, _) in zip(variants[1:], results[1:]):
+                if result != results[0][0]:
+                    mismatches += 1
+                    print(f"❌ {label} differs for {user.username}/{period}: {result} != {results[0][0]}")
+            print(f"{user.role.value:<12}{period:<8}" + "".join(
+                f"{f'{ms:.1f} ({queries}q)':>16}" for _, ms, queries in results))
+    print(f"\n{'✅ Identical results for every caller and period' if not mismatches else f'❌ {mismatches} mismatch(es)'}")
+    raise SystemExit(1 if mismatches else 0)
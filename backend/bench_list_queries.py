@@ -0,0 +1,112 @@
+"""
+Benchmark: inspection list endpoints, full ORM entity loads versus the
+column-projected queries the routes now use.
+
+Seeds a throwaway SQLite database with 100k inspections carrying realistic
+report findings/recommendations and rejection feedback, then times each
+variant and records its peak Python memory (tracemalloc).
+
+Usage: python bench_list_queries.py [inspections] [runs]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from fastapi import Response
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, create_db_engine
+import models
+import dashboard
+import manager
+
+INSPECTIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+RUNS = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+FINDINGS = "Corrosion observed on flange bolts; thickness readings within tolerance. " * 10
+
+def seed(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, staff_id, password_hash, role, is_active) "
+            "VALUES (1, 'manager', 'S001', 'x', 'manager', 1), (2, 'inspector', 'S002', 'x', 'inspector', 1)"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO inspections (title, location, status, scheduled_date, completion_date, inspector_id, "
+                "notes, report_findings, report_recommendations, rejection_feedback, rejection_count, created_at) "
+                "VALUES (:title, 'Building A', :status, :scheduled_date, :scheduled_date, 2, 'Routine check', "
+                ":findings, :findings, :findings, 0, CURRENT_TIMESTAMP)"
+            ),
+            [
+                {
+                    "title": f"Inspection {i}",
+                    "status": ("scheduled", "pending_review", "completed", "rejected")[i % 4],
+                    "scheduled_date": date(2025, 1, 1) + timedelta(days=i % 365),
+                    "findings": FINDINGS,
+                }
+                for i in range(INSPECTIONS)
+            ],
+        )
+
+def full_entities(db):
+    """The previous implementation: load every Inspection entity"""
+    inspections = db.query(models.Inspection).order_by(
+        models.Inspection.scheduled_date.desc(),
+        models.Inspection.created_at.desc()
+    ).all()
+    return [{
+        "id": insp.id,
+        "title": insp.title,
+        "location": insp.location,
+        "status": insp.status.value,
+        "scheduled_date": insp.scheduled_date.isoformat() if insp.scheduled_date else None,
+        "completion_date": insp.completion_date.isoformat() if insp.completion_date else None,
+        "notes": insp.notes,
+        "created_at": insp.created_at.isoformat()
+    } for insp in inspections]
+
+def measure(Session, fn):
+    """Median latency over RUNS untraced runs, then one traced run for peak memory"""
+    timings = []
+    for _ in range(RUNS):
+        db = Session()
+        started = time.perf_counter()
+        rows = fn(db)
+        timings.append((time.perf_counter() - started) * 1000)
+        db.close()
+
+    db = Session()
+    tracemalloc.start()
+    fn(db)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.close()
+    return len(rows), statistics.median(timings), peak / (1024 * 1024)
+
+if __name__ == "__main__":
+    db_path = os.path.join(tempfile.mkdtemp(prefix="inspectra_bench_"), "bench.db")
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    print(f"Seeding {INSPECTIONS} inspections...")
+    seed(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    manager_user = Session().get(models.User, 1)
+
+    variants = [
+        ("ORM entities (before)", full_entities),
+        ("/dashboard/inspections/all", lambda db: dashboard.get_all_inspections(response=Response(), current_user=manager_user, db=db)),
+        ("/manager/inspections", lambda db: manager.get_all_inspections(response=Response(), db=db)),
+    ]
+
+    print("=" * 72)
+    print(f"LIST QUERY BENCHMARK ({INSPECTIONS} inspections, median of {RUNS} runs)")
+    print("=" * 72)
+    print(f"{'variant':<32}{'rows':>10}{'ms':>12}{'peak MiB':>12}")
+    for label, fn in variants:
+        rows, ms, peak = measure(Session, fn)
+        print(f"{label:<32}{rows:>10}{ms:>12.1f}{peak:>12.1f}")
@@ -0,0 +1,100 @@
+"""
+Benchmark: shift-start login storm.
+
+Fires concurrent logins at the app (in-process, over ASGI) while a second set
+of clients keeps calling a cheap authenticated endpoint, and reports login
+latency, 503 rejections and the other endpoint's latency during the storm,
+plus the hashing pool stats (as reported on /metrics).
+
+Usage: python bench_login_storm.py [logins] [concurrency]
+Pool size/limits come from HASH_POOL_WORKERS / HASH_POOL_MAX_QUEUE.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Throwaway database - must be set before db.py is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='inspectra_bench_'), 'bench.db')}"
+
+import httpx
+
+from db import SessionLocal
+from bootstrap import bootstrap_database
+from auth import get_password_hash
+from hashing import hashing_pool
+import models
+import main
+
+LOGINS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+PASSWORD = "password123"
+
+def seed():
+    bootstrap_database()
+    db = SessionLocal()
+    password_hash = get_password_hash(PASSWORD)
+    db.add_all([
+        models.User(username=f"inspector{i}", staff_id=f"S{i + 1:03d}", password_hash=password_hash,
+                    role=models.RoleEnum.inspector)
+        for i in range(CONCURRENCY)
+    ])
+    db.commit()
+    db.close()
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+async def main_async():
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/auth/login", json={"username": "inspector0", "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        login_ms, statuses, other_ms = [], {}, []
+        remaining = iter(range(LOGINS))
+        storm_over = asyncio.Event()
+
+        async def login_client():
+            for i in remaining:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/auth/login", json={"username": f"inspector{i % CONCURRENCY}", "password": PASSWORD}
+                )
+                login_ms.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def other_client():
+            while not storm_over.is_set():
+                started = time.perf_counter()
+                await client.get("/api/locations", headers=headers)
+                other_ms.append((time.perf_counter() - started) * 1000)
+
+        others = [asyncio.create_task(other_client()) for _ in range(4)]
+        started = time.perf_counter()
+        await asyncio.gather(*(login_client() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+        storm_over.set()
+        await asyncio.gather(*others)
+
+        metrics = hashing_pool.stats()   # same process; /metrics needs a manager token
+
+    print("=" * 70)
+    print(f"LOGIN STORM ({LOGINS} logins, {CONCURRENCY} concurrent, "
+          f"{metrics['workers']} hash workers, queue {metrics['max_queue']})")
+    print("=" * 70)
+    print(f"Logins/sec:               {LOGINS / elapsed:.1f}")
+    print(f"Login status codes:       {dict(sorted(statuses.items()))}")
+    print(f"Login p50 / p99:          {statistics.median(login_ms):.1f} / {percentile(login_ms, 0.99):.1f} ms")
+    print(f"Other endpoint p50 / p99: {statistics.median(other_ms):.1f} / {percentile(other_ms, 0.99):.1f} ms "
+          f"({len(other_ms)} requests)")
+    print(f"Hash ms avg / p95:        {metrics['hash_ms_avg']} / {metrics['hash_ms_p95']}")
+    print(f"Queue wait ms avg / p95:  {metrics['queue_wait_ms_avg']} / {metrics['queue_wait_ms_p95']}")
+    print(f"Rejected (503):           {metrics['rejected']}")
+
+if __name__ == "__main__":
+    seed()
+    asyncio.run(main_async())
@@ -0,0 +1,119 @@
+"""
+Benchmark: dashboard-style read throughput while messages are being written.
+Runs each SQLite connection profile from db.py against a throwaway database
+and reports reads/sec, writes/sec and "database is locked" errors.
+
+Usage: python bench_sqlite_profile.py [seconds] [reader_threads]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from db import Base, SQLITE_PROFILES, apply_sqlite_profile
+import models
+
+DURATION = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+READERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+SEED_INSPECTIONS = 20000
+
+def seed(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, staff_id, password_hash, role, is_active) "
+            "VALUES (1, 'manager', 'S001', 'x', 'manager', 1), (2, 'inspector', 'S002', 'x', 'inspector', 1)"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO inspections (title, location, status, scheduled_date, inspector_id, rejection_count) "
+                "VALUES (:title, 'Building A', :status, :scheduled_date, 2, 0)"
+            ),
+            [
+                {
+                    "title": f"Inspection {i}",
+                    "status": ("scheduled", "pending_review", "completed")[i % 3],
+                    "scheduled_date": date(2025, 1 + i % 12, 1 + i % 28),
+                }
+                for i in range(SEED_INSPECTIONS)
+            ],
+        )
+
+def run_profile(profile: str):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="inspectra_bench_"), "bench.db")
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        pool_size=READERS + 2,
+    )
+    apply_sqlite_profile(engine, profile)
+    seed(engine)
+
+    stop = threading.Event()
+    counters = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counters[key] += 1
+
+    def writer():
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        "INSERT INTO messages (sender_id, receiver_id, content, status) "
+                        "VALUES (1, 2, 'benchmark message', 'unread')"
+                    ))
+                    conn.execute(text(
+                        "UPDATE messages SET status = 'read' WHERE receiver_id = 2 AND status = 'unread'"
+                    ))
+                bump("writes")
+            except OperationalError:
+                bump("locked")
+
+    def reader():
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text(
+                        "SELECT status, COUNT(*) FROM inspections WHERE inspector_id = 2 GROUP BY status"
+                    )).all()
+                    conn.execute(text(
+                        "SELECT COUNT(*) FROM messages WHERE receiver_id = 2 AND status = 'unread'"
+                    )).scalar()
+                bump("reads")
+            except OperationalError:
+                bump("locked")
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(READERS)]
+    for t in threads:
+        t.start()
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    return {
+        "reads_per_sec": counters["reads"] / DURATION,
+        "writes_per_sec": counters["writes"] / DURATION,
+        "locked_errors": counters["locked"],
+    }
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(f"SQLITE PROFILE BENCHMARK ({DURATION:.0f}s, 1 writer + {READERS} readers)")
+    print("=" * 70)
+    print(f"{'profile':<14}{'reads/sec':>14}{'writes/sec':>14}{'locked errors':>16}")
+    for profile in SQLITE_PROFILES:
+        result = run_profile(profile)
+        print(
+            f"{profile:<14}{result['reads_per_sec']:>14.1f}"
+            f"{result['writes_per_sec']:>14.1f}{result['locked_errors']:>16}"
+        )
@@ -0,0 +1,84 @@
+"""
+Benchmark: import-time startup cost, with a regression threshold.
+
+For the app (`import main`) and the CLI scripts' common imports
+(`import db, models`) this reports:
+- median wall time of a fresh interpreter doing the import
+- the import-time profile (python -X importtime) grouped by top-level package
+- whether any module that should load lazily (LAZY_MODULES) was imported
+
+Exits non-zero when a median exceeds its budget or a lazy module is loaded
+eagerly, so it can run as a CI check.
+
+Usage: python bench_startup.py [runs]
+Budgets: STARTUP_BUDGET_MS (main, default 1500), CLI_STARTUP_BUDGET_MS (default 800)
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 1500))
+CLI_STARTUP_BUDGET_MS = float(os.getenv("CLI_STARTUP_BUDGET_MS", 800))
+
+# Only needed once a request hashes a password, issues/decodes a token or renders a PDF
+LAZY_MODULES = ("argon2", "jose", "fpdf")
+
+TARGETS = [
+    ("main", "import main", STARTUP_BUDGET_MS),
+    ("db + models", "import db, models", CLI_STARTUP_BUDGET_MS),
+]
+
+def wall_time_ms(statement):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - started) * 1000
+
+def import_profile(statement):
+    """Self time (ms) per top-level package, from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    packages = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us) / 1000
+    return packages
+
+def eagerly_loaded(statement):
+    check = f"import sys; {statement}; print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"STARTUP BENCHMARK (median of {RUNS} runs)")
+    print("=" * 60)
+    failures = 0
+    baseline = statistics.median(wall_time_ms("pass") for _ in range(RUNS))
+    print(f"Interpreter start: {baseline:.0f} ms\n")
+
+    for label, statement, budget in TARGETS:
+        median = statistics.median(wall_time_ms(statement) for _ in range(RUNS))
+        over_budget = median > budget
+        print(f"{'❌' if over_budget else '✓'} {label}: {median:.0f} ms (budget {budget:.0f} ms)")
+
+        packages = import_profile(statement)
+        print(f"   import time {sum(packages.values()):.0f} ms, top packages:")
+        for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:8]:
+            print(f"     {package:<24}{ms:>8.1f} ms")
+
+        loaded = eagerly_loaded(statement)
+        if loaded:
+            print(f"   ❌ loaded eagerly: {', '.join(loaded)}")
+        failures += over_budget + bool(loaded)
+        print()
+
+    print("✅ Startup within budget" if not failures else f"❌ {failures} startup check(s) failed")
+    raise SystemExit(1 if failures else 0)
@@ -0,0 +1,97 @@
+"""
+Benchmark: latency of other endpoints while large uploads are in progress.
+Measures p50/p99 of /health and /messaging/unread-count first on an idle
+server, then while several clients upload large attachments to
+/messaging/send. With the async upload path the two runs should be close.
+
+Start the backend first (python -m uvicorn main:app --port 8000), then:
+    python bench_upload_latency.py [upload_mb] [uploaders] [seconds]
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+BASE_URL = os.getenv("BENCH_BASE_URL", "http://127.0.0.1:8000")
+USERNAME = os.getenv("BENCH_USERNAME", "manager")
+PASSWORD = os.getenv("BENCH_PASSWORD", "manager123")
+
+UPLOAD_MB = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+UPLOADERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+DURATION = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+
+def login():
+    response = requests.post(f"{BASE_URL}/auth/login", json={"username": USERNAME, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def probe(headers, stop, samples):
+    """Hit cheap endpoints back to back and record their latency in ms"""
+    session = requests.Session()
+    while not stop.is_set():
+        for path in ("/health", "/messaging/unread-count"):
+            started = time.perf_counter()
+            session.get(f"{BASE_URL}{path}", headers=headers)
+            samples.append((time.perf_counter() - started) * 1000)
+
+def upload(headers, receiver_id, payload, stop, counter):
+    session = requests.Session()
+    while not stop.is_set():
+        response = session.post(
+            f"{BASE_URL}/messaging/send",
+            headers=headers,
+            data={"receiver_id": receiver_id, "content": "upload benchmark"},
+            files={"attachment": ("bench.bin", payload, "application/octet-stream")},
+        )
+        if response.status_code == 200:
+            counter.append(1)
+
+def run(headers, receiver_id=None, payload=None):
+    stop = threading.Event()
+    samples, uploads = [], []
+    threads = [threading.Thread(target=probe, args=(headers, stop, samples))]
+    if payload is not None:
+        threads += [
+            threading.Thread(target=upload, args=(headers, receiver_id, payload, stop, uploads))
+            for _ in range(UPLOADERS)
+        ]
+    for t in threads:
+        t.start()
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    return samples, len(uploads)
+
+def report(label, samples, uploads=None):
+    line = (f"{label:<22} requests={len(samples):>6}  p50={statistics.median(samples):7.1f} ms"
+            f"  p99={percentile(samples, 99):7.1f} ms  max={max(samples):7.1f} ms")
+    if uploads is not None:
+        line += f"  uploads={uploads}"
+    print(line)
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(f"UPLOAD LATENCY BENCHMARK ({UPLOADERS} x {UPLOAD_MB} MB uploads, {DURATION:.0f}s per run)")
+    print("=" * 70)
+
+    headers = login()
+    users = requests.get(f"{BASE_URL}/messaging/users", headers=headers).json()
+    if not users:
+        print("❌ Need at least one other user to send attachments to")
+        sys.exit(1)
+
+    payload = os.urandom(UPLOAD_MB * 1024 * 1024)
+    idle_samples, _ = run(headers)
+    busy_samples, uploads = run(headers, users[0]["id"], payload)
+
+    report("idle", idle_samples)
+    report("during uploads", busy_samples, uploads)
+    print(f"\np99 change: {percentile(busy_samples, 99) - percentile(idle_samples, 99):+.1f} ms")
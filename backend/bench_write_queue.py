@@ -0,0 +1,129 @@
+"""
+Benchmark: writes/sec for concurrent messaging writes, one commit per write
+versus the group-commit write queue (write_queue.py).
+
+Each client thread sends a message and marks an earlier one read, in a loop.
+Runs against a throwaway SQLite database for the "wal" and "wal_durable"
+connection profiles.
+
+Usage: python bench_write_queue.py [seconds] [client_threads]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, apply_sqlite_profile
+from write_queue import WriteQueue, enable_sqlite_savepoints
+import models
+
+DURATION = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+CLIENTS = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+def make_engine(db_path, profile, pool_size):
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    return apply_sqlite_profile(engine, profile)
+
+def new_database(profile):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="inspectra_bench_"), "bench.db")
+    engine = make_engine(db_path, profile, 1)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, staff_id, password_hash, role, is_active) "
+            "VALUES (1, 'manager', 'S001', 'x', 'manager', 1), (2, 'inspector', 'S002', 'x', 'inspector', 1)"
+        ))
+    engine.dispose()
+    return db_path
+
+def message_write(n):
+    """One 'send + mark read' unit of work, as the messaging routes do it"""
+    def write(session):
+        session.add(models.Message(
+            thread_id="user_1_2", sender_id=1, receiver_id=2,
+            content=f"benchmark message {n}", status=models.MessageStatusEnum.unread,
+        ))
+        session.query(models.Message).filter(models.Message.id == n // 2 + 1).update(
+            {"status": models.MessageStatusEnum.read, "read_at": datetime.now()}
+        )
+        return n
+    return write
+
+def run(execute):
+    stop = threading.Event()
+    latencies, lock, errors = [], threading.Lock(), []
+
+    def client(offset):
+        n = offset
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                execute(message_write(n))
+            except Exception as e:
+                errors.append(e)
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+            n += CLIENTS
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    return latencies, errors
+
+def bench_direct(profile):
+    engine = make_engine(new_database(profile), profile, CLIENTS)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    def execute(fn):
+        session = Session()
+        try:
+            fn(session)
+            session.commit()
+        finally:
+            session.close()
+
+    result = run(execute)
+    engine.dispose()
+    return result, None
+
+def bench_queue(profile):
+    engine = enable_sqlite_savepoints(make_engine(new_database(profile), profile, 1))
+    write_queue = WriteQueue(engine)
+    result = run(lambda fn: write_queue.submit(fn).result())
+    return result, write_queue.stats()
+
+def report(label, latencies, errors, stats):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0
+    line = (f"{label:<26}{len(latencies) / DURATION:>12.0f}"
+            f"{statistics.median(latencies) if latencies else 0:>12.2f}{p99:>12.2f}{len(errors):>9}")
+    if stats:
+        line += f"   avg batch {stats['avg_batch_size']}"
+    print(line)
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print(f"WRITE QUEUE BENCHMARK ({DURATION:.0f}s, {CLIENTS} concurrent clients)")
+    print("=" * 80)
+    print(f"{'mode':<26}{'writes/sec':>12}{'p50 ms':>12}{'p99 ms':>12}{'errors':>9}")
+    for profile in ("wal", "wal_durable"):
+        (latencies, errors), stats = bench_direct(profile)
+        report(f"{profile} / commit each", latencies, errors, stats)
+        (latencies, errors), stats = bench_queue(profile)
+        report(f"{profile} / write queue", latencies, errors, stats)
@@ -0,0 +1,102 @@
+"""
+Database Bootstrap
+Creates missing tables, seeds default data (locations) and fills the
+inspection counters of databases that predate them.
+
+Nothing here runs at import time. Either:
+- run it once as a release step:  python bootstrap.py
+  (applies pending migrations, then seeds) and start workers with
+  STARTUP_BOOTSTRAP=off so they boot without touching the database, or
+- leave STARTUP_BOOTSTRAP=auto (default) and every worker runs it from the
+  app lifespan. A database lock (BEGIN IMMEDIATE on SQLite, an advisory lock
+  on PostgreSQL) makes concurrent workers take turns, so seeding happens once.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import func, insert, select, text
+
+from db import engine, is_sqlite_url
+import inspection_counters
+import models
+
+STARTUP_BOOTSTRAP = os.getenv("STARTUP_BOOTSTRAP", "auto").lower()   # auto | off
+BOOTSTRAP_LOCK_KEY = 7316001   # pg_advisory_xact_lock key
+
+DEFAULT_LOCATIONS = [
+    {"name": "Building A - Floor 1", "description": "Ground floor of Building A"},
+    {"name": "Building A - Floor 2", "description": "Second floor of Building A"},
+    {"name": "Building A - Floor 3", "description": "Third floor of Building A"},
+    {"name": "Building B - Floor 1", "description": "Ground floor of Building B"},
+    {"name": "Building B - Floor 2", "description": "Second floor of Building B"},
+    {"name": "Parking Area", "description": "Main parking lot"},
+    {"name": "Roof Access", "description": "Roof and rooftop equipment"},
+    {"name": "Basement", "description": "Underground basement area"},
+]
+
+logger = logging.getLogger(__name__)
+
+_bootstrapped = False
+
+@contextmanager
+def bootstrap_lock(engine=engine):
+    """One transaction holding a cross-process lock for the whole bootstrap"""
+    with engine.connect() as conn:
+        if is_sqlite_url(str(engine.url)):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        elif engine.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        yield conn
+        conn.commit()
+
+def init_default_locations(conn) -> bool:
+    """Seed the default locations into an empty locations table"""
+    count = conn.execute(select(func.count()).select_from(models.Location.__table__)).scalar()
+    if count:
+        return False
+    conn.execute(insert(models.Location.__table__), [dict(loc, is_active=1) for loc in DEFAULT_LOCATIONS])
+    logger.info("Default locations initialized", extra={"count": len(DEFAULT_LOCATIONS)})
+    return True
+
+def init_inspection_counters(conn) -> bool:
+    """Rebuild the inspection counters when exactly one of the two tables is empty:
+    counters not built yet, or counters left behind by a bulk delete of inspections"""
+    has_counters = conn.execute(select(models.InspectionCounter.id).limit(1)).first() is not None
+    has_inspections = conn.execute(select(models.Inspection.id).limit(1)).first() is not None
+    if has_counters == has_inspections:
+        return False
+    inspection_counters.rebuild(conn)
+    return True
+
+def bootstrap_database(engine=engine):
+    """Create missing tables and seed default data, once per process"""
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    with bootstrap_lock(engine) as conn:
+        models.Base.metadata.create_all(bind=conn)
+        init_default_locations(conn)
+        init_inspection_counters(conn)
+    _bootstrapped = True
+
+def startup(engine=engine) -> float:
+    """Lifespan hook: bootstrap unless STARTUP_BOOTSTRAP=off. Returns the time spent (ms)."""
+    if STARTUP_BOOTSTRAP == "off":
+        return 0.0
+    started = time.perf_counter()
+    bootstrap_database(engine)
+    return (time.perf_counter() - started) * 1000
+
+if __name__ == "__main__":
+    import migrations
+    from logging_config import setup_logging
+
+    setup_logging()
+    print("=" * 60)
+    print("DATABASE BOOTSTRAP")
+    print("=" * 60)
+    migrations.upgrade(engine)
+    bootstrap_database(engine)
+    print("✅ Bootstrap complete - workers can run with STARTUP_BOOTSTRAP=off")
@@ -0,0 +1,149 @@
+"""
+Shared scaffolding for the check files (test_*.py).
+Each check file gets a throwaway database with the app's connection profile
+(created on first use, not at import), the same seeded users, and a
+`python test_x.py` entry point that runs the file through pytest and prints
+one ✓/❌ line per check. Fixtures that point the process-wide stores at the
+file's database live in conftest.py.
+
+By default the database is a temporary SQLite file. With a PostgreSQL
+TEST_DATABASE_URL each check file gets its own schema on that database,
+dropped afterwards; checks marked SQLITE_ONLY (query plans) are skipped.
+"""
+import os
+import secrets
+import tempfile
+
+import pytest
+from sqlalchemy import event, func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, create_db_engine, is_sqlite_url, to_async_url
+import models
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+CHECKS_ON_SQLITE = not TEST_DATABASE_URL or is_sqlite_url(TEST_DATABASE_URL)
+
+SQLITE_ONLY = pytest.mark.skipif(not CHECKS_ON_SQLITE, reason="SQLite-specific (TEST_DATABASE_URL is not SQLite)")
+
+class CheckDatabase:
+    """Throwaway database (SQLite file or PostgreSQL schema) for one check file, with every table created"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.url = None
+        self.schema = None
+        self._engine = None
+        self.SessionLocal = sessionmaker(autoflush=False)
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            if CHECKS_ON_SQLITE:
+                path = os.path.join(tempfile.mkdtemp(prefix=f"inspectra_{self.name}_"), f"{self.name}.db")
+                self.url = f"sqlite:///{path}"
+            else:
+                self.url = TEST_DATABASE_URL
+                self.schema = f"check_{self.name}_{secrets.token_hex(4)}"
+                self._execute_admin(f'CREATE SCHEMA "{self.schema}"')
+                event.listen(self.SessionLocal, "after_flush", self._advance_sequences)
+            self._engine = self._new_engine()
+            Base.metadata.create_all(bind=self._engine)
+            self.SessionLocal.configure(bind=self._engine)
+        return self._engine
+
+    def create_engine(self, **kwargs):
+        """Another engine on this database (e.g. with its own pool size)"""
+        self.engine
+        return self._new_engine(**kwargs)
+
+    def _new_engine(self, **kwargs):
+        engine = create_db_engine(self.url, **kwargs)
+        if self.schema:
+            event.listen(engine, "connect", self._set_search_path)
+        return engine
+
+    def create_async_engine(self):
+        """An async engine on this database, as db.get_async_engine() makes for the app"""
+        self.engine
+        engine = create_async_engine(to_async_url(self.url))
+        if self.schema:
+            event.listen(engine.sync_engine, "connect", self._set_search_path)
+        return engine
+
+    def session(self):
+        self.engine
+        return self.SessionLocal()
+
+    def dispose(self):
+        if self._engine is not None:
+            self._engine.dispose()
+            if self.schema:
+                self._execute_admin(f'DROP SCHEMA "{self.schema}" CASCADE')
+
+    def _execute_admin(self, sql: str):
+        engine = create_db_engine(TEST_DATABASE_URL, pool_size=1, max_overflow=0)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(sql))
+        finally:
+            engine.dispose()
+
+    def _set_search_path(self, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'SET search_path TO "{self.schema}"')
+        cursor.close()
+        dbapi_connection.commit()   # a SET inside a rolled-back transaction is undone
+
+    def _advance_sequences(self, session, flush_context):
+        """Seeds insert explicit ids; move the id sequences past them so later inserts do not collide"""
+        tables = {obj.__table__ for obj in session.new if "id" in obj.__table__.c}
+        for table in tables:
+            session.connection().execute(
+                select(func.setval(func.pg_get_serial_sequence(table.name, "id"),
+                                   select(func.coalesce(func.max(table.c.id), 0) + 1).scalar_subquery(), False))
+            )
+
+def add_users(db, inspectors: int = 1, password_hash: str = "x") -> list:
+    """The manager (id 1) and inspectors from id 2: "inspector", or inspector1..N when several"""
+    names = ["inspector"] if inspectors == 1 else [f"inspector{i + 1}" for i in range(inspectors)]
+    users = [models.User(id=1, username="manager", staff_id="S001", email="manager@example.com",
+                         password_hash=password_hash, role=models.RoleEnum.manager)]
+    users += [
+        models.User(id=i + 2, username=name, staff_id=f"S{i + 2:03d}", email=f"{name}@example.com",
+                    password_hash=password_hash, role=models.RoleEnum.inspector)
+        for i, name in enumerate(names)
+    ]
+    db.add_all(users)
+    return users
+
+# ==================== Runner ====================
+
+class _CheckReporter:
+    """pytest plugin printing one line per check"""
+
+    def __init__(self):
+        self.failures = 0
+
+    def pytest_runtest_logreport(self, report):
+        name = report.nodeid.split("::")[-1]
+        if report.failed:
+            self.failures += 1
+            crash = getattr(report.longrepr, "reprcrash", None)
+            print(f"❌ {name}\n   {crash.message if crash else report.longrepr}")
+        elif report.when == "call" and report.passed:
+            print(f"✓ {name}")
+
+def run_checks(path: str, title: str):
+    """Entry point for `python test_x.py`: run the file's checks and exit 1 on failure"""
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    reporter = _CheckReporter()
+    exit_code = pytest.main([path, "-p", "no:terminal", "-p", "no:cacheprovider"], plugins=[reporter])
+    if exit_code not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+        print(f"\n❌ Checks could not run (pytest exit code {int(exit_code)})")
+    else:
+        print(f"\n{f'✅ All {title.lower()} passed' if not reporter.failures else f'❌ {reporter.failures} check(s) failed'}")
+    raise SystemExit(0 if exit_code == pytest.ExitCode.OK else 1)
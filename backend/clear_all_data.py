@@ -4,8 +4,8 @@ Clear all inspection and report data - Fresh start for new system
 from db import SessionLocal
 import models
 
-def clear_all_data():
-    db = SessionLocal()
+def clear_all_data(session_factory=SessionLocal):
+    db = session_factory()
     try:
         # Update manager username if needed
         manager_user = db.query(models.User).filter(models.User.role == models.RoleEnum.manager).first()
@@ -21,9 +21,11 @@ def clear_all_data():
         print(f"   Inspections: {inspections_count}")
         print(f"   Reports: {reports_count}")
         
-        # Delete all inspections and reports
+        # Delete all inspections and reports. Bulk deletes bypass the ORM hooks
+        # that maintain inspection_counters, so clear those in the same transaction.
         db.query(models.Report).delete()
         db.query(models.Inspection).delete()
+        db.query(models.InspectionCounter).delete()
         db.commit()
         
         print(f"\n✅ All data cleared!")
@@ -0,0 +1,53 @@
+"""
+pytest setup for the check files (test_*.py).
+A check file that declares `database = CheckDatabase(...)` (see checks.py)
+has the process-wide revocation store pointed at that database while its
+checks run; the principal and stats caches start empty for every file.
+Every check runs with relationship lazy loads raising, so code that reads a
+relationship it did not load up front fails instead of querying per row.
+"""
+import pytest
+
+from principal_cache import principal_cache
+from query_stats import lazy_loads_raise
+from revocation import revocation_store
+from stats_cache import stats_cache
+
+# Older scripts that call a running server or read the real inspectra.db;
+# run them by hand
+collect_ignore = [
+    "test_adam_tasks.py",
+    "test_adam_to_abu.py",
+    "test_db.py",
+    "test_db_query.py",
+    "test_endpoint.py",
+    "test_login.py",
+    "test_messaging.py",
+    "test_reply.py",
+    "test_threads.py",
+]
+
+@pytest.fixture(scope="session", autouse=True)
+def raise_on_lazy_loads():
+    with lazy_loads_raise():
+        yield
+
+@pytest.fixture(scope="module", autouse=True)
+def check_database(request):
+    """The check file's database, with the shared stores reset around it"""
+    principal_cache.clear()
+    stats_cache.clear()
+    database = getattr(request.module, "database", None)
+    if database is None:
+        yield None
+        return
+    previous = revocation_store.engine
+    revocation_store.engine = database.engine
+    revocation_store.clear()
+    revocation_store.sync()   # done by the app lifespan at startup
+    try:
+        yield database
+    finally:
+        revocation_store.engine = previous
+        revocation_store.clear()
+        database.dispose()
@@ -9,6 +9,7 @@ sys.path.insert(0, 'c:\\workshop2\\Inspectra\\backend')
 
 from db import SessionLocal, engine
 import models
+import inspection_counters  # registers the hooks that keep inspection_counters in step
 
 # Ensure all tables are created
 print("Creating database tables...")
@@ -202,20 +203,19 @@ def create_sample_data():
         models.Report.status == models.ReportStatusEnum.pending_review
     ).count()
     
-    # Current month stats
-    from sqlalchemy import extract
-    current_month = today.month
-    current_year = today.year
+    # Current month stats ([first of this month, first of next month))
+    month_start = today.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
     
     inspections_this_month = db.query(models.Inspection).filter(
-        extract('month', models.Inspection.created_at) == current_month,
-        extract('year', models.Inspection.created_at) == current_year
+        models.Inspection.created_at >= month_start,
+        models.Inspection.created_at < next_month_start
     ).count()
     
     completed_this_month = db.query(models.Inspection).filter(
         models.Inspection.status == models.InspectionStatusEnum.completed,
-        extract('month', models.Inspection.completion_date) == current_month,
-        extract('year', models.Inspection.completion_date) == current_year
+        models.Inspection.completion_date >= month_start,
+        models.Inspection.completion_date < next_month_start
     ).count()
     
     print(f"Total Inspections: {total_inspections}")
@@ -12,27 +12,60 @@ def ensure_pdf_for_inspection(inspection):
         if sample_pdf and os.path.exists(sample_pdf):
             inspection.pdf_report_path = sample_pdf
     return inspection
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, false, func, or_, select
 from datetime import datetime, date, timedelta
-from db import get_db
+from db import get_db, get_read_db, get_async_db
 from auth import get_current_user
+from uploads import save_upload_file
+from inspection_counters import counter_totals, inspection_total, total_for
+from pagination import keyset_page, page_limit, set_page_headers
+from stats_cache import ALL, stats_cache
+import messaging
 import models
 import os
-import shutil
 from pathlib import Path
+from typing import Annotated
 
 router = APIRouter()
 
+# Columns returned by the inspection list endpoints. Selecting them directly
+# returns plain rows (no identity map) and skips the large report/rejection
+# Text columns the lists never show.
+INSPECTION_LIST_COLUMNS = (
+    models.Inspection.id,
+    models.Inspection.title,
+    models.Inspection.location,
+    models.Inspection.status,
+    models.Inspection.scheduled_date,
+    models.Inspection.completion_date,
+    models.Inspection.notes,
+    models.Inspection.created_at,
+)
+
+# Inspector task lists also show equipment and the latest rejection
+INSPECTOR_TASK_COLUMNS = INSPECTION_LIST_COLUMNS + (
+    models.Inspection.equipment_id,
+    models.Inspection.equipment_type,
+    models.Inspection.rejection_reason,
+    models.Inspection.rejection_feedback,
+    models.Inspection.rejection_count,
+)
+
 # INSPECTOR: Get my assigned tasks
 @router.get("/my-tasks")
 def get_my_tasks(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get all tasks assigned to current inspector"""
+    """Get tasks assigned to current inspector, a page at a time (X-Next-Cursor)"""
     
     if current_user.role != models.RoleEnum.inspector:
         raise HTTPException(
@@ -40,13 +73,12 @@ def get_my_tasks(
             detail="Only inspectors can access this endpoint"
         )
     
-    # Get all inspections assigned to this inspector
-    inspections = db.query(models.Inspection).filter(
-        models.Inspection.inspector_id == current_user.id
-    ).order_by(
-        models.Inspection.scheduled_date.desc(),
-        models.Inspection.created_at.desc()
-    ).all()
+    # Inspections assigned to this inspector, latest scheduled first
+    inspections, next_cursor = keyset_page(
+        db.query(*INSPECTOR_TASK_COLUMNS).filter(models.Inspection.inspector_id == current_user.id),
+        models.Inspection.scheduled_date, models.Inspection.id, page_limit(limit, cursor), cursor,
+    )
+    set_page_headers(response, next_cursor, inspection_total(db, current_user.id) if include_total else None)
     
     return [{
         "id": insp.id,
@@ -66,13 +98,19 @@ def get_my_tasks(
 
 @router.get("/history")
 def get_inspection_history(
-    month: int = None,
-    year: int = None,
+    response: Response,
+    month: Annotated[int | None, Query(ge=1, le=12)] = None,
+    year: Annotated[int | None, Query(ge=1, le=9998)] = None,
     status: str = None,
+    date_from: Annotated[date | None, Query(alias="from")] = None,
+    date_to: Annotated[date | None, Query(alias="to")] = None,
+    limit: int | None = None,
+    cursor: str | None = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get inspection history with optional filters for month, year, and status"""
+    """Get inspection history with optional filters for month, year, from/to (inclusive scheduled dates)
+    and status, a page at a time"""
     
     if current_user.role != models.RoleEnum.inspector:
         raise HTTPException(
@@ -81,17 +119,24 @@ def get_inspection_history(
         )
     
     # Start with base query for this inspector
-    query = db.query(models.Inspection).filter(
+    query = db.query(*INSPECTOR_TASK_COLUMNS).filter(
         models.Inspection.inspector_id == current_user.id
     )
     
-    # Apply month filter (filter by scheduled_date month)
-    if month is not None:
-        query = query.filter(extract('month', models.Inspection.scheduled_date) == month)
-    
-    # Apply year filter (filter by scheduled_date year)
-    if year is not None:
-        query = query.filter(extract('year', models.Inspection.scheduled_date) == year)
+    # Month/year/from/to filters, as scheduled_date ranges the inspector index can seek
+    scheduled = models.Inspection.scheduled_date
+    if month is not None and year is not None:
+        query = query.filter(in_range(scheduled, *month_range(year, month)))
+    elif year is not None:
+        query = query.filter(in_range(scheduled, *year_range(year)))
+    elif month is not None:
+        # That month in every year the inspector has inspections in
+        first, last = db.query(func.min(scheduled), func.max(scheduled)).filter(
+            models.Inspection.inspector_id == current_user.id
+        ).one()
+        years = range(first.year, last.year + 1) if first else ()
+        query = query.filter(or_(false(), *(in_range(scheduled, *month_range(y, month)) for y in years)))
+    query = query.filter(*date_filters(scheduled, date_from, date_to))
     
     # Apply status filter
     if status and status.lower() != 'all':
@@ -104,14 +149,12 @@ def get_inspection_history(
                 detail=f"Invalid status: {status}"
             )
     
-    # Get all matching inspections
-    inspections = query.order_by(
-        models.Inspection.scheduled_date.desc(),
-        models.Inspection.created_at.desc()
-    ).all()
-    
-    # Get total count
-    total_count = len(inspections)
+    # Total over every page (one indexed COUNT), then this page of matches
+    total_count = query.count()
+    inspections, next_cursor = keyset_page(
+        query, models.Inspection.scheduled_date, models.Inspection.id, page_limit(limit, cursor), cursor,
+    )
+    set_page_headers(response, next_cursor, total_count)
     
     # Format response
     result = [{
@@ -135,6 +178,28 @@ def get_inspection_history(
         "inspections": result
     }
 
+def month_range(year: int, month: int) -> tuple[date, date]:
+    """First day of the month and first day of the next one"""
+    return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+
+def year_range(year: int) -> tuple[date, date]:
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+def in_range(column, start: date, end: date):
+    """start <= column < end, compared on the bare column so its index can be used"""
+    return and_(column >= start, column < end)
+
+def date_filters(column, date_from: date | None, date_to: date | None) -> list:
+    """Conditions for an inclusive from/to date range (either end optional)"""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' is after 'to'")
+    conditions = []
+    if date_from:
+        conditions.append(column >= date_from)
+    if date_to:
+        conditions.append(column < date_to + timedelta(days=1))
+    return conditions
+
 def get_start_date_from_period(period: str) -> date | None:
     """Calculate the start date based on the period string."""
     today = date.today()
@@ -152,40 +217,31 @@ def get_start_date_from_period(period: str) -> date | None:
 def get_dashboard_stats(
     period: str = "all", # "all", "year", "month", "week", "day"
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get dashboard statistics based on a time period."""
 
     start_date = get_start_date_from_period(period)
 
-    # Base query for inspections, filtered by role
-    query = db.query(models.Inspection)
-    if current_user.role == models.RoleEnum.inspector:
-        query = query.filter(models.Inspection.inspector_id == current_user.id)
+    # Read from the maintained counters (inspection_counters.py), filtered by role
+    inspector_id = current_user.id if current_user.role == models.RoleEnum.inspector else None
+    return stats_cache.get_or_compute(
+        ("dashboard_stats", inspector_id or ALL, period, start_date),
+        lambda: compute_dashboard_stats(db, period, start_date, inspector_id),
+    )
 
-    # 1. Total Inspections (Created in period)
-    total_query = query
-    if start_date:
-        total_query = total_query.filter(models.Inspection.created_at >= start_date)
-    total_inspections = total_query.count()
+def compute_dashboard_stats(db: Session, period: str, start_date: date | None, inspector_id: int | None):
+    totals = counter_totals(db, start_date, inspector_id)
+    Status = models.InspectionStatusEnum
 
+    # 1. Total Inspections (Created in period)
+    total_inspections = total_for(totals, "created")
     # 2. Completed (Completed in period)
-    completed_query = query.filter(models.Inspection.status == models.InspectionStatusEnum.completed)
-    if start_date:
-        completed_query = completed_query.filter(models.Inspection.completion_date >= start_date)
-    completed = completed_query.count()
-
+    completed = total_for(totals, "completed", Status.completed)
     # 3. Scheduled (Scheduled in period)
-    scheduled_query = query.filter(models.Inspection.status == models.InspectionStatusEnum.scheduled)
-    if start_date:
-        scheduled_query = scheduled_query.filter(models.Inspection.scheduled_date >= start_date)
-    scheduled = scheduled_query.count()
-
+    scheduled = total_for(totals, "scheduled", Status.scheduled)
     # 4. Pending Review (Created in period)
-    pending_query = query.filter(models.Inspection.status == models.InspectionStatusEnum.pending_review)
-    if start_date:
-        pending_query = pending_query.filter(models.Inspection.created_at >= start_date)
-    pending_review = pending_query.count()
+    pending_review = total_for(totals, "created", Status.pending_review)
 
     # 5. Reports Generated (Same as completed)
     reports_generated = completed
@@ -203,14 +259,26 @@ def get_dashboard_stats(
 def get_recent_inspections(
     limit: int = 5,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get recent inspections - filtered by role"""
     
+    recent_query = db.query(
+        models.Inspection.id,
+        models.Inspection.title,
+        models.Inspection.status,
+        models.Inspection.location,
+        models.Inspection.equipment_id,
+        models.Inspection.equipment_type,
+        models.Inspection.scheduled_date,
+        models.Inspection.created_at,
+        models.User.username.label("inspector_username"),
+    ).outerjoin(models.User, models.Inspection.inspector_id == models.User.id)
+    
     # Role-based filtering
     if current_user.role == models.RoleEnum.inspector:
         # Inspectors only see their own COMPLETED inspections
-        inspections = db.query(models.Inspection)\
+        inspections = recent_query\
             .filter(
                 models.Inspection.inspector_id == current_user.id,
                 models.Inspection.status == models.InspectionStatusEnum.completed
@@ -220,7 +288,7 @@ def get_recent_inspections(
             .all()
     else:
         # Managers see all inspections
-        inspections = db.query(models.Inspection)\
+        inspections = recent_query\
             .order_by(models.Inspection.created_at.desc())\
             .limit(limit)\
             .all()
@@ -233,7 +301,7 @@ def get_recent_inspections(
         "equipment_id": insp.equipment_id,
         "equipment_type": insp.equipment_type,
         "scheduled_date": insp.scheduled_date.isoformat() if insp.scheduled_date else None,
-        "inspector": insp.inspector.username if insp.inspector else "Unassigned",
+        "inspector": insp.inspector_username or "Unassigned",
         "created_at": insp.created_at.isoformat()
     } for insp in inspections]
 
@@ -241,14 +309,25 @@ def get_recent_inspections(
 def get_recent_reports(
     limit: int = 5,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get recent reports - filtered by role"""
     
+    # Inspection title and author joined in instead of lazy-loading them per report
+    recent_query = db.query(
+        models.Report.id,
+        models.Report.title,
+        models.Report.status,
+        models.Report.created_at,
+        models.Inspection.title.label("inspection_title"),
+        models.User.username.label("created_by_username"),
+    ).outerjoin(models.Inspection, models.Report.inspection_id == models.Inspection.id)\
+        .outerjoin(models.User, models.Report.created_by == models.User.id)
+    
     # Role-based filtering
     if current_user.role == models.RoleEnum.inspector:
         # Inspectors only see their own APPROVED reports
-        reports = db.query(models.Report)\
+        reports = recent_query\
             .filter(
                 models.Report.created_by == current_user.id,
                 models.Report.status == models.ReportStatusEnum.approved
@@ -258,7 +337,7 @@ def get_recent_reports(
             .all()
     else:
         # Managers see all reports
-        reports = db.query(models.Report)\
+        reports = recent_query\
             .order_by(models.Report.created_at.desc())\
             .limit(limit)\
             .all()
@@ -267,33 +346,54 @@ def get_recent_reports(
         "id": report.id,
         "title": report.title,
         "status": report.status.value,
-        "inspection": report.inspection.title if report.inspection else "N/A",
-        "created_by": report.created_by_user.username if report.created_by_user else "Unknown",
+        "inspection": report.inspection_title or "N/A",
+        "created_by": report.created_by_username or "Unknown",
         "created_at": report.created_at.isoformat()
     } for report in reports]
 
+@router.get("/bootstrap")
+def get_dashboard_bootstrap(
+    period: str = "all",
+    limit: int = 5,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Everything the dashboard shows on launch in one request: stats, recent
+    inspections and reports, unread message count and due reminders"""
+    
+    # One auth check and one session for all sections; each section is the
+    # same function that serves its own endpoint, so the shapes match
+    return {
+        "stats": get_dashboard_stats(period=period, current_user=current_user, db=db),
+        "recent_inspections": get_recent_inspections(limit=limit, current_user=current_user, db=db),
+        "recent_reports": get_recent_reports(limit=limit, current_user=current_user, db=db),
+        "unread_count": messaging.get_unread_count(current_user=current_user, db=db)["unread_count"],
+        "pending_reminders": messaging.get_pending_reminders(current_user=current_user, db=db),
+    }
+
 @router.get("/inspections/all")
 def get_all_inspections(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get all inspections - role-based filtering"""
+    """Get all inspections, a page at a time - role-based filtering"""
     
     # Role-based filtering
+    query = db.query(*INSPECTION_LIST_COLUMNS)
+    inspector_id = None
     if current_user.role == models.RoleEnum.inspector:
         # Inspectors see only their own inspections
-        inspections = db.query(models.Inspection).filter(
-            models.Inspection.inspector_id == current_user.id
-        ).order_by(
-            models.Inspection.scheduled_date.desc(),
-            models.Inspection.created_at.desc()
-        ).all()
-    else:
-        # Managers see all inspections
-        inspections = db.query(models.Inspection).order_by(
-            models.Inspection.scheduled_date.desc(),
-            models.Inspection.created_at.desc()
-        ).all()
+        inspector_id = current_user.id
+        query = query.filter(models.Inspection.inspector_id == inspector_id)
+
+    inspections, next_cursor = keyset_page(
+        query, models.Inspection.scheduled_date, models.Inspection.id, page_limit(limit, cursor), cursor,
+    )
+    set_page_headers(response, next_cursor, inspection_total(db, inspector_id) if include_total else None)
     
     return [{
         "id": insp.id,
@@ -308,27 +408,39 @@ def get_all_inspections(
 
 @router.get("/inspections/completed")
 def get_completed_inspections(
+    response: Response,
+    date_from: Annotated[date | None, Query(alias="from")] = None,
+    date_to: Annotated[date | None, Query(alias="to")] = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get completed inspections (Reports Generated) - role-based filtering"""
+    """Get completed inspections (Reports Generated), optionally completed from/to (inclusive dates),
+    a page at a time - role-based filtering"""
     
     # Role-based filtering
+    query = db.query(*INSPECTION_LIST_COLUMNS).filter(
+        models.Inspection.status == models.InspectionStatusEnum.completed,
+        *date_filters(models.Inspection.completion_date, date_from, date_to)
+    )
+    inspector_id = None
     if current_user.role == models.RoleEnum.inspector:
         # Inspectors see only their own completed inspections
-        inspections = db.query(models.Inspection).filter(
-            models.Inspection.inspector_id == current_user.id,
-            models.Inspection.status == models.InspectionStatusEnum.completed
-        ).order_by(
-            models.Inspection.completion_date.desc()
-        ).all()
+        inspector_id = current_user.id
+        query = query.filter(models.Inspection.inspector_id == inspector_id)
+
+    inspections, next_cursor = keyset_page(
+        query, models.Inspection.completion_date, models.Inspection.id, page_limit(limit, cursor), cursor,
+    )
+    if not include_total:
+        total = None
+    elif date_from or date_to:
+        total = query.count()
     else:
-        # Managers see all completed inspections
-        inspections = db.query(models.Inspection).filter(
-            models.Inspection.status == models.InspectionStatusEnum.completed
-        ).order_by(
-            models.Inspection.completion_date.desc()
-        ).all()
+        total = inspection_total(db, inspector_id, models.InspectionStatusEnum.completed)
+    set_page_headers(response, next_cursor, total)
     
     return [{
         "id": insp.id,
@@ -343,27 +455,30 @@ def get_completed_inspections(
 
 @router.get("/inspections/pending-review")
 def get_pending_review_inspections(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get pending review inspections - role-based filtering"""
+    """Get pending review inspections, a page at a time - role-based filtering"""
     
     # Role-based filtering
+    query = db.query(*INSPECTION_LIST_COLUMNS).filter(
+        models.Inspection.status == models.InspectionStatusEnum.pending_review
+    )
+    inspector_id = None
     if current_user.role == models.RoleEnum.inspector:
         # Inspectors see only their own pending review inspections
-        inspections = db.query(models.Inspection).filter(
-            models.Inspection.inspector_id == current_user.id,
-            models.Inspection.status == models.InspectionStatusEnum.pending_review
-        ).order_by(
-            models.Inspection.created_at.desc()
-        ).all()
-    else:
-        # Managers see all pending review inspections
-        inspections = db.query(models.Inspection).filter(
-            models.Inspection.status == models.InspectionStatusEnum.pending_review
-        ).order_by(
-            models.Inspection.created_at.desc()
-        ).all()
+        inspector_id = current_user.id
+        query = query.filter(models.Inspection.inspector_id == inspector_id)
+
+    inspections, next_cursor = keyset_page(
+        query, models.Inspection.created_at, models.Inspection.id, page_limit(limit, cursor), cursor,
+    )
+    total = inspection_total(db, inspector_id, models.InspectionStatusEnum.pending_review) if include_total else None
+    set_page_headers(response, next_cursor, total)
     
     return [{
         "id": insp.id,
@@ -379,31 +494,28 @@ def get_pending_review_inspections(
 @router.get("/inspections/completed-this-month")
 def get_completed_this_month(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get inspections completed this month - role-based filtering"""
     
-    now = datetime.now()
-    current_month = now.month
-    current_year = now.year
+    today = date.today()
+    this_month = in_range(models.Inspection.completion_date, *month_range(today.year, today.month))
     
     # Role-based filtering
     if current_user.role == models.RoleEnum.inspector:
         # Inspectors see only their own completed inspections this month
-        inspections = db.query(models.Inspection).filter(
+        inspections = db.query(*INSPECTION_LIST_COLUMNS).filter(
             models.Inspection.inspector_id == current_user.id,
             models.Inspection.status == models.InspectionStatusEnum.completed,
-            extract('month', models.Inspection.completion_date) == current_month,
-            extract('year', models.Inspection.completion_date) == current_year
+            this_month
         ).order_by(
             models.Inspection.completion_date.desc()
         ).all()
     else:
         # Managers see all completed inspections this month
-        inspections = db.query(models.Inspection).filter(
+        inspections = db.query(*INSPECTION_LIST_COLUMNS).filter(
             models.Inspection.status == models.InspectionStatusEnum.completed,
-            extract('month', models.Inspection.completion_date) == current_month,
-            extract('year', models.Inspection.completion_date) == current_year
+            this_month
         ).order_by(
             models.Inspection.completion_date.desc()
         ).all()
@@ -427,7 +539,7 @@ async def submit_inspection_report(
     notes: str = None,
     pdf_file: UploadFile = File(None),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit inspection report for manager review with optional PDF"""
     
@@ -438,10 +550,13 @@ async def submit_inspection_report(
         )
     
     # Get the inspection
-    inspection = db.query(models.Inspection).filter(
-        models.Inspection.id == inspection_id,
-        models.Inspection.inspector_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.Inspection).where(
+            models.Inspection.id == inspection_id,
+            models.Inspection.inspector_id == current_user.id
+        )
+    )
+    inspection = result.scalars().first()
     
     if not inspection:
         raise HTTPException(
@@ -452,17 +567,13 @@ async def submit_inspection_report(
     # Save PDF file if provided
     pdf_path = None
     if pdf_file:
-        # Create reports directory if it doesn't exist
         reports_dir = Path("reports")
-        reports_dir.mkdir(exist_ok=True)
         
         # Generate unique filename
         filename = f"inspection_{inspection_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        file_path = reports_dir / filename
         
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(pdf_file.file, buffer)
+        # Stream the file to disk (creates the reports directory if needed)
+        file_path = await save_upload_file(pdf_file, reports_dir / filename)
         
         pdf_path = str(file_path)
     
@@ -477,8 +588,8 @@ async def submit_inspection_report(
     inspection.completion_date = date.today()
     
     try:
-        db.commit()
-        db.refresh(inspection)
+        await db.commit()
+        await db.refresh(inspection)
         
         return {
             "message": "Inspection report submitted successfully",
@@ -487,7 +598,7 @@ async def submit_inspection_report(
             "pdf_path": pdf_path
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to submit inspection: {str(e)}"
@@ -523,27 +634,30 @@ def get_inspection_pdf(
 
 @router.get("/inspections/scheduled")
 def get_scheduled(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get scheduled inspections - role-based filtering"""
+    """Get scheduled inspections, a page at a time - role-based filtering"""
     
     # Role-based filtering
+    query = db.query(*INSPECTION_LIST_COLUMNS).filter(
+        models.Inspection.status == models.InspectionStatusEnum.scheduled
+    )
+    inspector_id = None
     if current_user.role == models.RoleEnum.inspector:
         # Inspectors see only their own in-progress/scheduled inspections
-        inspections = db.query(models.Inspection).filter(
-            models.Inspection.inspector_id == current_user.id,
-            models.Inspection.status == models.InspectionStatusEnum.scheduled
-        ).order_by(
-            models.Inspection.scheduled_date.asc()
-        ).all()
-    else:
-        # Managers see all in-progress/scheduled inspections
-        inspections = db.query(models.Inspection).filter(
-            models.Inspection.status == models.InspectionStatusEnum.scheduled
-        ).order_by(
-            models.Inspection.scheduled_date.asc()
-        ).all()
+        inspector_id = current_user.id
+        query = query.filter(models.Inspection.inspector_id == inspector_id)
+
+    inspections, next_cursor = keyset_page(
+        query, models.Inspection.scheduled_date, models.Inspection.id, page_limit(limit, cursor), cursor, descending=False,
+    )
+    total = inspection_total(db, inspector_id, models.InspectionStatusEnum.scheduled) if include_total else None
+    set_page_headers(response, next_cursor, total)
     
     return [{
         "id": insp.id,
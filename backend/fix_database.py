@@ -14,6 +14,7 @@ import random
 
 from db import SessionLocal, engine
 import models
+import inspection_counters  # registers the hooks that keep inspection_counters in step
 from sqlalchemy import inspect
 
 print("=" * 70)
@@ -0,0 +1,183 @@
+"""
+Password Hashing Pool
+Argon2 hashing/verification runs on a small dedicated thread pool instead of
+the shared request threadpool. argon2-cffi releases the GIL while hashing, so
+HASH_POOL_WORKERS threads hash in parallel, and memory use is capped at
+roughly workers x the Argon2 memory cost.
+
+At most HASH_POOL_MAX_QUEUE calls may wait for a worker; beyond that callers
+get HashingPoolSaturated immediately (returned as 503 + Retry-After by
+main.py) instead of piling up behind a login storm.
+
+Argon2 cost parameters come from ARGON2_PROFILE (see ARGON2_PROFILES); a
+successful login re-hashes a stored hash made with other parameters.
+
+Stats (hash latency, queue wait, rejections) are exposed on /metrics.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", min(4, os.cpu_count() or 1)))
+HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", 16))
+HASH_POOL_RETRY_AFTER = int(os.getenv("HASH_POOL_RETRY_AFTER", 1))   # seconds, sent with the 503
+
+class HashingPoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+# ==================== Argon2 parameters ====================
+
+# memory_cost is in KiB. Stored hashes carry their own parameters, so
+# switching profiles only affects new hashes; logins upgrade old ones.
+ARGON2_PROFILES = {
+    "rfc9106_low_memory": {"time_cost": 3, "memory_cost": 65536, "parallelism": 4},   # argon2-cffi default
+    "owasp": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+    "owasp_low_memory": {"time_cost": 3, "memory_cost": 12288, "parallelism": 1},
+    "test": {"time_cost": 1, "memory_cost": 8, "parallelism": 1},   # tests and seeding only
+}
+
+# Select a profile with ARGON2_PROFILE; single values can be overridden with
+# ARGON2_TIME_COST, ARGON2_MEMORY_COST and ARGON2_PARALLELISM.
+ARGON2_PROFILE = os.getenv("ARGON2_PROFILE", "rfc9106_low_memory")
+
+def get_argon2_params(profile: str) -> dict:
+    """Return the Argon2 parameters for a profile, with environment overrides applied."""
+    if profile not in ARGON2_PROFILES:
+        raise ValueError(
+            f"Unknown ARGON2_PROFILE '{profile}'. Choose one of: {', '.join(ARGON2_PROFILES)}"
+        )
+    params = dict(ARGON2_PROFILES[profile])
+    overrides = {
+        "time_cost": "ARGON2_TIME_COST",
+        "memory_cost": "ARGON2_MEMORY_COST",
+        "parallelism": "ARGON2_PARALLELISM",
+    }
+    for param, env_var in overrides.items():
+        value = os.getenv(env_var)
+        if value is not None:
+            params[param] = int(value)
+    return params
+
+@lru_cache(maxsize=None)
+def get_password_hasher():
+    """The one Argon2 hasher, configured from ARGON2_PROFILE (argon2 is imported on first use)"""
+    from argon2 import PasswordHasher
+    return PasswordHasher(**get_argon2_params(ARGON2_PROFILE))
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class HashingPool:
+    """Bounded executor for CPU/memory-heavy password hashing"""
+
+    def __init__(self, workers: int = HASH_POOL_WORKERS, max_queue: int = HASH_POOL_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {"completed": 0, "rejected": 0, "max_in_flight": 0}
+        self._hash_ms = deque(maxlen=1000)
+        self._wait_ms = deque(maxlen=1000)
+
+    def submit(self, fn, *args):
+        """Schedule fn(*args); raises HashingPoolSaturated instead of queueing past the limit"""
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._stats["rejected"] += 1
+                raise HashingPoolSaturated()
+            self._in_flight += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+        try:
+            future = self._executor.submit(self._run, time.perf_counter(), fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # _run releases the slot of a job that ran; one cancelled while queued
+        # (its awaiting request was cancelled) never reaches _run
+        future.add_done_callback(lambda done: done.cancelled() and self._release())
+        return future
+
+    def run(self, fn, *args):
+        """Blocking call for sync code"""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn, *args):
+        """Await the result without holding a request thread"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, in_flight=self._in_flight, workers=self.workers,
+                         max_queue=self.max_queue, argon2_profile=ARGON2_PROFILE)
+            hash_ms, wait_ms = list(self._hash_ms), list(self._wait_ms)
+        stats.update({
+            "hash_ms_avg": round(sum(hash_ms) / len(hash_ms), 2) if hash_ms else 0.0,
+            "hash_ms_p95": round(_percentile(hash_ms, 0.95), 2),
+            "queue_wait_ms_avg": round(sum(wait_ms) / len(wait_ms), 2) if wait_ms else 0.0,
+            "queue_wait_ms_p95": round(_percentile(wait_ms, 0.95), 2),
+        })
+        return stats
+
+    def _run(self, submitted_at, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._wait_ms.append((started - submitted_at) * 1000)
+                self._hash_ms.append((finished - started) * 1000)
+                self._stats["completed"] += 1
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+hashing_pool = HashingPool()
+
+# ==================== Password helpers ====================
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    from argon2.exceptions import InvalidHashError, VerificationError
+
+    try:
+        return get_password_hasher().verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def _verify_and_rehash(plain_password: str, hashed_password: str):
+    """Verify, and re-hash with the current parameters if the stored hash is outdated"""
+    if not _verify(plain_password, hashed_password):
+        return False, None
+    hasher = get_password_hasher()
+    if hasher.check_needs_rehash(hashed_password):
+        return True, hasher.hash(plain_password)
+    return True, None
+
+def _hash(password: str) -> str:
+    return get_password_hasher().hash(password)
+
+def hash_password(password: str) -> str:
+    return hashing_pool.run(_hash, password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return hashing_pool.run(_verify, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run_async(_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run_async(_verify, plain_password, hashed_password)
+
+async def verify_and_rehash_async(plain_password: str, hashed_password: str):
+    """(valid, new_hash): new_hash is set when the stored hash should be replaced"""
+    return await hashing_pool.run_async(_verify_and_rehash, plain_password, hashed_password)
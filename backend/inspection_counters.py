@@ -0,0 +1,263 @@
+"""
+Inspection Counters
+Per-day inspection counts kept in the inspection_counters table, so
+/dashboard/stats and /manager/inspector/{id}/stats read a few summary rows
+instead of aggregating the inspections table.
+
+Every inspection contributes one count to each of three rows keyed by
+(inspector, status, kind, day), where kind says which date the day is taken
+from: "created" (created_at), "completed" (completion_date) or "scheduled"
+(scheduled_date). Missing dates are stored as UNDATED and missing inspectors
+as UNASSIGNED, so period filters (day >= start) skip them while "all"
+still counts them.
+
+The counts are maintained from session flush hooks: any ORM insert, update or
+delete of an Inspection (assigning, submitting, approving, rejecting,
+reassigning...) adjusts the counters in the same transaction. Bulk SQL that
+bypasses the ORM is not tracked; run a rebuild afterwards:
+
+    python inspection_counters.py verify
+    python inspection_counters.py rebuild
+"""
+import argparse
+import logging
+from collections import Counter
+from datetime import date, datetime
+
+from sqlalchemy import delete, event, func, insert, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from db import engine, is_sqlite_url
+import models
+
+UNDATED = date.min
+UNASSIGNED = 0
+
+TRACKED_COLUMNS = ("inspector_id", "status", "created_at", "completion_date", "scheduled_date")
+
+logger = logging.getLogger(__name__)
+
+# ==================== Contributions ====================
+
+def _day(value) -> date:
+    if value is None:
+        return UNDATED
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def contributions(inspector_id, status, created_at, completion_date, scheduled_date) -> list:
+    """Counter keys (inspector_id, status, kind, day) one inspection counts towards"""
+    inspector_id = inspector_id or UNASSIGNED
+    status = models.InspectionStatusEnum(status)
+    return [
+        (inspector_id, status, "created", _day(created_at)),
+        (inspector_id, status, "completed", _day(completion_date)),
+        (inspector_id, status, "scheduled", _day(scheduled_date)),
+    ]
+
+def _tracked_rows(conn, ids) -> dict:
+    table = models.Inspection.__table__
+    rows = conn.execute(
+        select(table.c.id, *(table.c[name] for name in TRACKED_COLUMNS)).where(table.c.id.in_(ids))
+    ).fetchall()
+    return {row.id: tuple(row)[1:] for row in rows}
+
+def _loaded_values(state):
+    """Current tracked values if all are loaded on the instance, else None"""
+    values = tuple(state.dict.get(name, state) for name in TRACKED_COLUMNS)
+    return None if any(value is state for value in values) else values
+
+def _previous_values(state):
+    """Tracked values as last loaded from the database, or None if not all are known"""
+    values = []
+    for name in TRACKED_COLUMNS:
+        history = state.attrs[name].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        elif not history.added and name in state.dict:
+            values.append(state.dict[name])
+        else:
+            return None
+    return tuple(values)
+
+# ==================== Flush hooks ====================
+
+@event.listens_for(Session, "before_flush")
+def _collect_inspection_changes(session, flush_context, instances):
+    deltas = Counter()
+    recount, unknown = [], []
+    for obj in {*session.dirty, *session.deleted}:
+        if not isinstance(obj, models.Inspection):
+            continue
+        state = inspect(obj)
+        deleted = obj in session.deleted
+        if not deleted and not any(state.attrs[name].history.added for name in TRACKED_COLUMNS):
+            continue
+        previous = _previous_values(state)
+        if previous is None:
+            unknown.append(obj.id)
+        else:
+            deltas.subtract(contributions(*previous))
+        if not deleted:
+            recount.append(obj)
+    if unknown:
+        # Rows not fully loaded: read the old values before the UPDATE is sent
+        for previous in _tracked_rows(session.connection(), unknown).values():
+            deltas.subtract(contributions(*previous))
+    recount += [obj for obj in session.new if isinstance(obj, models.Inspection)]
+    if deltas or recount:
+        session.info.setdefault("inspection_counters", []).append((deltas, recount))
+
+@event.listens_for(Session, "after_flush")
+def _apply_inspection_changes(session, flush_context):
+    pending = session.info.pop("inspection_counters", None)
+    if not pending:
+        return
+    conn = session.connection()
+    for deltas, recount in pending:
+        unknown = []
+        for obj in recount:
+            values = _loaded_values(inspect(obj))
+            if values is None:
+                unknown.append(obj.id)   # e.g. server-generated created_at
+            else:
+                deltas.update(contributions(*values))
+        if unknown:
+            for values in _tracked_rows(conn, unknown).values():
+                deltas.update(contributions(*values))
+        apply_deltas(conn, deltas)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_inspection_changes(session):
+    session.info.pop("inspection_counters", None)
+
+def apply_deltas(conn, deltas: Counter):
+    """Add the deltas to the counter rows, creating rows as needed"""
+    rows = [
+        {"inspector_id": inspector_id, "status": status, "kind": kind, "day": day, "count": count}
+        for (inspector_id, status, kind, day), count in deltas.items() if count
+    ]
+    if not rows:
+        return
+    table = models.InspectionCounter.__table__
+    key_columns = [table.c.inspector_id, table.c.status, table.c.kind, table.c.day]
+    dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(conn.dialect.name)
+    if dialect is not None:
+        stmt = dialect.insert(table)
+        conn.execute(
+            stmt.on_conflict_do_update(index_elements=key_columns, set_={"count": table.c.count + stmt.excluded["count"]}),
+            rows,
+        )
+        return
+    for row in rows:
+        updated = conn.execute(
+            update(table).where(*(column == row[column.name] for column in key_columns))
+            .values(count=table.c.count + row["count"])
+        ).rowcount
+        if not updated:
+            conn.execute(insert(table).values(**row))
+
+# ==================== Reading ====================
+
+def counter_totals(db: Session, start_date: date | None = None, inspector_id: int | None = None) -> Counter:
+    """Sum of counts per (kind, status), optionally from start_date and for one inspector"""
+    counter = models.InspectionCounter
+    query = db.query(counter.kind, counter.status, func.sum(counter.count)).group_by(counter.kind, counter.status)
+    if start_date is not None:
+        query = query.filter(counter.day >= start_date)
+    if inspector_id is not None:
+        query = query.filter(counter.inspector_id == inspector_id)
+    return Counter({(kind, models.InspectionStatusEnum(status)): total or 0 for kind, status, total in query})
+
+def counter_totals_by_inspector(db: Session, kind: str, start_date: date | None = None) -> dict:
+    """inspector id -> Counter of status -> count for one kind, optionally from start_date"""
+    counter = models.InspectionCounter
+    query = db.query(counter.inspector_id, counter.status, func.sum(counter.count)).filter(
+        counter.kind == kind
+    ).group_by(counter.inspector_id, counter.status)
+    if start_date is not None:
+        query = query.filter(counter.day >= start_date)
+    totals = {}
+    for inspector_id, status, total in query:
+        totals.setdefault(inspector_id, Counter())[models.InspectionStatusEnum(status)] += total or 0
+    return totals
+
+def total_for(totals: Counter, kind: str, *statuses) -> int:
+    """Total for one kind, over the given statuses (all statuses if none given)"""
+    return sum(total for (k, status), total in totals.items() if k == kind and (not statuses or status in statuses))
+
+def inspection_total(db: Session, inspector_id: int | None = None, *statuses) -> int:
+    """Number of inspections (of one inspector, in the given statuses) without scanning inspections"""
+    return total_for(counter_totals(db, inspector_id=inspector_id), "created", *statuses)
+
+# ==================== Rebuild / verify ====================
+
+def expected_counts(conn) -> Counter:
+    """Counts recomputed from the inspections table (streamed, not loaded at once)"""
+    table = models.Inspection.__table__
+    expected = Counter()
+    query = select(*(table.c[name] for name in TRACKED_COLUMNS)).execution_options(yield_per=5000)
+    for row in conn.execute(query):
+        expected.update(contributions(*row))
+    return +expected
+
+def stored_counts(conn) -> Counter:
+    table = models.InspectionCounter.__table__
+    stored = Counter()
+    for row in conn.execute(select(table.c.inspector_id, table.c.status, table.c.kind, table.c.day, table.c.count)):
+        stored[(row.inspector_id, models.InspectionStatusEnum(row.status), row.kind, _day(row.day))] += row.count
+    return +stored
+
+def rebuild(conn) -> int:
+    """Replace every counter row with counts recomputed from inspections; returns the row count"""
+    expected = expected_counts(conn)
+    conn.execute(delete(models.InspectionCounter.__table__))
+    apply_deltas(conn, expected)
+    logger.info("Inspection counters rebuilt", extra={"rows": len(expected)})
+    return len(expected)
+
+def differences(conn) -> dict:
+    """{key: (stored, expected)} for every counter that does not match the inspections table"""
+    expected, stored = expected_counts(conn), stored_counts(conn)
+    return {key: (stored[key], expected[key]) for key in expected.keys() | stored.keys() if stored[key] != expected[key]}
+
+def _locked(engine=engine):
+    """Connection whose transaction keeps inspections from changing during a rebuild"""
+    conn = engine.connect()
+    if is_sqlite_url(str(engine.url)):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif engine.dialect.name == "postgresql":
+        conn.execute(text("LOCK TABLE inspections IN SHARE MODE"))
+    return conn
+
+if __name__ == "__main__":
+    from logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Rebuild or verify the inspection counters")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args()
+    setup_logging()
+    models.Base.metadata.create_all(bind=engine, tables=[models.InspectionCounter.__table__])
+
+    print("=" * 60)
+    print(f"INSPECTION COUNTERS: {args.command.upper()}")
+    print("=" * 60)
+    with _locked() as conn:
+        if args.command == "rebuild":
+            rows = rebuild(conn)
+            conn.commit()
+            print(f"✅ Rebuilt {rows} counter rows")
+            raise SystemExit(0)
+        diffs = differences(conn)
+    for (inspector_id, status, kind, day), (stored, expected) in sorted(diffs.items(), key=str)[:20]:
+        print(f"❌ inspector={inspector_id} status={status.value} {kind}={day}: stored {stored}, expected {expected}")
+    if diffs:
+        print(f"\n❌ {len(diffs)} counter(s) out of date - run: python inspection_counters.py rebuild")
+        raise SystemExit(1)
+    print("✅ Inspection counters match the inspections table")
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime
 import models
-from db import get_db
+from db import get_db, get_read_db
 from auth import get_current_user
 from pydantic import BaseModel
 from typing import Optional
@@ -24,7 +24,7 @@ class LocationUpdate(BaseModel):
 def get_locations(
     include_inactive: bool = False,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of all locations"""
     
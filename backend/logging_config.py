@@ -0,0 +1,131 @@
+"""
+Logging Setup
+Structured, leveled logging for the whole backend.
+
+- Records go through a bounded in-memory queue; a background listener thread
+  does the actual (blocking) writes, so request threads never wait on stdout.
+  When the queue is full new records are dropped and counted, not blocked on.
+- LOG_FORMAT=text (default) prints "time level logger message key=value ...",
+  LOG_FORMAT=json prints one JSON object per line.
+- LOG_LEVEL sets the root level; LOG_LEVELS sets per-module levels, e.g.
+  LOG_LEVELS="auth=DEBUG,query_stats=WARNING,sqlalchemy.engine=INFO".
+- High-volume events can be sampled: log with extra={"event": "<name>"} and
+  set LOG_SAMPLE_RATES="auth.login=0.1,request=0.01". Only records below
+  WARNING are ever sampled out.
+
+Modules log with logging.getLogger(__name__) and pass structured fields via
+extra={...}. CLI scripts keep using print for their console output.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()   # text | json
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+def parse_mapping(value: str, convert) -> dict:
+    """Parse "a=1,b=2" into {"a": convert("1"), "b": convert("2")}"""
+    mapping = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        key, _, raw = item.partition("=")
+        mapping[key.strip()] = convert(raw.strip())
+    return mapping
+
+def record_fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = (f"{datetime.fromtimestamp(record.created):%Y-%m-%d %H:%M:%S.%f}"[:-3]
+                + f" {record.levelname:<7} {record.name}: {record.getMessage()}")
+        fields = record_fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **record_fields(record),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of sub-WARNING records for events with a sample rate"""
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "event", None))
+        return rate is None or random.random() < rate
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full"""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+_listener = None
+
+def setup_logging():
+    """Configure root logging once per process (safe to call again)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    queue_handler.addFilter(SamplingFilter(parse_mapping(LOG_SAMPLE_RATES, float)))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+    for name, level in parse_mapping(LOG_LEVELS, str.upper).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def logging_stats() -> dict:
+    return {"dropped_records": DroppingQueueHandler.dropped}
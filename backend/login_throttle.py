@@ -0,0 +1,220 @@
+"""
+Login Throttling
+Failed logins are limited per login name (username or staff_id) and per
+client address before any password hashing happens, so a misbehaving client
+cannot keep the Argon2 pool busy.
+
+Each key has a token bucket of LOGIN_MAX_FAILURES_PER_USER (or _PER_IP)
+failures that refills over LOGIN_WINDOW_SECONDS. An empty bucket locks the key
+for LOGIN_LOCKOUT_SECONDS, doubling for each further lockout up to
+LOGIN_LOCKOUT_MAX_SECONDS; the backoff resets once the bucket has refilled or
+the user logs in. A successful login clears the login-name key.
+
+LOGIN_THROTTLE_BACKEND=memory (default) keeps state per worker process;
+=database shares it between workers through the login_throttle table.
+Set LOGIN_THROTTLE_ENABLED=false to disable.
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from db import engine
+import models
+
+LOGIN_THROTTLE_ENABLED = os.getenv("LOGIN_THROTTLE_ENABLED", "true").lower() in ("1", "true", "yes")
+LOGIN_THROTTLE_BACKEND = os.getenv("LOGIN_THROTTLE_BACKEND", "memory").lower()   # memory | database
+LOGIN_MAX_FAILURES_PER_USER = int(os.getenv("LOGIN_MAX_FAILURES_PER_USER", 5))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", 50))
+LOGIN_WINDOW_SECONDS = float(os.getenv("LOGIN_WINDOW_SECONDS", 300))
+LOGIN_LOCKOUT_SECONDS = float(os.getenv("LOGIN_LOCKOUT_SECONDS", 30))
+LOGIN_LOCKOUT_MAX_SECONDS = float(os.getenv("LOGIN_LOCKOUT_MAX_SECONDS", 900))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", 100_000))
+# Use the first X-Forwarded-For address; only behind a proxy that sets it
+LOGIN_TRUST_FORWARDED_FOR = os.getenv("LOGIN_TRUST_FORWARDED_FOR", "false").lower() in ("1", "true", "yes")
+
+class LoginThrottled(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many failed logins, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+def client_address(request) -> str:
+    if LOGIN_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def throttle_keys(login: str, address: str) -> list:
+    """(key, failure limit) pairs checked for one login attempt"""
+    return [
+        (f"user:{login.strip().lower()}", LOGIN_MAX_FAILURES_PER_USER),
+        (f"ip:{address}", LOGIN_MAX_FAILURES_PER_IP),
+    ]
+
+# ==================== Token bucket ====================
+# State per key: (tokens, updated_at, locked_until, lockouts)
+
+def _refill(state, limit: int, now: float):
+    if state is None:
+        return (float(limit), now, 0.0, 0)
+    tokens, updated_at, locked_until, lockouts = state
+    tokens = min(float(limit), tokens + (now - updated_at) * limit / LOGIN_WINDOW_SECONDS)
+    if tokens >= limit and locked_until <= now:
+        lockouts = 0   # a full quiet window forgives earlier lockouts
+    return (tokens, now, locked_until, lockouts)
+
+def _consume(state, limit: int, now: float):
+    tokens, updated_at, locked_until, lockouts = _refill(state, limit, now)
+    tokens -= 1
+    if tokens < 1:
+        backoff = min(LOGIN_LOCKOUT_SECONDS * 2 ** lockouts, LOGIN_LOCKOUT_MAX_SECONDS)
+        locked_until = max(locked_until, now + backoff)
+        lockouts += 1
+        tokens = max(tokens, 0.0)
+    return (tokens, updated_at, locked_until, lockouts)
+
+# ==================== Stores ====================
+
+class MemoryThrottleStore:
+    """Per-process state, bounded to LOGIN_THROTTLE_MAX_KEYS (least recently used dropped)"""
+
+    def __init__(self, max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def locked_until(self, keys) -> float:
+        with self._lock:
+            return max((self._states[key][2] for key in keys if key in self._states), default=0.0)
+
+    def record_failure(self, keys_limits, now: float):
+        with self._lock:
+            for key, limit in keys_limits:
+                self._states[key] = _consume(self._states.get(key), limit, now)
+                self._states.move_to_end(key)
+            while len(self._states) > self.max_keys:
+                self._states.popitem(last=False)
+
+    def reset(self, key: str):
+        with self._lock:
+            self._states.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+    def size(self) -> int:
+        return len(self._states)
+
+class DatabaseThrottleStore:
+    """State shared by all workers through the login_throttle table"""
+
+    def __init__(self, engine=engine):
+        self.engine = engine
+
+    def locked_until(self, keys) -> float:
+        table = models.LoginThrottle.__table__
+        with self.engine.connect() as conn:
+            value = conn.execute(
+                select(table.c.locked_until).where(table.c.key.in_(list(keys)))
+                .order_by(table.c.locked_until.desc()).limit(1)
+            ).scalar()
+        return value or 0.0
+
+    def record_failure(self, keys_limits, now: float):
+        table = models.LoginThrottle.__table__
+        columns = (table.c.tokens, table.c.updated_at, table.c.locked_until, table.c.lockouts)
+        with self.engine.begin() as conn:
+            for key, limit in keys_limits:
+                # Create the key with a full bucket first, so concurrent first failures
+                # neither collide on the unique key nor overwrite each other: the
+                # upsert takes SQLite's write lock before the read, and on PostgreSQL
+                # leaves a row for FOR UPDATE to lock
+                _add_key(conn, table, key, _refill(None, limit, now))
+                row = conn.execute(
+                    select(*columns).where(table.c.key == key).with_for_update()
+                ).one()
+                tokens, updated_at, locked_until, lockouts = _consume(tuple(row), limit, now)
+                conn.execute(update(table).where(table.c.key == key).values(
+                    tokens=tokens, updated_at=updated_at, locked_until=locked_until, lockouts=lockouts,
+                ))
+
+    def reset(self, key: str):
+        table = models.LoginThrottle.__table__
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.key == key))
+
+    def purge_idle(self, now: float) -> int:
+        """Drop keys whose buckets have refilled and are not locked"""
+        table = models.LoginThrottle.__table__
+        with self.engine.begin() as conn:
+            return conn.execute(delete(table).where(
+                table.c.updated_at < now - LOGIN_WINDOW_SECONDS,
+                table.c.locked_until < now,
+            )).rowcount
+
+    def clear(self):
+        with self.engine.begin() as conn:
+            conn.execute(delete(models.LoginThrottle.__table__))
+
+    def size(self) -> int:
+        return -1   # not tracked for the shared store
+
+def _add_key(conn, table, key: str, state):
+    tokens, updated_at, locked_until, lockouts = state
+    values = dict(key=key, tokens=tokens, updated_at=updated_at, locked_until=locked_until, lockouts=lockouts)
+    dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(conn.dialect.name)
+    if dialect is not None:
+        conn.execute(dialect.insert(table).values(**values).on_conflict_do_nothing(index_elements=[table.c.key]))
+    elif conn.execute(select(table.c.id).where(table.c.key == key)).first() is None:
+        conn.execute(insert(table).values(**values))
+
+# ==================== Throttle ====================
+
+class LoginThrottle:
+    def __init__(self, store=None, enabled: bool = LOGIN_THROTTLE_ENABLED):
+        if store is None:
+            store = DatabaseThrottleStore() if LOGIN_THROTTLE_BACKEND == "database" else MemoryThrottleStore()
+        self.store = store
+        self.enabled = enabled
+        self._stats = {"checks": 0, "throttled": 0, "failures": 0}
+
+    @property
+    def shared(self) -> bool:
+        """True when calls do database I/O (run them off the event loop)"""
+        return isinstance(self.store, DatabaseThrottleStore)
+
+    def check(self, keys_limits):
+        """Raise LoginThrottled if any key is locked out; call before verifying the password"""
+        if not self.enabled:
+            return
+        self._stats["checks"] += 1
+        now = time.time()
+        locked_until = self.store.locked_until([key for key, _ in keys_limits])
+        if locked_until > now:
+            self._stats["throttled"] += 1
+            raise LoginThrottled(math.ceil(locked_until - now))
+
+    def record_failure(self, keys_limits):
+        if self.enabled:
+            self._stats["failures"] += 1
+            now = time.time()
+            self.store.record_failure(keys_limits, now)
+            if self.shared and self._stats["failures"] % 1000 == 0:
+                self.store.purge_idle(now)
+
+    def record_success(self, keys_limits):
+        """Clear the login-name key; the address key keeps counting"""
+        if self.enabled:
+            self.store.reset(keys_limits[0][0])
+
+    def stats(self) -> dict:
+        return dict(self._stats, backend="database" if self.shared else "memory",
+                    keys=self.store.size(), enabled=self.enabled)
+
+login_throttle = LoginThrottle()
@@ -1,53 +1,56 @@
-from fastapi import FastAPI
+import time
+_import_started = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db import engine, Base, get_db
-import models
+from fastapi.responses import JSONResponse
+from bootstrap import startup
 from auth import router as auth_router
 from dashboard import router as dashboard_router
-from manager import router as manager_router
+from manager import router as manager_router, require_manager
 from messaging import router as messaging_router
 from locations import router as locations_router
 from profile import router as profile_router
 from report import router as report_router
+from query_stats import query_stats_middleware
+from logging_config import setup_logging, shutdown_logging, logging_stats
+from principal_cache import principal_cache
+from hashing import HashingPoolSaturated, HASH_POOL_RETRY_AFTER, hashing_pool
+from revocation import revocation_store
+from login_throttle import login_throttle
+from stats_cache import stats_cache
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Inspection System API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema checks and seeding run here (or in `python bootstrap.py`), not at import
+    bootstrap_ms = startup()
+    revocation_store.start()
+    logger.info("Worker ready", extra={
+        "startup_ms": round((time.perf_counter() - _import_started) * 1000),
+        "bootstrap_ms": round(bootstrap_ms),
+    })
+    yield
+    revocation_store.stop()
+    shutdown_logging()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+app = FastAPI(title="Inspection System API", lifespan=lifespan)
 
-# Initialize default locations
-def init_default_locations():
-    db = next(get_db())
-    try:
-        # Check if locations table is empty
-        count = db.query(models.Location).count()
-        if count == 0:
-            # Add some default locations
-            default_locations = [
-                {"name": "Building A - Floor 1", "description": "Ground floor of Building A"},
-                {"name": "Building A - Floor 2", "description": "Second floor of Building A"},
-                {"name": "Building A - Floor 3", "description": "Third floor of Building A"},
-                {"name": "Building B - Floor 1", "description": "Ground floor of Building B"},
-                {"name": "Building B - Floor 2", "description": "Second floor of Building B"},
-                {"name": "Parking Area", "description": "Main parking lot"},
-                {"name": "Roof Access", "description": "Roof and rooftop equipment"},
-                {"name": "Basement", "description": "Underground basement area"},
-            ]
-            
-            for loc_data in default_locations:
-                location = models.Location(**loc_data, is_active=1)
-                db.add(location)
-            
-            db.commit()
-            print("✓ Default locations initialized")
-    except Exception as e:
-        print(f"Error initializing locations: {e}")
-        db.rollback()
-    finally:
-        db.close()
+# Count and time SQL statements per request (X-Query-Count / X-Query-Time-Ms)
+app.middleware("http")(query_stats_middleware)
 
-# Initialize default data
-init_default_locations()
+# Password hashing pool full: reject quickly rather than queueing
+@app.exception_handler(HashingPoolSaturated)
+async def hashing_pool_saturated(request, exc):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please try again"},
+        headers={"Retry-After": str(HASH_POOL_RETRY_AFTER)},
+    )
 
 # Add CORS middleware to allow requests from Flutter web app
 app.add_middleware(
@@ -71,6 +74,21 @@ app.include_router(report_router, tags=["Report Management"])
 def health():
     return {"status": "ok"}
 
+# Internal: cache, hashing-pool and login-throttle counters reveal when
+# lockouts trip, so only managers may read them and the route stays out of
+# the public OpenAPI schema
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_manager)])
+def metrics():
+    """In-process cache statistics for this worker - MANAGERS ONLY"""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "hashing": hashing_pool.stats(),
+        "logging": logging_stats(),
+        "token_revocation": revocation_store.stats(),
+        "login_throttle": login_throttle.stats(),
+        "stats_cache": stats_cache.stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -1,14 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, joinedload
+from collections import Counter
 from datetime import datetime, date, timedelta
 from typing import List
-from db import get_db
-from auth import get_current_user
+from db import get_db, get_read_db
+from auth import get_current_principal
+from inspection_counters import counter_totals, counter_totals_by_inspector, inspection_total, total_for
+from pagination import keyset_page, page_limit, set_page_headers
+from stats_cache import ALL, stats_cache
 from pydantic import BaseModel
 import models
 
 router = APIRouter()
 
+# Columns returned by the manager inspection lists, with the inspector's
+# username joined in instead of lazy-loading the relationship per row
+INSPECTION_LIST_COLUMNS = (
+    models.Inspection.id,
+    models.Inspection.title,
+    models.Inspection.location,
+    models.Inspection.status,
+    models.Inspection.inspector_id,
+    models.Inspection.scheduled_date,
+    models.Inspection.completion_date,
+    models.Inspection.notes,
+    models.Inspection.created_at,
+    models.User.username.label("inspector_username"),
+)
+
 # Request models
 class AssignTaskRequest(BaseModel):
     inspector_id: int
@@ -36,7 +56,7 @@ class RejectInspectionRequest(BaseModel):
 
 # ==================== Helper Functions / Dependencies ====================
 
-def require_manager(current_user: models.User = Depends(get_current_user)):
+def require_manager(current_user: models.User = Depends(get_current_principal)):
     """Dependency to ensure user is a manager"""
     if current_user.role != models.RoleEnum.manager:
         raise HTTPException(
@@ -113,19 +133,27 @@ def assign_task(
 # MANAGER-ONLY: Get all inspections (for viewing and approval)
 @router.get("/inspections", dependencies=[Depends(require_manager)])
 def get_all_inspections(
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all inspections - MANAGERS ONLY"""
-    inspections = db.query(models.Inspection).order_by(
-        models.Inspection.created_at.desc()
-    ).all()
+    """Get all inspections, newest first and a page at a time (X-Next-Cursor) - MANAGERS ONLY"""
+    inspections, next_cursor = keyset_page(
+        db.query(*INSPECTION_LIST_COLUMNS).outerjoin(
+            models.User, models.Inspection.inspector_id == models.User.id
+        ),
+        models.Inspection.created_at, models.Inspection.id, page_limit(limit, cursor), cursor,
+    )
+    set_page_headers(response, next_cursor, inspection_total(db) if include_total else None)
     
     return [{
         "id": insp.id,
         "title": insp.title,
         "location": insp.location,
         "status": insp.status.value,
-        "inspector": insp.inspector.username if insp.inspector else "Unassigned",
+        "inspector": insp.inspector_username or "Unassigned",
         "inspector_id": insp.inspector_id,
         "scheduled_date": insp.scheduled_date.isoformat() if insp.scheduled_date else None,
         "completion_date": insp.completion_date.isoformat() if insp.completion_date else None,
@@ -136,10 +164,17 @@ def get_all_inspections(
 # MANAGER-ONLY: Get all pending inspections for approval
 @router.get("/pending/inspections", dependencies=[Depends(require_manager)])
 def get_pending_inspections(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all inspections pending approval - MANAGERS ONLY"""
-    inspections = db.query(models.Inspection).filter(
+    inspections = db.query(
+        *INSPECTION_LIST_COLUMNS,
+        models.Inspection.report_findings,
+        models.Inspection.report_recommendations,
+        models.Inspection.pdf_report_path,
+    ).outerjoin(
+        models.User, models.Inspection.inspector_id == models.User.id
+    ).filter(
         models.Inspection.status == models.InspectionStatusEnum.pending_review
     ).order_by(models.Inspection.created_at.desc()).all()
     
@@ -148,7 +183,7 @@ def get_pending_inspections(
         "title": insp.title,
         "location": insp.location,
         "status": insp.status.value,
-        "inspector": insp.inspector.username if insp.inspector else "Unassigned",
+        "inspector": insp.inspector_username or "Unassigned",
         "inspector_id": insp.inspector_id,
         "scheduled_date": insp.scheduled_date.isoformat() if insp.scheduled_date else None,
         "completion_date": insp.completion_date.isoformat() if insp.completion_date else None,
@@ -162,10 +197,12 @@ def get_pending_inspections(
 # MANAGER-ONLY: Get all pending reports for approval
 @router.get("/pending/reports", dependencies=[Depends(require_manager)])
 def get_pending_reports(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all reports pending approval - MANAGERS ONLY"""
-    reports = db.query(models.Report).filter(
+    reports = db.query(models.Report).options(
+        joinedload(models.Report.inspection), joinedload(models.Report.created_by_user)
+    ).filter(
         models.Report.status == models.ReportStatusEnum.pending_review
     ).order_by(models.Report.created_at.desc()).all()
     
@@ -188,7 +225,7 @@ def get_pending_reports(
 def approve_inspection(
     inspection_id: int,
     notes: str = None,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(require_manager),
     db: Session = Depends(get_db)
 ):
     """Approve an inspection and mark as completed - MANAGERS ONLY"""
@@ -240,7 +277,7 @@ def reject_inspection(
     inspection_id: int,
     rejection_reason: str,
     rejection_feedback: str = None,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(require_manager),
     db: Session = Depends(get_db)
 ):
     """Reject an inspection and send back for revision - MANAGERS ONLY"""
@@ -329,38 +366,41 @@ def approve_report(
 @router.get("/inspectors", dependencies=[Depends(require_manager)])
 def get_inspectors(
     period: str = "all",  # "all", "year", "month", "week", "day"
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of all inspectors with performance metrics - MANAGERS ONLY"""
     start_date = get_start_date_from_period(period)
+    return stats_cache.get_or_compute(
+        ("inspectors", ALL, period, start_date),
+        lambda: compute_inspectors(db, start_date),
+    )
 
+def compute_inspectors(db: Session, start_date: date | None):
     inspectors = db.query(models.User).filter(
         models.User.role == models.RoleEnum.inspector
     ).all()
     
+    # Inspections scheduled in the period per inspector, from the maintained
+    # counters, and reports created in the period per author: one grouped
+    # query each instead of six counts per inspector
+    inspection_totals = counter_totals_by_inspector(db, "scheduled", start_date)
+    report_query = db.query(
+        models.Report.created_by,
+        func.count(models.Report.id),
+        func.count(case((models.Report.status == models.ReportStatusEnum.approved, 1))),
+    ).group_by(models.Report.created_by)
+    if start_date:
+        report_query = report_query.filter(models.Report.created_at >= start_date)
+    report_totals = {created_by: (total, approved) for created_by, total, approved in report_query}
+    
     result = []
     for insp in inspectors:
-        # Base queries for inspections and reports
-        inspection_query = db.query(models.Inspection).filter(
-            models.Inspection.inspector_id == insp.id
-        )
-        report_query = db.query(models.Report).filter(
-            models.Report.created_by == insp.id
-        )
-
-        # Apply date filter if a period is specified
-        if start_date:
-            # We filter inspections by scheduled_date and reports by created_at
-            inspection_query = inspection_query.filter(models.Inspection.scheduled_date >= start_date)
-            report_query = report_query.filter(models.Report.created_at >= start_date)
-
-        # Calculate stats from the filtered queries
-        total_tasks = inspection_query.count()
-        completed_tasks = inspection_query.filter(models.Inspection.status == models.InspectionStatusEnum.completed).count()
-        pending_review = inspection_query.filter(models.Inspection.status == models.InspectionStatusEnum.pending_review).count()
-        scheduled = inspection_query.filter(models.Inspection.status == models.InspectionStatusEnum.scheduled).count()
-        total_reports = report_query.count()
-        approved_reports = report_query.filter(models.Report.status == models.ReportStatusEnum.approved).count()
+        statuses = inspection_totals.get(insp.id, Counter())
+        total_tasks = sum(statuses.values())
+        completed_tasks = statuses[models.InspectionStatusEnum.completed]
+        pending_review = statuses[models.InspectionStatusEnum.pending_review]
+        scheduled = statuses[models.InspectionStatusEnum.scheduled]
+        total_reports, approved_reports = report_totals.get(insp.id, (0, 0))
         
         # Calculate completion rate
         completion_rate = round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1)
@@ -390,11 +430,16 @@ def get_inspectors(
 def get_inspector_stats(
     inspector_id: int,
     period: str = "all",  # "all", "year", "month", "week", "day"
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get statistics for a specific inspector - MANAGERS ONLY"""
     start_date = get_start_date_from_period(period)
+    return stats_cache.get_or_compute(
+        ("inspector_stats", inspector_id, period, start_date),
+        lambda: compute_inspector_stats(db, inspector_id, start_date),
+    )
 
+def compute_inspector_stats(db: Session, inspector_id: int, start_date: date | None):
     inspector = db.query(models.User).filter(
         models.User.id == inspector_id,
         models.User.role == models.RoleEnum.inspector
@@ -403,23 +448,20 @@ def get_inspector_stats(
     if not inspector:
         raise HTTPException(status_code=404, detail="Inspector not found")
     
-    # Base queries
-    inspection_query = db.query(models.Inspection).filter(
-        models.Inspection.inspector_id == inspector_id
-    )
+    # Inspections scheduled in the period, from the maintained counters
+    totals = counter_totals(db, start_date, inspector_id)
     report_query = db.query(models.Report).filter(
         models.Report.created_by == inspector_id
     )
 
     # Apply date filter
     if start_date:
-        inspection_query = inspection_query.filter(models.Inspection.scheduled_date >= start_date)
         report_query = report_query.filter(models.Report.created_at >= start_date)
 
     # Calculate stats from filtered queries
-    total_inspections = inspection_query.count()
-    completed = inspection_query.filter(models.Inspection.status == models.InspectionStatusEnum.completed).count()
-    pending = inspection_query.filter(models.Inspection.status == models.InspectionStatusEnum.pending_review).count()
+    total_inspections = total_for(totals, "scheduled")
+    completed = total_for(totals, "scheduled", models.InspectionStatusEnum.completed)
+    pending = total_for(totals, "scheduled", models.InspectionStatusEnum.pending_review)
     total_reports = report_query.count()
     approved_reports = report_query.filter(models.Report.status == models.ReportStatusEnum.approved).count()
     
@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import Integer, func, or_, and_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, func, or_, and_
 from datetime import datetime
+import logging
 import models
-from db import get_db
+from db import get_db, get_read_db, get_async_db
 from auth import get_current_user
+from write_queue import run_write, run_write_async
 from pydantic import BaseModel
 from typing import Optional
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Request models
 class SendMessageRequest(BaseModel):
@@ -27,7 +31,7 @@ class CreateReminderRequest(BaseModel):
 from fastapi import UploadFile, File, Form
 import os
 from pathlib import Path
-import shutil
+from uploads import save_upload_file
 
 # Send message
 @router.post("/send")
@@ -39,20 +43,18 @@ async def send_message(
     reply_to_id: int = Form(None),
     attachment: UploadFile = File(None),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Send a message with optional file/photo attachment"""
     try:
         # Verify inspection exists if provided
         if inspection_id:
-            inspection = db.query(models.Inspection).filter(
-                models.Inspection.id == inspection_id
-            ).first()
+            inspection = await db.get(models.Inspection, inspection_id)
             if not inspection:
                 raise HTTPException(status_code=404, detail="Inspection not found")
 
         # Verify receiver exists
-        receiver = db.query(models.User).filter(models.User.id == receiver_id).first()
+        receiver = await db.get(models.User, receiver_id)
         if not receiver:
             raise HTTPException(status_code=404, detail="Receiver not found")
 
@@ -69,12 +71,9 @@ async def send_message(
         attachment_name = None
         if attachment:
             uploads_dir = Path("uploads/messages")
-            uploads_dir.mkdir(parents=True, exist_ok=True)
             ext = os.path.splitext(attachment.filename)[1].lower()
             safe_name = f"msg_{current_user.id}_{receiver_id}_{int(datetime.now().timestamp())}{ext}"
-            file_path = uploads_dir / safe_name
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(attachment.file, buffer)
+            file_path = await save_upload_file(attachment, uploads_dir / safe_name)
             attachment_url = str(file_path)
             attachment_name = attachment.filename
             if ext in [".jpg", ".jpeg", ".png", ".gif"]:
@@ -82,29 +81,35 @@ async def send_message(
             else:
                 attachment_type = "file"
 
-        # Create message
-        new_message = models.Message(
-            thread_id=thread_id,
-            inspection_id=inspection_id,
-            sender_id=current_user.id,
-            receiver_id=receiver_id,
-            reply_to_id=reply_to_id,
-            subject=subject,
-            content=content,
-            status=models.MessageStatusEnum.unread,
-            attachment_url=attachment_url,
-            attachment_type=attachment_type,
-            attachment_name=attachment_name
-        )
-        db.add(new_message)
-        db.commit()
-        db.refresh(new_message)
+        # Create message (batched with other small writes when the write queue is on)
+        sender_id = current_user.id
+
+        def insert_message(session: Session):
+            new_message = models.Message(
+                thread_id=thread_id,
+                inspection_id=inspection_id,
+                sender_id=sender_id,
+                receiver_id=receiver_id,
+                reply_to_id=reply_to_id,
+                subject=subject,
+                content=content,
+                status=models.MessageStatusEnum.unread,
+                attachment_url=attachment_url,
+                attachment_type=attachment_type,
+                attachment_name=attachment_name
+            )
+            session.add(new_message)
+            session.flush()
+            session.refresh(new_message)
+            return new_message.id, new_message.created_at
+
+        message_id, sent_at = await run_write_async(db, insert_message)
         return {
             "message": "Message sent successfully",
-            "message_id": new_message.id,
+            "message_id": message_id,
             "thread_id": thread_id,
             "sent_to": receiver.username,
-            "sent_at": new_message.created_at.isoformat(),
+            "sent_at": sent_at.isoformat(),
             "attachment_url": attachment_url,
             "attachment_type": attachment_type,
             "attachment_name": attachment_name
@@ -112,15 +117,14 @@ async def send_message(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to send message", extra={"sender_id": current_user.id})
         raise HTTPException(status_code=500, detail=f"Failed to send message: {str(e)}")
 
 # Get conversation threads (Gmail-style)
 @router.get("/threads")
 def get_threads(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all conversation threads for current user, grouped like Gmail"""
     
@@ -130,12 +134,15 @@ def get_threads(
         func.max(models.Message.created_at).label('last_message_time'),
         func.count(models.Message.id).label('message_count'),
         func.sum(
-            func.cast(
-                and_(
-                    models.Message.receiver_id == current_user.id,
-                    models.Message.status == models.MessageStatusEnum.unread
+            case(
+                (
+                    and_(
+                        models.Message.receiver_id == current_user.id,
+                        models.Message.status == models.MessageStatusEnum.unread
+                    ),
+                    1
                 ),
-                Integer
+                else_=0
             )
         ).label('unread_count')
     ).filter(
@@ -148,30 +155,48 @@ def get_threads(
         func.max(models.Message.created_at).desc()
     ).all()
     
+    # First and latest message of every thread in one query (instead of three
+    # queries per thread), with the latest one's participants and inspection
+    thread_ids = [thread_info[0] for thread_info in threads_query]
+    ranked = db.query(
+        models.Message.id,
+        func.row_number().over(
+            partition_by=models.Message.thread_id,
+            order_by=(models.Message.created_at.desc(), models.Message.id.desc())
+        ).label("newest"),
+        func.row_number().over(
+            partition_by=models.Message.thread_id,
+            order_by=(models.Message.created_at.asc(), models.Message.id.asc())
+        ).label("oldest"),
+    ).filter(models.Message.thread_id.in_(thread_ids)).subquery()
+    first_messages, last_messages = {}, {}
+    for message, newest, oldest in db.query(models.Message, ranked.c.newest, ranked.c.oldest).options(
+        *MESSAGE_PARTIES_AND_INSPECTION
+    ).join(ranked, ranked.c.id == models.Message.id).filter(or_(ranked.c.newest == 1, ranked.c.oldest == 1)):
+        if newest == 1:
+            last_messages[message.thread_id] = message
+        if oldest == 1:
+            first_messages[message.thread_id] = message
+    
     threads = []
     for thread_info in threads_query:
         thread_id = thread_info[0]
         
-        # Get the latest message for preview
-        last_message = db.query(models.Message).filter(
-            models.Message.thread_id == thread_id
-        ).order_by(models.Message.created_at.desc()).first()
+        # Latest message for preview
+        last_message = last_messages.get(thread_id)
         
         if not last_message:
             continue
         
         # Determine the other participant
-        other_user_id = (
-            last_message.receiver_id 
-            if last_message.sender_id == current_user.id 
-            else last_message.sender_id
+        other_user = (
+            last_message.receiver
+            if last_message.sender_id == current_user.id
+            else last_message.sender
         )
-        other_user = db.query(models.User).filter(models.User.id == other_user_id).first()
         
-        # Get first message for subject
-        first_message = db.query(models.Message).filter(
-            models.Message.thread_id == thread_id
-        ).order_by(models.Message.created_at.asc()).first()
+        # First message for subject
+        first_message = first_messages[thread_id]
         
         threads.append({
             "thread_id": thread_id,
@@ -190,6 +215,10 @@ def get_threads(
     
     return threads
 
+# Relationships the message lists serialize, loaded with the messages
+MESSAGE_PARTIES = (joinedload(models.Message.sender), joinedload(models.Message.receiver))
+MESSAGE_PARTIES_AND_INSPECTION = MESSAGE_PARTIES + (joinedload(models.Message.inspection),)
+
 # Get all messages in a thread
 @router.get("/thread/{thread_id}")
 def get_thread_messages(
@@ -200,7 +229,7 @@ def get_thread_messages(
     """Get all messages in a conversation thread"""
     
     # Verify user has access to this thread
-    messages = db.query(models.Message).filter(
+    messages = db.query(models.Message).options(*MESSAGE_PARTIES).filter(
         models.Message.thread_id == thread_id,
         or_(
             models.Message.sender_id == current_user.id,
@@ -241,11 +270,11 @@ def get_thread_messages(
 def get_inspection_messages(
     inspection_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all messages for an inspection"""
     
-    messages = db.query(models.Message).filter(
+    messages = db.query(models.Message).options(*MESSAGE_PARTIES_AND_INSPECTION).filter(
         models.Message.inspection_id == inspection_id
     ).filter(
         (models.Message.sender_id == current_user.id) | 
@@ -272,11 +301,11 @@ def get_inspection_messages(
 @router.get("/my-messages")
 def get_my_messages(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all messages for current user"""
     
-    messages = db.query(models.Message).filter(
+    messages = db.query(models.Message).options(*MESSAGE_PARTIES_AND_INSPECTION).filter(
         (models.Message.sender_id == current_user.id) | 
         (models.Message.receiver_id == current_user.id)
     ).order_by(models.Message.created_at.desc()).all()
@@ -302,7 +331,7 @@ def get_my_messages(
 @router.get("/unread-count")
 def get_unread_count(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get count of unread messages"""
     
@@ -322,28 +351,32 @@ def mark_message_read(
 ):
     """Mark a message as read"""
     
-    message = db.query(models.Message).filter(
-        models.Message.id == message_id,
-        models.Message.receiver_id == current_user.id
-    ).first()
+    user_id = current_user.id
     
-    if not message:
+    def mark_read(session: Session):
+        message = session.query(models.Message).filter(
+            models.Message.id == message_id,
+            models.Message.receiver_id == user_id
+        ).first()
+        if not message:
+            return False
+        message.status = models.MessageStatusEnum.read
+        message.read_at = datetime.now()
+        return True
+    
+    if not run_write(db, mark_read):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Message not found"
         )
     
-    message.status = models.MessageStatusEnum.read
-    message.read_at = datetime.now()
-    db.commit()
-    
     return {"message": "Message marked as read"}
 
 # Get all users for messaging
 @router.get("/users")
 def get_all_users(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all users in the system for messaging"""
     
@@ -411,11 +444,11 @@ def create_reminder(
 @router.get("/reminder/my-reminders")
 def get_my_reminders(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all reminders for current user"""
     
-    reminders = db.query(models.Reminder).filter(
+    reminders = db.query(models.Reminder).options(joinedload(models.Reminder.inspection)).filter(
         models.Reminder.user_id == current_user.id
     ).order_by(models.Reminder.remind_at.asc()).all()
     
@@ -434,13 +467,22 @@ def get_my_reminders(
 @router.get("/reminder/pending")
 def get_pending_reminders(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get pending reminders that are due"""
     
     now = datetime.now()
     
-    reminders = db.query(models.Reminder).filter(
+    # Inspection title joined in instead of lazy-loading it per reminder
+    reminders = db.query(
+        models.Reminder.id,
+        models.Reminder.inspection_id,
+        models.Reminder.title,
+        models.Reminder.message,
+        models.Reminder.remind_at,
+        models.Reminder.status,
+        models.Inspection.title.label("inspection_title"),
+    ).join(models.Inspection, models.Reminder.inspection_id == models.Inspection.id).filter(
         models.Reminder.user_id == current_user.id,
         models.Reminder.status == models.ReminderStatusEnum.pending,
         models.Reminder.remind_at <= now
@@ -449,7 +491,7 @@ def get_pending_reminders(
     return [{
         "id": rem.id,
         "inspection_id": rem.inspection_id,
-        "inspection_title": rem.inspection.title,
+        "inspection_title": rem.inspection_title,
         "title": rem.title,
         "message": rem.message,
         "remind_at": rem.remind_at.isoformat(),
@@ -465,18 +507,22 @@ def dismiss_reminder(
 ):
     """Dismiss a reminder"""
     
-    reminder = db.query(models.Reminder).filter(
-        models.Reminder.id == reminder_id,
-        models.Reminder.user_id == current_user.id
-    ).first()
+    user_id = current_user.id
     
-    if not reminder:
+    def dismiss(session: Session):
+        reminder = session.query(models.Reminder).filter(
+            models.Reminder.id == reminder_id,
+            models.Reminder.user_id == user_id
+        ).first()
+        if not reminder:
+            return False
+        reminder.status = models.ReminderStatusEnum.dismissed
+        return True
+    
+    if not run_write(db, dismiss):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reminder not found"
         )
     
-    reminder.status = models.ReminderStatusEnum.dismissed
-    db.commit()
-    
     return {"message": "Reminder dismissed"}
@@ -0,0 +1,380 @@
+"""
+Versioned Database Migrations
+Replaces the old one-off add_*/migrate_* scripts.
+
+Applied revisions are recorded in the schema_migrations table. Data
+backfills run in small keyset batches, each in its own transaction, so the
+write lock is only held for one batch at a time. Backfill progress is saved
+after every batch, so an interrupted run resumes where it stopped.
+
+Schema changes are single DDL statements. ADD COLUMN only updates the schema,
+and PostgreSQL builds indexes CONCURRENTLY, so those do not block the API. On
+SQLite two of them cannot be batched and hold the database write lock until
+they finish, stalling API writes for as long as they take on a large table:
+- DROP COLUMN rewrites the whole table
+- CREATE INDEX reads the whole table to build the index
+Run revisions that drop columns or add indexes to big SQLite tables as a
+release step (python bootstrap.py with workers on STARTUP_BOOTSTRAP=off) or
+in a quiet period.
+
+Usage:
+    python migrations.py status
+    python migrations.py upgrade [--batch-size 200]
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import (
+    Column, Index, Integer, MetaData, String, Table, TIMESTAMP, PrimaryKeyConstraint,
+    inspect, text,
+)
+
+from db import engine, DATABASE_URL
+import models
+
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", 200))
+BATCH_PAUSE_MS = int(os.getenv("MIGRATION_BATCH_PAUSE_MS", 5))  # let API writers in between batches
+PROGRESS_INTERVAL = 2.0  # seconds between progress lines
+
+# Bookkeeping tables live outside models.Base so create_all never touches them
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations", migration_metadata,
+    Column("revision", String(100), primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", TIMESTAMP, nullable=False),
+)
+
+migration_progress = Table(
+    "migration_progress", migration_metadata,
+    Column("revision", String(100), nullable=False),
+    Column("step", String(100), nullable=False),
+    Column("last_id", Integer, nullable=False),
+    Column("updated_at", TIMESTAMP, nullable=False),
+    PrimaryKeyConstraint("revision", "step"),
+)
+
+MIGRATIONS = []
+
+def migration(revision: str, description: str):
+    """Register a migration function. Revisions run in registration order."""
+    def decorator(fn):
+        MIGRATIONS.append((revision, description, fn))
+        return fn
+    return decorator
+
+# ==================== Migration Context ====================
+
+def concurrent_copy(index: Index) -> Index:
+    """The same index with postgresql_concurrently=True, outside models.Base.metadata"""
+    table = Table(index.table.name, MetaData(), *(Column(col.name, col.type) for col in index.columns))
+    return Index(index.name, *(table.c[col.name] for col in index.columns),
+                 unique=index.unique, postgresql_concurrently=True)
+
+class MigrationContext:
+    """Helpers handed to every migration function"""
+
+    def __init__(self, engine, revision: str, batch_size: int = BATCH_SIZE):
+        self.engine = engine
+        self.revision = revision
+        self.batch_size = batch_size
+        self.dialect = engine.dialect.name
+
+    def columns(self, table: str) -> list:
+        return [col["name"] for col in inspect(self.engine).get_columns(table)]
+
+    def indexes(self, table: str) -> list:
+        return [index["name"] for index in inspect(self.engine).get_indexes(table)]
+
+    def execute(self, sql: str, **params):
+        """Run a single statement in its own short transaction."""
+        with self.engine.begin() as conn:
+            return conn.execute(text(sql), params)
+
+    def add_column(self, table: str, column: str, ddl: str):
+        """Add a column if it is missing. ADD COLUMN does not rewrite the table."""
+        if column in self.columns(table):
+            print(f"   ✓ {table}.{column} already exists")
+            return
+        self.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+        print(f"   ✓ Added {table}.{column}")
+
+    def drop_column(self, table: str, column: str):
+        """Drop a column if it is still there. SQLite rewrites the whole table under the write lock."""
+        if column not in self.columns(table):
+            print(f"   ✓ {table}.{column} already dropped")
+            return
+        self.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+        print(f"   ✓ Dropped {table}.{column}")
+
+    def create_index(self, index_name: str):
+        """
+        Create an index declared in models.py if it does not exist yet.
+        SQLite holds the write lock for the whole build; PostgreSQL builds
+        it without blocking writes.
+        """
+        index = next(
+            index
+            for table in models.Base.metadata.sorted_tables
+            for index in table.indexes
+            if index.name == index_name
+        )
+        if index_name in self.indexes(index.table.name):
+            print(f"   ✓ {index_name} already exists")
+            return
+        if self.dialect == "postgresql":
+            # CONCURRENTLY cannot run inside a transaction
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                concurrent_copy(index).create(bind=conn)
+        else:
+            index.create(bind=self.engine)
+        print(f"   ✓ Created {index_name}")
+
+    def _load_progress(self, step: str) -> int:
+        with self.engine.connect() as conn:
+            last_id = conn.execute(
+                migration_progress.select().with_only_columns(migration_progress.c.last_id).where(
+                    migration_progress.c.revision == self.revision,
+                    migration_progress.c.step == step,
+                )
+            ).scalar()
+        return last_id or 0
+
+    def _save_progress(self, conn, step: str, last_id: int):
+        values = {"last_id": last_id, "updated_at": datetime.now()}
+        updated = conn.execute(
+            migration_progress.update().where(
+                migration_progress.c.revision == self.revision,
+                migration_progress.c.step == step,
+            ).values(**values)
+        ).rowcount
+        if not updated:
+            conn.execute(migration_progress.insert().values(revision=self.revision, step=step, **values))
+
+    def backfill(self, step: str, table: str, select_sql: str, apply, where: str = "1=1"):
+        """
+        Run a data backfill over `table` in id order, one batch per transaction.
+
+        select_sql must select the id first and contain the :last_id and
+        :batch_size placeholders. apply(conn, rows) performs the updates for a
+        batch and returns the number of rows changed.
+        """
+        last_id = self._load_progress(step)
+        with self.engine.connect() as conn:
+            total = conn.execute(text(f"SELECT COUNT(*) FROM {table} WHERE id > :last_id AND {where}"),
+                                 {"last_id": last_id}).scalar()
+        if last_id:
+            print(f"   ↻ Resuming {step} after id {last_id}")
+        print(f"   {step}: {total} rows to process (batch size {self.batch_size})")
+
+        processed = changed = 0
+        started = last_report = time.monotonic()
+        longest_batch = 0.0
+        while True:
+            batch_started = time.monotonic()
+            with self.engine.begin() as conn:
+                rows = conn.execute(text(select_sql), {"last_id": last_id, "batch_size": self.batch_size}).fetchall()
+                if not rows:
+                    break
+                changed += apply(conn, rows) or 0
+                last_id = rows[-1][0]
+                self._save_progress(conn, step, last_id)
+            longest_batch = max(longest_batch, time.monotonic() - batch_started)
+            processed += len(rows)
+
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                rate = processed / (now - started)
+                percent = (processed / total * 100) if total else 100.0
+                print(f"   … {step}: {processed}/{total} ({percent:.1f}%), {rate:.0f} rows/s")
+                last_report = now
+            if BATCH_PAUSE_MS:
+                time.sleep(BATCH_PAUSE_MS / 1000)
+
+        print(f"   ✓ {step}: {processed} rows scanned, {changed} updated "
+              f"(longest batch {longest_batch * 1000:.1f} ms)")
+
+# ==================== Revisions ====================
+
+@migration("0001_user_profile_fields", "Add profile management fields to users")
+def user_profile_fields(ctx: MigrationContext):
+    ctx.add_column("users", "profile_picture", "VARCHAR(500)")
+    ctx.add_column("users", "years_experience", "INTEGER")
+    ctx.add_column("users", "is_active", "INTEGER DEFAULT 1 NOT NULL")
+    ctx.add_column("users", "updated_at", "TIMESTAMP")
+    ctx.add_column("users", "last_password_change", "TIMESTAMP")
+
+@migration("0002_drop_user_legacy_columns", "Drop full_name and certification_number from users")
+def drop_user_legacy_columns(ctx: MigrationContext):
+    ctx.drop_column("users", "full_name")
+    ctx.drop_column("users", "certification_number")
+
+@migration("0003_user_staff_id", "Add staff_id login column to users")
+def user_staff_id(ctx: MigrationContext):
+    ctx.add_column("users", "staff_id", "VARCHAR(20)")
+
+    def assign_staff_ids(conn, rows):
+        # Staff IDs are sequential in id order: S001, S002, ...
+        offset = conn.execute(text("SELECT COUNT(*) FROM users WHERE id < :first_id"),
+                              {"first_id": rows[0][0]}).scalar()
+        conn.execute(
+            text("UPDATE users SET staff_id = :staff_id WHERE id = :id AND staff_id IS NULL"),
+            [{"id": row[0], "staff_id": f"S{offset + i + 1:03d}"} for i, row in enumerate(rows)],
+        )
+        return len(rows)
+
+    ctx.backfill(
+        "staff_id", "users",
+        "SELECT id FROM users WHERE id > :last_id AND staff_id IS NULL ORDER BY id LIMIT :batch_size",
+        assign_staff_ids,
+        where="staff_id IS NULL",
+    )
+    ctx.create_index("ix_users_staff_id")
+
+@migration("0004_inspection_rejection_fields", "Add rejection tracking fields to inspections")
+def inspection_rejection_fields(ctx: MigrationContext):
+    ctx.add_column("inspections", "rejection_reason", "VARCHAR(500)")
+    ctx.add_column("inspections", "rejection_feedback", "TEXT")
+    ctx.add_column("inspections", "rejection_count", "INTEGER DEFAULT 0 NOT NULL")
+    ctx.add_column("inspections", "last_rejected_at", "TIMESTAMP")
+
+@migration("0005_inspection_equipment_fields", "Add equipment tag and type to inspections")
+def inspection_equipment_fields(ctx: MigrationContext):
+    ctx.add_column("inspections", "equipment_id", "VARCHAR(100)")
+    ctx.add_column("inspections", "equipment_type", "VARCHAR(200)")
+
+@migration("0006_message_threads", "Add reply_to_id and thread_id to messages")
+def message_threads(ctx: MigrationContext):
+    ctx.add_column("messages", "reply_to_id", "INTEGER")
+    ctx.add_column("messages", "thread_id", "VARCHAR(100)")
+
+    def assign_thread_ids(conn, rows):
+        updates = []
+        for msg_id, inspection_id, sender_id, receiver_id in rows:
+            user_ids = sorted([sender_id, receiver_id])
+            if inspection_id:
+                thread_id = f"inspection_{inspection_id}_user_{user_ids[0]}_{user_ids[1]}"
+            else:
+                thread_id = f"user_{user_ids[0]}_{user_ids[1]}"
+            updates.append({"id": msg_id, "thread_id": thread_id})
+        conn.execute(text("UPDATE messages SET thread_id = :thread_id WHERE id = :id"), updates)
+        return len(updates)
+
+    ctx.backfill(
+        "thread_id", "messages",
+        "SELECT id, inspection_id, sender_id, receiver_id FROM messages "
+        "WHERE id > :last_id AND thread_id IS NULL ORDER BY id LIMIT :batch_size",
+        assign_thread_ids,
+        where="thread_id IS NULL",
+    )
+    ctx.create_index("ix_messages_thread_id")
+
+@migration("0007_message_attachments", "Add attachment columns to messages")
+def message_attachments(ctx: MigrationContext):
+    ctx.add_column("messages", "attachment_url", "VARCHAR(500)")
+    ctx.add_column("messages", "attachment_type", "VARCHAR(50)")
+    ctx.add_column("messages", "attachment_name", "VARCHAR(255)")
+
+@migration("0008_consolidate_inspection_statuses", "Rename in_progress/revision_required statuses")
+def consolidate_inspection_statuses(ctx: MigrationContext):
+    renames = {"in_progress": "scheduled", "revision_required": "rejected"}
+
+    def rename_statuses(conn, rows):
+        changed = 0
+        for old, new in renames.items():
+            changed += conn.execute(
+                text("UPDATE inspections SET status = :new WHERE status = :old AND id BETWEEN :first AND :last"),
+                {"old": old, "new": new, "first": rows[0][0], "last": rows[-1][0]},
+            ).rowcount
+        return changed
+
+    ctx.backfill(
+        "statuses", "inspections",
+        "SELECT id FROM inspections WHERE id > :last_id ORDER BY id LIMIT :batch_size",
+        rename_statuses,
+    )
+
+@migration("0009_composite_indexes", "Composite indexes for role-filtered queries")
+def composite_indexes(ctx: MigrationContext):
+    for index_name in (
+        "ix_inspections_inspector_status_scheduled",
+        "ix_inspections_status_created",
+        "ix_messages_receiver_status",
+        "ix_messages_thread_created",
+        "ix_reminders_user_status_remind",
+    ):
+        ctx.create_index(index_name)
+
+@migration("0010_inspection_stats_index", "Covering index for /dashboard/stats")
+def inspection_stats_index(ctx: MigrationContext):
+    ctx.create_index("ix_inspections_inspector_stats")
+
+@migration("0011_pagination_indexes", "Indexes for keyset-paginated inspection lists")
+def pagination_indexes(ctx: MigrationContext):
+    for index_name in (
+        "ix_inspections_scheduled_id",
+        "ix_inspections_created_id",
+        "ix_inspections_status_completion_id",
+        "ix_inspections_inspector_scheduled_id",
+    ):
+        ctx.create_index(index_name)
+
+@migration("0012_completion_range_index", "Index for per-inspector completion date ranges")
+def completion_range_index(ctx: MigrationContext):
+    ctx.create_index("ix_inspections_inspector_status_completion")
+
+# ==================== Runner ====================
+
+def applied_revisions(engine) -> dict:
+    migration_metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        rows = conn.execute(schema_migrations.select()).fetchall()
+    return {row.revision: row.applied_at for row in rows}
+
+def upgrade(engine=engine, batch_size: int = BATCH_SIZE):
+    """Apply every pending revision in order."""
+    # Tables that do not exist yet are created with the current schema;
+    # the revisions below only bring older databases up to date.
+    models.Base.metadata.create_all(bind=engine)
+    applied = applied_revisions(engine)
+    pending = [m for m in MIGRATIONS if m[0] not in applied]
+    if not pending:
+        print("✅ Database is up to date")
+        return
+
+    for revision, description, fn in pending:
+        print(f"\n🔄 {revision}: {description}")
+        started = time.monotonic()
+        fn(MigrationContext(engine, revision, batch_size))
+        with engine.begin() as conn:
+            conn.execute(schema_migrations.insert().values(
+                revision=revision, description=description, applied_at=datetime.now()
+            ))
+            conn.execute(migration_progress.delete().where(migration_progress.c.revision == revision))
+        print(f"✅ {revision} applied in {time.monotonic() - started:.2f}s")
+
+def status(engine=engine):
+    applied = applied_revisions(engine)
+    for revision, description, _ in MIGRATIONS:
+        if revision in applied:
+            print(f"   ✓ {revision:<40} applied {applied[revision]}")
+        else:
+            print(f"   … {revision:<40} pending  ({description})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspectra database migrations")
+    parser.add_argument("command", choices=["status", "upgrade"])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"DATABASE MIGRATIONS - {DATABASE_URL}")
+    print("=" * 60)
+
+    if args.command == "status":
+        status()
+    else:
+        upgrade(batch_size=args.batch_size)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, TIMESTAMP, Text, Date, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Enum, TIMESTAMP, Text, Date, Float, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from db import Base
 import enum
@@ -92,6 +92,21 @@ class Inspection(Base):
     messages = relationship("Message", back_populates="inspection")
     reminders = relationship("Reminder", back_populates="inspection")
 
+    # Composite indexes for the role-filtered dashboard/manager queries
+    __table_args__ = (
+        Index("ix_inspections_inspector_status_scheduled", "inspector_id", "status", "scheduled_date"),
+        Index("ix_inspections_status_created", "status", "created_at"),
+        # Covers the inspection counter rebuild/verify scan (inspection_counters.py)
+        Index("ix_inspections_inspector_stats", "inspector_id", "status", "created_at", "completion_date", "scheduled_date"),
+        # Keyset pagination: (sort column, id) ranges of the paged lists (pagination.py)
+        Index("ix_inspections_scheduled_id", "scheduled_date", "id"),
+        Index("ix_inspections_created_id", "created_at", "id"),
+        Index("ix_inspections_status_completion_id", "status", "completion_date", "id"),
+        Index("ix_inspections_inspector_scheduled_id", "inspector_id", "scheduled_date", "id"),
+        # Completion date ranges of one inspector (completed-this-month, completed from/to)
+        Index("ix_inspections_inspector_status_completion", "inspector_id", "status", "completion_date"),
+    )
+
 class Report(Base):
     __tablename__ = "reports"
     id = Column(Integer, primary_key=True, index=True)
@@ -132,6 +147,12 @@ class Message(Base):
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_messages")
     reply_to = relationship("Message", remote_side=[id], foreign_keys=[reply_to_id])
 
+    # Composite indexes for unread counts and thread previews
+    __table_args__ = (
+        Index("ix_messages_receiver_status", "receiver_id", "status"),
+        Index("ix_messages_thread_created", "thread_id", "created_at"),
+    )
+
 class Reminder(Base):
     __tablename__ = "reminders"
     id = Column(Integer, primary_key=True, index=True)
@@ -147,3 +168,43 @@ class Reminder(Base):
     # Relationships
     inspection = relationship("Inspection", back_populates="reminders")
     user = relationship("User", back_populates="reminders")
+
+    # Composite index for due-reminder lookups
+    __table_args__ = (
+        Index("ix_reminders_user_status_remind", "user_id", "status", "remind_at"),
+    )
+
+class TokenRevocation(Base):
+    """Revoked access tokens: one token (jti) or every token a user was issued before not_before"""
+    __tablename__ = "token_revocations"
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(64), nullable=True, unique=True)
+    user_id = Column(Integer, nullable=True, index=True)  # no FK: rows outlive deleted users
+    not_before = Column(Float, nullable=True)   # epoch seconds; tokens with an earlier iat are revoked
+    expires_at = Column(Float, nullable=False)  # epoch seconds; the row can be purged after this
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+class InspectionCounter(Base):
+    """Inspections per (inspector, status, kind, day), maintained by inspection_counters.py"""
+    __tablename__ = "inspection_counters"
+    id = Column(Integer, primary_key=True, index=True)
+    inspector_id = Column(Integer, nullable=False)   # 0 = unassigned; no FK, like the inspections it counts
+    status = Column(Enum(InspectionStatusEnum), nullable=False)
+    kind = Column(String(20), nullable=False)        # created | completed | scheduled: which date `day` is
+    day = Column(Date, nullable=False)               # date.min when the inspection has no such date
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("inspector_id", "status", "kind", "day", name="uq_inspection_counters_key"),
+        Index("ix_inspection_counters_kind_day", "kind", "day"),
+    )
+
+class LoginThrottle(Base):
+    """Failed-login token buckets shared by workers (LOGIN_THROTTLE_BACKEND=database)"""
+    __tablename__ = "login_throttle"
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(320), nullable=False, unique=True)   # "user:<login>" or "ip:<address>"
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)     # epoch seconds
+    locked_until = Column(Float, nullable=False)   # epoch seconds
+    lockouts = Column(Integer, nullable=False, default=0)
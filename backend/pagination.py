@@ -0,0 +1,101 @@
+"""
+Keyset Pagination
+Inspection lists are returned a page at a time, ordered by a sort column
+with the row id as tiebreaker. The next page starts strictly after the last
+row of the previous one, so each page is an index range scan of `limit` rows
+however many years of inspections exist, and rows inserted meanwhile never
+shift or repeat entries.
+
+Rows whose sort column is NULL come last in descending lists and first in
+ascending ones (SQLite's order); they are fetched as their own segment so
+both segments stay index-ordered.
+
+Paging is opt-in: a request with neither `limit` nor `cursor` still gets the
+whole list, as clients written before pagination expect. The response body
+stays a plain list; the cursor for the next page is sent in the X-Next-Cursor
+header (absent on the last page) and, when asked for, the total in
+X-Total-Count.
+"""
+import base64
+import binascii
+import json
+import os
+from datetime import date, datetime
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 100))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 500))
+
+def page_limit(limit: int | None, cursor: str | None = None) -> int | None:
+    """Requested page size, capped at PAGE_SIZE_MAX; None (whole list) when not paging"""
+    if limit is None:
+        return None if cursor is None else PAGE_SIZE_DEFAULT
+    return max(1, min(limit, PAGE_SIZE_MAX))
+
+# ==================== Cursors ====================
+
+def encode_cursor(sort_column, value, row_id: int) -> str:
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort_column.key, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(sort_column, token: str):
+    """(sort value, id) from a cursor made for the same sort column; 400 otherwise"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if payload["s"] != sort_column.key or not isinstance(payload["id"], int):
+            raise ValueError("cursor is for another list")
+        value = payload["v"]
+        if value is not None:
+            python_type = sort_column.type.python_type
+            value = (datetime if python_type is datetime else date).fromisoformat(value)
+        return value, payload["id"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+# ==================== Pages ====================
+
+def keyset_page(query, sort_column, id_column, limit: int | None, cursor: str | None = None,
+                descending: bool = True):
+    """Rows of one page plus the cursor of the next one (None on the last page).
+
+    `query` must select sort_column and id_column and have no ORDER BY.
+    `limit` None returns every remaining row as a single page.
+    """
+    after = decode_cursor(sort_column, cursor) if cursor else None
+    # NULL sort values last when descending, first when ascending
+    segments = ("dated", "undated") if descending else ("undated", "dated")
+    if after is not None:
+        segments = segments[segments.index("undated" if after[0] is None else "dated"):]
+
+    rows = []
+    for segment in segments:
+        if segment == "dated":
+            page_query = query.filter(sort_column.isnot(None))
+            keys = (sort_column, id_column)
+        else:
+            page_query = query.filter(sort_column.is_(None))
+            keys = (id_column,)
+        if after is not None and (segment == "undated") == (after[0] is None):
+            position, start = (tuple_(*keys), tuple_(*after)) if segment == "dated" else (id_column, after[1])
+            page_query = page_query.filter(position < start if descending else position > start)
+        order = [key.desc() if descending else key.asc() for key in keys]
+        page_query = page_query.order_by(*order)
+        rows += (page_query if limit is None else page_query.limit(limit + 1 - len(rows))).all()
+        if limit is not None and len(rows) > limit:
+            break
+
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_column, getattr(last, sort_column.key), getattr(last, id_column.key))
+
+def set_page_headers(response: Response, next_cursor: str | None, total: int | None = None):
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
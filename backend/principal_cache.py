@@ -0,0 +1,145 @@
+"""
+Principal Cache
+Bounded, short-lived cache of bearer token -> authenticated user, so
+get_current_user does not decode the JWT and SELECT the user on every request.
+
+Entries hold a snapshot of the user's columns and are re-attached to the
+request session with merge(load=False), which issues no SQL; routes that
+modify current_user still work as before.
+
+Any committed ORM update or delete of a User (profile edits, password
+changes, deactivation, deletion) invalidates that user's entries at once in
+this process. Other worker processes pick the change up when their entry
+expires (PRINCIPAL_CACHE_TTL_SECONDS).
+
+Set PRINCIPAL_CACHE_TTL_SECONDS=0 to disable.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+import models
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 1024))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 30))
+
+class PrincipalCache:
+    """LRU of token -> (user_id, column snapshot, expiry, token claims) with per-user invalidation"""
+
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_SIZE, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tokens_by_user = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def generation(self, user_id: int) -> int:
+        """Read before loading a user; put() is skipped if the user changed meanwhile"""
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def get(self, token: str):
+        """Return (user_id, snapshot, claims) for a live entry, or None"""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            user_id, snapshot, expires_at, claims = entry
+            if time.monotonic() >= expires_at:
+                self._remove(token)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(token)
+            self._stats["hits"] += 1
+            return user_id, snapshot, claims
+
+    def put(self, token: str, user_id: int, snapshot: dict, generation: int,
+            token_expires_at: float | None = None, claims: dict | None = None):
+        ttl = self.ttl if token_expires_at is None else min(self.ttl, token_expires_at - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return
+            self._remove(token)
+            self._entries[token] = (user_id, snapshot, time.monotonic() + ttl, claims or {})
+            self._tokens_by_user.setdefault(user_id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+            self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries), maxsize=self.maxsize, ttl_seconds=self.ttl)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_user.get(entry[0])
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[entry[0]]
+
+principal_cache = PrincipalCache()
+
+# ==================== User snapshots ====================
+
+USER_COLUMNS = [attr.key for attr in models.User.__mapper__.column_attrs]
+
+def snapshot_user(user: models.User) -> dict:
+    return {key: getattr(user, key) for key in USER_COLUMNS}
+
+def attach_user(db: Session, snapshot: dict) -> models.User:
+    """Rebuild a User from a snapshot and attach it to the session without a query"""
+    user = models.User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+# ==================== Invalidation ====================
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _track_changed_user(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+    # Drop entries before the commit as well, so a concurrent request cannot keep
+    # serving the old row; the generation bump stops it being re-cached.
+    principal_cache.invalidate_user(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        principal_cache.invalidate_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -9,16 +9,17 @@ from sqlalchemy import func
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
+import logging
 import secrets
 import string
 
-from db import get_db
-from auth import get_current_user
+from db import get_db, get_read_db
+from auth import get_current_user, get_current_principal, get_password_hash, issue_tokens, verify_password
+from revocation import revocation_store
 import models
-from argon2 import PasswordHasher
 
 router = APIRouter(prefix="/profile", tags=["Profile Management"])
-ph = PasswordHasher()
+logger = logging.getLogger(__name__)
 
 # ==================== Schemas ====================
 
@@ -117,7 +118,7 @@ def log_activity(db: Session, manager_id: int, action: str, target_user_id: int
 @router.get("/me", response_model=UserResponse)
 def get_my_profile(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get current user's profile"""
     return current_user
@@ -171,9 +172,7 @@ def update_my_password(
     """Update current user's password"""
     
     # Verify current password
-    try:
-        ph.verify(current_user.password_hash, password_data.current_password)
-    except:
+    if not verify_password(password_data.current_password, current_user.password_hash):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Validate new password
@@ -181,16 +180,19 @@ def update_my_password(
         raise HTTPException(status_code=400, detail="New password must be at least 6 characters")
     
     # Hash and update password
-    current_user.password_hash = ph.hash(password_data.new_password)
+    current_user.password_hash = get_password_hash(password_data.new_password)
     current_user.last_password_change = func.now()
     current_user.updated_at = func.now()
+    # Tokens issued with the old password (including a stolen one) stop working;
+    # this session continues with the fresh token returned below
+    revocation_store.revoke_user(db, current_user.id)
     db.commit()
     
-    return {"message": "Password updated successfully"}
+    return {"message": "Password updated successfully", **issue_tokens(current_user)}
 
 # ==================== Manager-Only Endpoints ====================
 
-def require_manager(current_user: models.User = Depends(get_current_user)):
+def require_manager(current_user: models.User = Depends(get_current_principal)):
     """Dependency to ensure user is a manager"""
     if current_user.role != models.RoleEnum.manager:
         raise HTTPException(
@@ -203,22 +205,20 @@ def require_manager(current_user: models.User = Depends(get_current_user)):
 def get_all_users(
     include_inactive: bool = False,
     current_user: models.User = Depends(require_manager),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of all users (Manager only)"""
     
-    import traceback
     try:
         query = db.query(models.User)
         if not include_inactive:
             query = query.filter(models.User.is_active == 1)
         users_orm = query.order_by(models.User.created_at.desc()).all()
         users_pydantic = [UserResponse.from_orm(user) for user in users_orm]
-        print(f"[DEBUG] /profile/users called by: {current_user.username} (role: {current_user.role}) - Found {len(users_pydantic)} users.")
+        logger.debug("Listed users", extra={"manager_id": current_user.id, "count": len(users_pydantic)})
         return UsersListResponse(users=users_pydantic)
     except Exception as e:
-        print("[ERROR] Exception in /profile/users:", e)
-        traceback.print_exc()
+        logger.exception("Failed to list users", extra={"manager_id": current_user.id})
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/users", response_model=CreateUserResponse, dependencies=[Depends(require_manager)])
@@ -262,7 +262,7 @@ def create_user(
     new_user = models.User(
         username=user_data.username,
         staff_id=staff_id,
-        password_hash=ph.hash(password),
+        password_hash=get_password_hash(password),
         email=user_data.email,
         phone=user_data.phone,
         role=models.RoleEnum.manager if user_data.role == "manager" else models.RoleEnum.inspector,
@@ -294,7 +294,7 @@ def create_user(
 def get_user(
     user_id: int,
     current_user: models.User = Depends(require_manager),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get specific user details (Manager only)"""
     
@@ -341,8 +341,13 @@ def update_user(
     if user_data.role is not None:
         if user_data.role not in ["manager", "inspector"]:
             raise HTTPException(status_code=400, detail="Invalid role")
-        user.role = models.RoleEnum.manager if user_data.role == "manager" else models.RoleEnum.inspector
+        new_role = models.RoleEnum.manager if user_data.role == "manager" else models.RoleEnum.inspector
+        if new_role != user.role:
+            revocation_store.revoke_user(db, user.id)
+        user.role = new_role
     if user_data.is_active is not None:
+        if user.is_active and not user_data.is_active:
+            revocation_store.revoke_user(db, user.id)
         user.is_active = 1 if user_data.is_active else 0
     if user_data.years_experience is not None:
         user.years_experience = user_data.years_experience
@@ -369,7 +374,13 @@ def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
     
     username = user.username
+    # Unassign the user's inspections explicitly: the unit of work would null
+    # inspector_id during the delete flush, after the inspection counter hooks
+    # ran, leaving their counts under the deleted inspector
+    for inspection in db.query(models.Inspection).filter(models.Inspection.inspector_id == user_id):
+        inspection.inspector_id = None
     db.delete(user)
+    revocation_store.revoke_user(db, user_id)
     db.commit()
     
     return {"message": f"User '{username}' deleted successfully"}
@@ -392,6 +403,7 @@ def deactivate_user(
     
     user.is_active = 0
     user.updated_at = func.now()
+    revocation_store.revoke_user(db, user.id)
     db.commit()
     
     return {"message": f"User '{user.username}' deactivated successfully"}
@@ -442,9 +454,10 @@ def reset_user_password(
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
     
     # Update password
-    user.password_hash = ph.hash(password)
+    user.password_hash = get_password_hash(password)
     user.last_password_change = func.now()
     user.updated_at = func.now()
+    revocation_store.revoke_user(db, user.id)
     db.commit()
     
     response = ResetPasswordResponse(
@@ -0,0 +1,148 @@
+"""
+Per-request SQL statement counting and timing
+
+Every statement a request executes itself, on any engine (sync, read-only,
+async), is counted against it, failed statements included. Writes handed to
+the group-commit write queue (WRITE_QUEUE_ENABLED) run on its writer thread,
+outside the request's context, and are not counted. The totals are returned
+in the X-Query-Count / X-Query-Time-Ms response headers and logged; a
+statement that repeats N_PLUS_ONE_THRESHOLD times or more within one request
+is reported as a likely N+1.
+
+Tests can use track_queries()/assert_max_queries() around direct calls, or
+assert_route_query_budget() for requests made through a TestClient, and
+lazy_loads_raise() to turn any relationship a query did not load up front
+into an error instead of a query per row.
+"""
+import contextvars
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, raiseload
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_WARN = int(os.getenv("QUERY_COUNT_WARN", 20))          # log a warning above this many statements
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))   # same statement this often = likely N+1
+
+class QueryStats:
+    """Statement totals for one request (or one tracked block)"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list:
+        """Statements executed at least `threshold` times, most frequent first"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+_current_stats = contextvars.ContextVar("query_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish_statement(conn, statement)
+
+@event.listens_for(Engine, "handle_error")
+def _statement_failed(exception_context):
+    # after_cursor_execute does not run for a failed statement; pop its start
+    # time here so pooled connections do not accumulate them
+    conn = exception_context.connection
+    if conn is not None and exception_context.statement is not None and conn.info.get("query_start_time"):
+        _finish_statement(conn, exception_context.statement)
+
+def _finish_statement(conn, statement):
+    started = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+        stats.statements[statement] += 1
+
+@contextmanager
+def track_queries():
+    """Count the statements executed inside the block"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+# While enabled, every top-level ORM SELECT gets raiseload("*"): explicit
+# joinedload()/selectinload() options still win, anything else raises when
+# touched. Process-wide rather than per context, because a TestClient runs
+# routes on its own threads.
+_lazy_loads_raise = False
+
+@event.listens_for(Session, "do_orm_execute")
+def _add_raiseload(orm_execute_state):
+    if (_lazy_loads_raise and orm_execute_state.is_select
+            and not orm_execute_state.is_column_load and not orm_execute_state.is_relationship_load):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+@contextmanager
+def lazy_loads_raise():
+    """Make relationship lazy loads raise for queries run inside the block"""
+    global _lazy_loads_raise
+    previous, _lazy_loads_raise = _lazy_loads_raise, True
+    try:
+        yield
+    finally:
+        _lazy_loads_raise = previous
+
+def _budget_message(label: str, stats: QueryStats, budget: int) -> str:
+    message = f"{label} ran {stats.count} queries (budget {budget})"
+    for sql, n in stats.repeated_statements(2)[:3]:
+        message += f"\n  {n}x {' '.join(sql.split())[:200]}"
+    return message
+
+@contextmanager
+def assert_max_queries(budget: int, label: str = "block"):
+    """Fail if the block executes more than `budget` statements"""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > budget:
+        raise AssertionError(_budget_message(label, stats, budget))
+
+def assert_route_query_budget(client, method: str, path: str, budget: int, **kwargs):
+    """Call a route through a TestClient and fail if it runs more than `budget` statements"""
+    response = client.request(method, path, **kwargs)
+    assert response.status_code < 400, f"{method} {path} returned {response.status_code}: {response.text}"
+    count = int(response.headers["X-Query-Count"])
+    assert count <= budget, f"{method} {path} ran {count} queries (budget {budget})"
+    return response
+
+async def query_stats_middleware(request, call_next):
+    """Track statements per request, expose them as headers and log them"""
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    response.headers["X-Query-Count"] = str(stats.count)
+    response.headers["X-Query-Time-Ms"] = str(stats.duration_ms)
+
+    route = f"{request.method} {request.url.path}"
+    repeated = stats.repeated_statements()
+    if repeated:
+        sql, n = repeated[0]
+        logger.warning("Possible N+1 in %s: %d queries, statement repeated %dx: %s",
+                       route, stats.count, n, " ".join(sql.split())[:200])
+    elif stats.count > QUERY_COUNT_WARN:
+        logger.warning("%s ran %d queries (%.2f ms)", route, stats.count, stats.duration_ms)
+    else:
+        logger.debug("%s ran %d queries (%.2f ms)", route, stats.count, stats.duration_ms,
+                     extra={"event": "request"})
+    return response
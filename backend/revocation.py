@@ -0,0 +1,155 @@
+"""
+Token Revocation
+Access tokens stay valid until they expire, so revocations are recorded in
+the token_revocations table and mirrored in memory:
+
+- a single token, by its jti (logout)
+- every token a user was issued before a "not before" time (deactivation,
+  deletion, password change/reset, role change)
+
+Checks are two dict lookups and never read the users table. Each worker
+loads the table at startup and then polls for new rows every
+REVOCATION_SYNC_SECONDS on a background thread; revocations made by this
+worker apply as soon as their transaction commits. Rows are purged once every
+token they could match has expired.
+"""
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session
+
+from db import engine
+import models
+
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", 5))
+TOKEN_LIFETIME_SECONDS = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 1440)) * 60
+
+# Re-read this many ids behind the last one seen, so rows whose transactions
+# commit out of id order (PostgreSQL sequences) are not missed
+SYNC_OVERLAP_IDS = 100
+
+logger = logging.getLogger(__name__)
+
+class RevocationStore:
+    """In-memory mirror of token_revocations"""
+
+    def __init__(self, engine=engine, sync_seconds: float = REVOCATION_SYNC_SECONDS):
+        self.engine = engine
+        self.sync_seconds = sync_seconds
+        self._jtis = {}         # jti -> expiry (epoch seconds)
+        self._not_before = {}   # user_id -> epoch seconds
+        self._last_id = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    # ---------- checks ----------
+
+    def is_revoked(self, user_id: int, jti: str | None, issued_at: float | None) -> bool:
+        if not self._loaded:
+            self.sync()
+        if jti is not None and jti in self._jtis:
+            return True
+        not_before = self._not_before.get(user_id)
+        return not_before is not None and (issued_at or 0) < not_before
+
+    # ---------- writes (applied to memory after the caller commits) ----------
+
+    def revoke_token(self, db: Session, jti: str, user_id: int, expires_at: float):
+        self._add(db, jti=jti, user_id=user_id, not_before=None, expires_at=expires_at)
+
+    def revoke_user(self, db: Session, user_id: int):
+        now = time.time()
+        self._add(db, jti=None, user_id=user_id, not_before=now, expires_at=now + TOKEN_LIFETIME_SECONDS)
+
+    def _add(self, db: Session, **values):
+        db.add(models.TokenRevocation(**values))
+        db.info.setdefault("token_revocations", []).append(values)
+
+    def apply(self, jti, user_id, not_before, expires_at):
+        with self._lock:
+            self._apply(jti, user_id, not_before, expires_at)
+
+    def _apply(self, jti, user_id, not_before, expires_at):
+        if jti is not None:
+            self._jtis[jti] = expires_at
+        if not_before is not None and not_before > self._not_before.get(user_id, 0):
+            self._not_before[user_id] = not_before
+
+    # ---------- syncing ----------
+
+    def sync(self):
+        """Load rows added since the last sync (by any worker) and drop expired entries"""
+        table = models.TokenRevocation.__table__
+        with self._lock:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(table.c.id, table.c.jti, table.c.user_id, table.c.not_before, table.c.expires_at)
+                    .where(table.c.id > self._last_id - SYNC_OVERLAP_IDS)
+                    .order_by(table.c.id)
+                ).fetchall()
+            now = time.time()
+            for row in rows:
+                if row.expires_at > now:
+                    self._apply(row.jti, row.user_id, row.not_before, row.expires_at)
+                self._last_id = max(self._last_id, row.id)
+            self._jtis = {jti: expires for jti, expires in self._jtis.items() if expires > now}
+            self._not_before = {
+                user_id: not_before for user_id, not_before in self._not_before.items()
+                if not_before + TOKEN_LIFETIME_SECONDS > now
+            }
+            self._loaded = True
+
+    def clear(self):
+        """Forget every loaded revocation; the next check reloads the table"""
+        with self._lock:
+            self._jtis.clear()
+            self._not_before.clear()
+            self._last_id = 0
+            self._loaded = False
+
+    def purge_expired(self) -> int:
+        table = models.TokenRevocation.__table__
+        with self.engine.begin() as conn:
+            return conn.execute(delete(table).where(table.c.expires_at < time.time())).rowcount
+
+    def start(self):
+        """Initial load plus the background sync thread (called from the app lifespan)"""
+        self.sync()
+        if self._thread is None and self.sync_seconds > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        syncs = 0
+        while not self._stop.wait(self.sync_seconds):
+            try:
+                self.sync()
+                syncs += 1
+                if syncs % 720 == 0:   # about hourly at the default interval
+                    self.purge_expired()
+            except Exception:
+                logger.exception("Token revocation sync failed")
+
+    def stats(self) -> dict:
+        return {"revoked_tokens": len(self._jtis), "revoked_users": len(self._not_before), "last_id": self._last_id}
+
+revocation_store = RevocationStore()
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_revocations(session):
+    for values in session.info.pop("token_revocations", ()):
+        revocation_store.apply(**values)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_revocations(session):
+    session.info.pop("token_revocations", None)
@@ -0,0 +1,143 @@
+"""
+Stats Cache
+Short-lived cache of the statistics responses managers' screens poll:
+/dashboard/stats, /manager/inspectors and /manager/inspector/{id}/stats.
+
+Entries are keyed by (endpoint, scope, period, period start), where scope is
+an inspector id or "all" for the manager-wide views; the period start is part
+of the key, so "day"/"week"/"month" entries roll over at midnight by
+themselves.
+
+Any committed ORM change to an inspection, report or inspector drops the
+entries of the inspectors involved plus every "all" entry at once in this
+process; this covers the write paths in manager.py and dashboard.py (assign,
+submit, approve, reject) and those in report.py and profile.py. Other
+worker processes pick changes up when their entry expires
+(STATS_CACHE_TTL_SECONDS).
+
+Set STATS_CACHE_TTL_SECONDS=0 to disable.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+import models
+
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", 512))
+STATS_CACHE_TTL_SECONDS = float(os.getenv("STATS_CACHE_TTL_SECONDS", 10))
+
+ALL = "all"   # scope of the manager-wide entries
+
+class StatsCache:
+    """LRU of (endpoint, scope, period, start date) -> response with per-inspector invalidation"""
+
+    def __init__(self, maxsize: int = STATS_CACHE_SIZE, ttl: float = STATS_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get_or_compute(self, key: tuple, compute):
+        """Cached response for key, else compute() (stored unless invalidated meanwhile)"""
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            if self._generation == generation:
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return value
+
+    def invalidate(self, inspector_ids=None):
+        """Drop entries for these inspectors and every manager-wide entry (None: drop everything)"""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+            if inspector_ids is None:
+                self._entries.clear()
+                return
+            scopes = set(inspector_ids) | {ALL}
+            for key in [key for key in self._entries if key[1] in scopes]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries), maxsize=self.maxsize, ttl_seconds=self.ttl)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+stats_cache = StatsCache()
+
+# ==================== Invalidation ====================
+
+# Columns whose values say which inspector's stats a row belongs to
+OWNER_COLUMNS = {models.Inspection: "inspector_id", models.Report: "created_by", models.User: "id"}
+
+def _owners(obj):
+    """Inspector ids a changed row affects, before and after the change (None if unknown)"""
+    attr = inspect(obj).attrs[OWNER_COLUMNS[type(obj)]]
+    history = attr.history
+    values = set(history.added) | set(history.deleted) | set(history.unchanged)
+    if not values:
+        return None
+    return {value for value in values if value is not None}
+
+@event.listens_for(Session, "before_flush")
+def _track_stats_changes(session, flush_context, instances):
+    changed = set()
+    for obj in {*session.new, *session.dirty, *session.deleted}:
+        if type(obj) not in OWNER_COLUMNS:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        owners = _owners(obj)
+        if owners is None:
+            changed = None
+            break
+        changed |= owners
+    if changed is None or changed:
+        pending = session.info.get("stats_cache_changes", set())
+        session.info["stats_cache_changes"] = None if changed is None or pending is None else pending | changed
+        # Drop entries before the commit as well, so concurrent requests do not
+        # keep serving them; the generation bump stops them being re-cached.
+        stats_cache.invalidate(changed)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_stats(session):
+    if "stats_cache_changes" in session.info:
+        stats_cache.invalidate(session.info.pop("stats_cache_changes"))
+
+@event.listens_for(Session, "after_rollback")
+def _forget_stats_changes(session):
+    session.info.pop("stats_cache_changes", None)
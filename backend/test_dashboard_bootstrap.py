@@ -0,0 +1,68 @@
+"""
+Dashboard bootstrap checks.
+Calls /dashboard/bootstrap directly against a throwaway SQLite database and
+verifies that every section matches the endpoint it replaces on launch and
+that the whole response takes one statement per section.
+
+Run with: python test_dashboard_bootstrap.py  (or pytest test_dashboard_bootstrap.py)
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from checks import CheckDatabase, add_users, run_checks
+import dashboard
+import messaging
+import models
+from query_stats import track_queries
+from stats_cache import stats_cache
+
+database = CheckDatabase("bootstrap")
+Status = models.InspectionStatusEnum
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db)
+    for i in range(8):
+        db.add(models.Inspection(id=i + 1, title=f"Inspection {i}", inspector_id=2, status=list(Status)[i % 4],
+                                 scheduled_date=date.today() - timedelta(days=i),
+                                 completion_date=date.today() if i % 4 == 2 else None))
+        db.add(models.Report(title=f"Report {i}", inspection_id=i + 1, created_by=2,
+                             status=models.ReportStatusEnum.approved if i % 2 else models.ReportStatusEnum.pending_review))
+        db.add(models.Reminder(inspection_id=i + 1, user_id=2, title=f"Reminder {i}",
+                               remind_at=datetime.now() - timedelta(hours=i)))
+        db.add(models.Message(thread_id="user_1_2", sender_id=1, receiver_id=2, content=f"Message {i}"))
+    db.commit()
+    db.close()
+
+def test_sections_match_separate_endpoints():
+    db = database.session()
+    try:
+        for user in (db.get(models.User, 1), db.get(models.User, 2)):
+            stats_cache.clear()
+            bootstrap = dashboard.get_dashboard_bootstrap(period="month", limit=3, current_user=user, db=db)
+            assert bootstrap == {
+                "stats": dashboard.get_dashboard_stats(period="month", current_user=user, db=db),
+                "recent_inspections": dashboard.get_recent_inspections(limit=3, current_user=user, db=db),
+                "recent_reports": dashboard.get_recent_reports(limit=3, current_user=user, db=db),
+                "unread_count": messaging.get_unread_count(current_user=user, db=db)["unread_count"],
+                "pending_reminders": messaging.get_pending_reminders(current_user=user, db=db),
+            }, (user.username, bootstrap)
+    finally:
+        db.close()
+
+def test_one_statement_per_section():
+    stats_cache.clear()
+    db = database.session()
+    try:
+        inspector = db.get(models.User, 2)
+        with track_queries() as stats:
+            bootstrap = dashboard.get_dashboard_bootstrap(current_user=inspector, db=db)
+    finally:
+        db.close()
+    assert len(bootstrap["recent_reports"]) == 4 and len(bootstrap["pending_reminders"]) == 8
+    assert stats.count == 5, f"{stats.count} statements for 5 sections"
+
+if __name__ == "__main__":
+    run_checks(__file__, "DASHBOARD BOOTSTRAP CHECKS")
@@ -0,0 +1,86 @@
+"""
+Date filter checks.
+Runs the history and completed lists against a throwaway SQLite database and
+verifies that the month/year/from/to range filters select exactly the rows
+the calendar says they should, across month and year boundaries.
+
+Run with: python test_date_filters.py  (or pytest test_date_filters.py)
+"""
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+
+from checks import CheckDatabase, add_users, run_checks
+import dashboard
+import models
+
+database = CheckDatabase("dates")
+Status = models.InspectionStatusEnum
+
+# Month ends and starts around two year boundaries, plus an unscheduled row
+DATES = [date(2023, 12, 31), date(2024, 1, 1), date(2024, 2, 29), date(2024, 3, 1),
+         date(2024, 12, 1), date(2024, 12, 31), date(2025, 1, 1), date(2025, 12, 15), None]
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db)
+    for i, day in enumerate(DATES):
+        db.add(models.Inspection(title=f"Inspection {i}", inspector_id=2, status=Status.completed,
+                                 scheduled_date=day, completion_date=day))
+    db.add(models.Inspection(title="This month", inspector_id=2, status=Status.completed,
+                             scheduled_date=date.today(), completion_date=date.today()))
+    db.add(models.Inspection(title="Last month", inspector_id=2, status=Status.completed,
+                             completion_date=date.today().replace(day=1) - timedelta(days=1)))
+    db.commit()
+    db.close()
+
+def history_dates(**filters):
+    db = database.session()
+    try:
+        result = dashboard.get_inspection_history(response=Response(), current_user=db.get(models.User, 2),
+                                                  db=db, **filters)
+    finally:
+        db.close()
+    days = {date.fromisoformat(row["scheduled_date"]) for row in result["inspections"]}
+    assert result["total_count"] == len(result["inspections"])
+    return days & set(DATES)
+
+def test_month_and_year():
+    assert history_dates(month=12, year=2024) == {date(2024, 12, 1), date(2024, 12, 31)}
+    assert history_dates(month=2, year=2024) == {date(2024, 2, 29)}
+    assert history_dates(year=2024) == {day for day in DATES if day and day.year == 2024}
+
+def test_month_in_every_year():
+    assert history_dates(month=12) == {day for day in DATES if day and day.month == 12}
+    assert history_dates(month=1) == {date(2024, 1, 1), date(2025, 1, 1)}
+
+def test_inclusive_from_to():
+    assert history_dates(date_from=date(2024, 2, 29), date_to=date(2024, 12, 31)) == {
+        date(2024, 2, 29), date(2024, 3, 1), date(2024, 12, 1), date(2024, 12, 31)}
+    assert history_dates(date_to=date(2024, 1, 1)) == {date(2023, 12, 31), date(2024, 1, 1)}
+    assert history_dates(year=2024, date_from=date(2024, 12, 1)) == {date(2024, 12, 1), date(2024, 12, 31)}
+
+def test_reversed_range_is_rejected():
+    try:
+        history_dates(date_from=date(2025, 1, 1), date_to=date(2024, 1, 1))
+    except HTTPException as e:
+        assert e.status_code == 400
+    else:
+        raise AssertionError("from > to accepted")
+
+def test_completed_lists():
+    db = database.session()
+    try:
+        user = db.get(models.User, 2)
+        this_month = dashboard.get_completed_this_month(current_user=user, db=db)
+        completed = dashboard.get_completed_inspections(response=Response(), date_from=date(2024, 12, 1),
+                                                        date_to=date(2025, 1, 1), current_user=user, db=db)
+    finally:
+        db.close()
+    assert [row["title"] for row in this_month] == ["This month"]
+    assert {row["completion_date"] for row in completed} == {"2024-12-01", "2024-12-31", "2025-01-01"}
+
+if __name__ == "__main__":
+    run_checks(__file__, "DATE FILTER CHECKS")
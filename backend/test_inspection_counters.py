@@ -0,0 +1,186 @@
+"""
+Inspection counter checks.
+Drives the inspection state transitions against a throwaway database
+and verifies after each one that inspection_counters matches a recount of the
+inspections table, that the stats routes (including /manager/inspectors) agree
+with direct COUNT queries, that deleting an inspector and clearing all data
+leave no stale counters, and that rebuild repairs counters after bulk SQL.
+
+Run with: python test_inspection_counters.py  (or pytest test_inspection_counters.py)
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bootstrap import init_inspection_counters
+from checks import CheckDatabase, add_users, run_checks
+from clear_all_data import clear_all_data
+import dashboard
+import inspection_counters
+import manager
+import models
+import profile
+from query_stats import track_queries
+from stats_cache import stats_cache
+
+database = CheckDatabase("counters")
+Status = models.InspectionStatusEnum
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db, inspectors=2)
+    for i in range(12):
+        db.add(models.Inspection(
+            title=f"Inspection {i}",
+            inspector_id=None if i == 11 else 2 + i % 2,
+            status=list(Status)[i % 4],
+            scheduled_date=None if i == 10 else date.today() - timedelta(days=40 * i),
+            completion_date=date.today() - timedelta(days=30 * i) if i % 4 == 2 else None,
+            created_at=datetime.now() - timedelta(days=45 * i) if i % 3 else None,   # None: server default
+        ))
+    db.commit()
+    db.close()
+
+def assert_counters_match():
+    with database.engine.connect() as conn:
+        diffs = inspection_counters.differences(conn)
+    assert not diffs, f"counters out of date: {diffs}"
+
+def users(db):
+    return db.get(models.User, 1), db.get(models.User, 2)
+
+def direct_stats(db, user, period):
+    """/dashboard/stats computed straight from the inspections table"""
+    start_date = dashboard.get_start_date_from_period(period)
+    query = db.query(models.Inspection)
+    if user.role == models.RoleEnum.inspector:
+        query = query.filter(models.Inspection.inspector_id == user.id)
+    def count(status, column):
+        q = query if status is None else query.filter(models.Inspection.status == status)
+        return (q.filter(column >= start_date) if start_date else q).count()
+    completed = count(Status.completed, models.Inspection.completion_date)
+    return {
+        "total_inspections": count(None, models.Inspection.created_at),
+        "reports_generated": completed,
+        "pending_review": count(Status.pending_review, models.Inspection.created_at),
+        "completed": completed,
+        "scheduled": count(Status.scheduled, models.Inspection.scheduled_date),
+        "filter_period": period,
+    }
+
+def test_inserts_are_counted():
+    assert_counters_match()
+
+def test_transitions_keep_counters_in_step():
+    db = database.session()
+    manager_user, _ = users(db)
+    created = manager.assign_task(manager.AssignTaskRequest(
+        title="New task", location="Roof", inspector_id=2, scheduled_date=date.today().isoformat()), db=db)
+    assert_counters_match()
+    inspection = db.get(models.Inspection, created["inspection_id"])
+    inspection.status = Status.pending_review   # what submit_inspection_report does
+    inspection.completion_date = date.today()
+    db.commit()
+    assert_counters_match()
+    manager.approve_inspection(inspection_id=inspection.id, notes="ok", current_user=manager_user, db=db)
+    assert_counters_match()
+    pending = db.query(models.Inspection).filter(models.Inspection.status == Status.pending_review).first()
+    manager.reject_inspection(inspection_id=pending.id, rejection_reason="Missing photos",
+                              current_user=manager_user, db=db)
+    assert_counters_match()
+    db.close()
+
+def test_async_session_changes_are_counted():
+    async def submit_report():
+        # submit_inspection_report commits through an AsyncSession
+        async_engine = database.create_async_engine()
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            inspection = await db.get(models.Inspection, 1)
+            inspection.status = Status.pending_review
+            inspection.completion_date = date.today()
+            await db.commit()
+        await async_engine.dispose()
+    asyncio.run(submit_report())
+    assert_counters_match()
+
+def test_reassign_expired_and_delete():
+    db = database.session()
+    inspection = db.query(models.Inspection).filter(models.Inspection.inspector_id == 3).first()
+    db.expire(inspection)   # old values are not loaded: read from the database
+    inspection.inspector_id = 2
+    db.commit()
+    assert_counters_match()
+    db.delete(inspection)
+    db.commit()
+    assert_counters_match()
+    db.close()
+
+def test_rolled_back_changes_are_not_counted():
+    db = database.session()
+    inspection = db.query(models.Inspection).first()
+    inspection.status = Status.rejected
+    db.flush()
+    db.rollback()
+    db.close()
+    assert_counters_match()
+
+def test_stats_routes_match_direct_counts():
+    stats_cache.clear()   # other check files share the process-wide cache
+    db = database.session()
+    manager_user, inspector_user = users(db)
+    for user in (manager_user, inspector_user):
+        for period in ("all", "year", "month", "day"):
+            with track_queries() as stats:
+                result = dashboard.get_dashboard_stats(period=period, current_user=user, db=db)
+            assert stats.count == 1, f"{stats.count} statements for /dashboard/stats"
+            assert result == direct_stats(db, user, period), (user.username, period, result)
+    inspector_stats = manager.get_inspector_stats(inspector_id=2, period="all", db=db)
+    assert inspector_stats["total_inspections"] == db.query(models.Inspection).filter(
+        models.Inspection.inspector_id == 2).count()
+    for period in ("all", "year"):
+        start_date = dashboard.get_start_date_from_period(period)
+        for row in manager.get_inspectors(period=period, db=db):
+            query = db.query(models.Inspection).filter(models.Inspection.inspector_id == row["id"])
+            if start_date:
+                query = query.filter(models.Inspection.scheduled_date >= start_date)
+            expected = (query.count(), query.filter(models.Inspection.status == Status.completed).count(),
+                        query.filter(models.Inspection.status == Status.pending_review).count(),
+                        query.filter(models.Inspection.status == Status.scheduled).count())
+            assert (row["total_tasks"], row["completed_tasks"], row["pending_review"], row["scheduled"]) == expected, (
+                period, row)
+    db.close()
+
+def test_rebuild_repairs_bulk_changes():
+    with database.engine.begin() as conn:
+        conn.execute(text("UPDATE inspections SET status = 'completed' WHERE status = 'scheduled'"))
+    with database.engine.connect() as conn:
+        assert inspection_counters.differences(conn), "bulk SQL change was not detected"
+    with database.engine.begin() as conn:
+        inspection_counters.rebuild(conn)
+    assert_counters_match()
+
+def test_deleting_an_inspector_unassigns_their_counts():
+    db = database.session()
+    manager_user, _ = users(db)
+    assert db.query(models.Inspection).filter(models.Inspection.inspector_id == 3).count()
+    profile.delete_user(user_id=3, current_user=manager_user, db=db)
+    db.close()
+    assert_counters_match()
+
+def test_clear_all_data_leaves_no_counters():
+    clear_all_data(database.SessionLocal)
+    assert_counters_match()
+    with database.engine.begin() as conn:
+        assert not init_inspection_counters(conn), "nothing to rebuild after clear_all_data"
+        conn.execute(text("DELETE FROM inspections"))
+        conn.execute(text("INSERT INTO inspection_counters (inspector_id, status, kind, day, count) "
+                          "VALUES (2, 'scheduled', 'created', '2025-01-01', 3)"))
+        assert init_inspection_counters(conn), "stale counters kept after inspections were bulk deleted"
+    assert_counters_match()
+
+if __name__ == "__main__":
+    run_checks(__file__, "INSPECTION COUNTER CHECKS")
@@ -0,0 +1,50 @@
+"""
+Logging setup checks.
+Covers env parsing, sampling of high-volume events, structured formatting and
+the non-blocking queue handler dropping records when full.
+
+Run with: python test_logging_config.py  (or pytest test_logging_config.py)
+"""
+import json
+import logging
+import queue
+
+from checks import run_checks
+from logging_config import (
+    DroppingQueueHandler, JsonFormatter, SamplingFilter, TextFormatter, parse_mapping,
+)
+
+def make_record(level=logging.INFO, **extra):
+    record = logging.makeLogRecord({"name": "auth", "levelno": level, "levelname": logging.getLevelName(level),
+                                    "msg": "Login lookup"})
+    record.__dict__.update(extra)
+    return record
+
+def test_parse_mapping():
+    assert parse_mapping("auth=debug, query_stats=WARNING", str.upper) == {"auth": "DEBUG", "query_stats": "WARNING"}
+    assert parse_mapping("request=0.01", float) == {"request": 0.01}
+    assert parse_mapping("", float) == {}
+
+def test_sampling_only_drops_low_severity_events():
+    sampler = SamplingFilter({"auth.login": 0.0})
+    assert not sampler.filter(make_record(event="auth.login"))
+    assert sampler.filter(make_record(logging.WARNING, event="auth.login"))
+    assert sampler.filter(make_record(event="other"))
+    assert sampler.filter(make_record())
+
+def test_structured_fields_are_formatted():
+    record = make_record(event="auth.login", found=True)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["logger"] == "auth" and entry["event"] == "auth.login" and entry["found"] is True
+    assert TextFormatter().format(record).endswith("auth: Login lookup event=auth.login found=True")
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(1))
+    before = DroppingQueueHandler.dropped
+    handler.handle(make_record())
+    handler.handle(make_record())
+    assert handler.queue.qsize() == 1
+    assert DroppingQueueHandler.dropped == before + 1
+
+if __name__ == "__main__":
+    run_checks(__file__, "LOGGING SETUP CHECKS")
@@ -0,0 +1,136 @@
+"""
+Login throttling checks.
+Verifies the failed-login token bucket and lockout backoff, that a locked-out
+login is rejected with 429 before any password hashing, and that the
+database store shares state between workers without losing concurrent
+failures.
+
+Run with: python test_login_throttle.py  (or pytest test_login_throttle.py)
+"""
+import asyncio
+import os
+import threading
+import time
+
+os.environ.setdefault("ARGON2_PROFILE", "test")
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from starlette.requests import Request
+
+import auth
+from checks import CheckDatabase, add_users, run_checks
+import hashing
+import login_throttle as throttling
+from login_throttle import LoginThrottle, LoginThrottled, MemoryThrottleStore, DatabaseThrottleStore
+from models import LoginThrottle as LoginThrottleRow
+import schemas
+
+database = CheckDatabase("throttle")
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db, password_hash=hashing.hash_password("secret123"))
+    db.commit()
+    db.close()
+
+def keys(login="inspector", address="10.0.0.1", user_limit=3, ip_limit=50):
+    return [(f"user:{login}", user_limit), (f"ip:{address}", ip_limit)]
+
+def login(password, address="10.0.0.1"):
+    """Run the /auth/login handler; returns the status code"""
+    request = Request({"type": "http", "client": (address, 50000), "headers": []})
+    db = database.session()
+    try:
+        asyncio.run(auth.login(schemas.LoginForm(username="inspector", password=password), request, db))
+        return 200
+    except HTTPException as e:
+        return e.status_code
+    finally:
+        db.close()
+
+def test_lockout_after_limit_with_backoff():
+    store = MemoryThrottleStore()
+    now = 1000.0
+    for _ in range(3):
+        store.record_failure(keys(), now)
+    first_lock = store.locked_until(["user:inspector"])
+    assert first_lock == now + throttling.LOGIN_LOCKOUT_SECONDS
+    # One more failure right after the lockout ends doubles it
+    store.record_failure(keys(), first_lock)
+    assert store.locked_until(["user:inspector"]) == first_lock + 2 * throttling.LOGIN_LOCKOUT_SECONDS
+    # The address key has a higher limit and is not locked yet
+    assert store.locked_until(["ip:10.0.0.1"]) == 0.0
+
+def test_bucket_refills_over_window():
+    store = MemoryThrottleStore()
+    store.record_failure(keys(), 0.0)
+    store.record_failure(keys(), 0.0)
+    store.record_failure(keys(), throttling.LOGIN_WINDOW_SECONDS)   # refilled: not locked
+    assert store.locked_until(["user:inspector"]) == 0.0
+
+def test_memory_store_is_bounded():
+    store = MemoryThrottleStore(max_keys=10)
+    for i in range(20):
+        store.record_failure(keys(login=f"user{i}", address=f"10.0.0.{i}"), 0.0)
+    assert store.size() == 10
+
+def test_throttled_login_skips_hashing():
+    previous, auth.login_throttle = auth.login_throttle, LoginThrottle(MemoryThrottleStore(), enabled=True)
+    try:
+        statuses = [login("wrong") for _ in range(throttling.LOGIN_MAX_FAILURES_PER_USER)]
+        assert statuses == [401] * len(statuses), statuses
+        hashed = hashing.hashing_pool.stats()["completed"]
+        assert login("secret123") == 429, "correct password accepted during lockout"
+        assert hashing.hashing_pool.stats()["completed"] == hashed, "password was hashed while throttled"
+        # The address key has a higher limit, so other users behind it can still log in
+        assert auth.login_throttle.store.locked_until(["ip:10.0.0.1"]) == 0.0
+    finally:
+        auth.login_throttle = previous
+
+def test_success_clears_login_key():
+    throttle = LoginThrottle(MemoryThrottleStore(), enabled=True)
+    throttle.record_failure(keys())
+    throttle.record_failure(keys())
+    throttle.record_success(keys())
+    throttle.record_failure(keys())
+    throttle.check(keys())   # would be the third failure without the reset
+
+def test_database_store_is_shared_between_workers():
+    worker_a = LoginThrottle(DatabaseThrottleStore(database.engine), enabled=True)
+    worker_b = LoginThrottle(DatabaseThrottleStore(database.engine), enabled=True)
+    worker_a.store.clear()
+    worker_a.record_failure(keys(login="shared"))
+    worker_b.record_failure(keys(login="shared"))
+    worker_a.record_failure(keys(login="shared"))
+    try:
+        worker_b.check(keys(login="shared"))
+    except LoginThrottled as e:
+        assert e.retry_after > 0
+    else:
+        raise AssertionError("lockout recorded by other workers was not seen")
+    assert worker_a.store.purge_idle(0.0) == 0
+
+def test_database_store_concurrent_first_failures():
+    workers = [DatabaseThrottleStore(database.engine) for _ in range(8)]
+    start, now, errors = threading.Barrier(len(workers)), time.time(), []
+    def fail(store):
+        start.wait()
+        try:
+            store.record_failure([("user:racing", 50)], now)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=fail, args=(store,)) for store in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [], f"concurrent failures raised {errors[0]!r}"
+    with database.engine.connect() as conn:
+        tokens = conn.execute(select(LoginThrottleRow.tokens).where(LoginThrottleRow.key == "user:racing")).scalar()
+    assert tokens == 50 - len(workers), f"{50 - tokens:g} of {len(workers)} failures recorded"
+
+if __name__ == "__main__":
+    run_checks(__file__, "LOGIN THROTTLING CHECKS")
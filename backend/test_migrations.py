@@ -0,0 +1,108 @@
+"""
+Migration checks.
+Runs batched backfills against a throwaway SQLite database and verifies that
+a backfill interrupted part-way keeps the batches it committed, resumes after
+the last one without re-applying it, and that upgrade() only records a
+revision (and drops its progress) once it has finished. Also checks that
+concurrent index builds leave the models metadata untouched.
+
+Run with: python test_migrations.py  (or pytest test_migrations.py)
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from checks import CheckDatabase, run_checks
+import migrations
+from migrations import MigrationContext, concurrent_copy, migration_progress, schema_migrations
+import models
+
+database = CheckDatabase("migrations")
+
+ROWS = 10
+
+@pytest.fixture(autouse=True)
+def items(check_database, monkeypatch):
+    """A fresh backfill_items table of ROWS rows with value 0"""
+    monkeypatch.setattr(migrations, "BATCH_PAUSE_MS", 0)
+    migrations.migration_metadata.create_all(bind=database.engine)
+    with database.engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS backfill_items"))
+        conn.execute(text("CREATE TABLE backfill_items (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)"))
+        conn.execute(text("INSERT INTO backfill_items (id, value) VALUES (:id, 0)"),
+                     [{"id": i + 1} for i in range(ROWS)])
+        conn.execute(migration_progress.delete())
+        conn.execute(schema_migrations.delete())
+
+def values():
+    with database.engine.connect() as conn:
+        return [row.value for row in conn.execute(text("SELECT value FROM backfill_items ORDER BY id"))]
+
+def progress(revision):
+    with database.engine.connect() as conn:
+        return conn.execute(migration_progress.select().where(migration_progress.c.revision == revision)).fetchall()
+
+class Interrupted(Exception):
+    pass
+
+def increment(fail_at_batch=None):
+    """apply() adding 1 to each row (so a batch applied twice shows up), failing on one batch"""
+    batches = []
+    def apply(conn, rows):
+        batches.append([row[0] for row in rows])
+        if len(batches) == fail_at_batch:
+            conn.execute(text("UPDATE backfill_items SET value = value + 1 WHERE id = :id"), {"id": rows[0][0]})
+            raise Interrupted()
+        conn.execute(text("UPDATE backfill_items SET value = value + 1 WHERE id = :id"),
+                     [{"id": row[0]} for row in rows])
+        return len(rows)
+    apply.batches = batches
+    return apply
+
+def backfill(ctx, apply):
+    ctx.backfill("items", "backfill_items",
+                 "SELECT id FROM backfill_items WHERE id > :last_id ORDER BY id LIMIT :batch_size", apply)
+
+def test_interrupted_backfill_keeps_committed_batches():
+    ctx = MigrationContext(database.engine, "test_interrupt", batch_size=3)
+    with pytest.raises(Interrupted):
+        backfill(ctx, increment(fail_at_batch=3))
+    assert values() == [1] * 6 + [0] * 4, "failed batch was not rolled back"
+    assert [row.last_id for row in progress("test_interrupt")] == [6]
+
+def test_resumed_backfill_continues_after_last_batch():
+    with pytest.raises(Interrupted):
+        backfill(MigrationContext(database.engine, "test_resume", batch_size=3), increment(fail_at_batch=2))
+    apply = increment()
+    backfill(MigrationContext(database.engine, "test_resume", batch_size=3), apply)
+    assert apply.batches == [[4, 5, 6], [7, 8, 9], [10]], f"resumed with batches {apply.batches}"
+    assert values() == [1] * ROWS, "a row was skipped or updated twice"
+
+def test_upgrade_records_revision_only_when_finished(monkeypatch):
+    attempts = []
+    def fill_items(ctx):
+        attempts.append(ctx.revision)
+        backfill(ctx, increment(fail_at_batch=2 if len(attempts) == 1 else None))
+    monkeypatch.setattr(migrations, "MIGRATIONS", [("test_upgrade", "Fill backfill_items", fill_items)])
+
+    with pytest.raises(Interrupted):
+        migrations.upgrade(database.engine, batch_size=4)
+    assert "test_upgrade" not in migrations.applied_revisions(database.engine)
+    assert [row.last_id for row in progress("test_upgrade")] == [4]
+
+    migrations.upgrade(database.engine, batch_size=4)
+    assert "test_upgrade" in migrations.applied_revisions(database.engine)
+    assert progress("test_upgrade") == [], "progress kept after the revision was applied"
+    assert values() == [1] * ROWS
+
+def test_concurrent_index_copy_leaves_models_untouched():
+    index = next(index for index in models.Inspection.__table__.indexes
+                 if index.name == "ix_inspections_status_created")
+    sql = str(CreateIndex(concurrent_copy(index)).compile(dialect=postgresql.dialect()))
+    assert sql == "CREATE INDEX CONCURRENTLY ix_inspections_status_created ON inspections (status, created_at)"
+    assert not index.dialect_options["postgresql"]["concurrently"]
+    assert sum(i.name == index.name for i in models.Inspection.__table__.indexes) == 1
+
+if __name__ == "__main__":
+    run_checks(__file__, "MIGRATION CHECKS")
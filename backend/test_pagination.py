@@ -0,0 +1,153 @@
+"""
+Keyset pagination checks.
+Walks the paged inspection lists against a throwaway SQLite database and
+verifies that following X-Next-Cursor visits every row exactly once in the
+list's order (including rows whose sort column is NULL), that requests without
+limit or cursor still get whole lists longer than a page, that page sizes are
+capped, that totals come back on request and that bad cursors are rejected.
+
+Run with: python test_pagination.py  (or pytest test_pagination.py)
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+
+from checks import CheckDatabase, add_users, run_checks
+import dashboard
+import inspection_counters   # keeps inspection_counters in step with the seeded rows
+import manager
+import models
+import pagination
+
+database = CheckDatabase("pagination")
+Status = models.InspectionStatusEnum
+ROWS = 500   # over PAGE_SIZE_DEFAULT for every list, even split four ways by status
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db)
+    created = datetime(2025, 6, 1, 12, 0)
+    for i in range(ROWS):
+        db.add(models.Inspection(
+            title=f"Inspection {i}",
+            inspector_id=2 if i % 3 else None,
+            status=list(Status)[i % 4],
+            # Repeated dates exercise the id tiebreaker; every seventh row is unscheduled
+            scheduled_date=None if i % 7 == 0 else date(2025, 1, 1) + timedelta(days=i % 5),
+            created_at=created - timedelta(hours=i % 4),
+        ))
+    db.commit()
+    db.close()
+
+def walk(route, limit, **kwargs):
+    """Follow a list's cursors to the end; returns (rows, pages, headers of the first page)"""
+    db = database.session()
+    try:
+        if "current_user" in kwargs:
+            kwargs["current_user"] = db.get(models.User, kwargs["current_user"])
+        rows, pages, cursor, first_headers = [], 0, None, None
+        while True:
+            response = Response()
+            rows += route(response=response, limit=limit, cursor=cursor, db=db, **kwargs)
+            pages += 1
+            first_headers = first_headers or dict(response.headers)
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                return rows, pages, first_headers
+    finally:
+        db.close()
+
+def expected_ids(sort_key, descending=True, **filters):
+    """Ids in list order, NULLs last when descending and first when ascending"""
+    db = database.session()
+    try:
+        rows = db.query(models.Inspection).filter_by(**filters).all()
+    finally:
+        db.close()
+    dated = sorted((row for row in rows if getattr(row, sort_key) is not None),
+                   key=lambda row: (getattr(row, sort_key), row.id), reverse=descending)
+    undated = sorted((row for row in rows if getattr(row, sort_key) is None), key=lambda row: row.id, reverse=descending)
+    ordered = dated + undated if descending else undated + dated
+    return [row.id for row in ordered]
+
+def test_pages_cover_every_row_once_in_order():
+    rows, pages, _ = walk(dashboard.get_all_inspections, limit=4, current_user=1)
+    assert [row["id"] for row in rows] == expected_ids("scheduled_date"), [row["id"] for row in rows]
+    assert pages == -(-ROWS // 4)
+
+def test_ascending_list_starts_with_unscheduled_rows():
+    rows, _, _ = walk(dashboard.get_scheduled, limit=2, current_user=1)
+    assert [row["id"] for row in rows] == expected_ids("scheduled_date", descending=False, status=Status.scheduled)
+
+def test_inspector_and_manager_lists():
+    rows, _, _ = walk(dashboard.get_my_tasks, limit=5, current_user=2)
+    assert [row["id"] for row in rows] == expected_ids("scheduled_date", inspector_id=2)
+    rows, _, _ = walk(manager.get_all_inspections, limit=5)
+    assert [row["id"] for row in rows] == expected_ids("created_at")
+    rows, _, _ = walk(dashboard.get_completed_inspections, limit=3, current_user=1)
+    assert [row["id"] for row in rows] == expected_ids("completion_date", status=Status.completed)
+
+def test_totals_and_history_count():
+    _, _, headers = walk(dashboard.get_completed_inspections, limit=3, current_user=1, include_total=True)
+    assert headers["x-total-count"] == str(len(expected_ids("id", status=Status.completed)))
+    _, _, headers = walk(dashboard.get_all_inspections, limit=3, current_user=1)
+    assert "x-total-count" not in headers, "total computed without being asked for"
+    db = database.session()
+    response = Response()
+    history = dashboard.get_inspection_history(response=response, limit=2, current_user=db.get(models.User, 2), db=db)
+    db.close()
+    assert len(history["inspections"]) == 2
+    assert history["total_count"] == len(expected_ids("id", inspector_id=2))
+    assert response.headers["X-Next-Cursor"]
+
+def test_unpaged_requests_get_whole_lists():
+    db = database.session()
+    try:
+        manager_user, inspector_user = db.get(models.User, 1), db.get(models.User, 2)
+        lists = {
+            "my-tasks": (dashboard.get_my_tasks(response=Response(), current_user=inspector_user, db=db),
+                         expected_ids("id", inspector_id=2)),
+            "history": (dashboard.get_inspection_history(response=Response(), current_user=inspector_user,
+                                                         db=db)["inspections"],
+                        expected_ids("id", inspector_id=2)),
+            "all": (dashboard.get_all_inspections(response=Response(), current_user=manager_user, db=db),
+                    expected_ids("id")),
+            "completed": (dashboard.get_completed_inspections(response=Response(), current_user=manager_user, db=db),
+                          expected_ids("id", status=Status.completed)),
+            "pending-review": (dashboard.get_pending_review_inspections(response=Response(),
+                                                                        current_user=manager_user, db=db),
+                               expected_ids("id", status=Status.pending_review)),
+            "scheduled": (dashboard.get_scheduled(response=Response(), current_user=manager_user, db=db),
+                          expected_ids("id", status=Status.scheduled)),
+            "manager/inspections": (manager.get_all_inspections(response=Response(), db=db), expected_ids("id")),
+        }
+    finally:
+        db.close()
+    for name, (rows, ids) in lists.items():
+        assert len(ids) > pagination.PAGE_SIZE_DEFAULT, f"{name}: only {len(ids)} rows seeded"
+        assert sorted(row["id"] for row in rows) == sorted(ids), f"{name}: {len(rows)} of {len(ids)} rows"
+
+def test_limit_is_capped():
+    assert pagination.page_limit(None) is None
+    assert pagination.page_limit(None, cursor="next") == pagination.PAGE_SIZE_DEFAULT
+    assert pagination.page_limit(10**6) == pagination.PAGE_SIZE_MAX
+    assert pagination.page_limit(0) == 1
+
+def test_bad_cursors_are_rejected():
+    scheduled_cursor = pagination.encode_cursor(models.Inspection.scheduled_date, date(2025, 1, 1), 5)
+    db = database.session()
+    try:
+        for cursor in ("not-a-cursor", scheduled_cursor):   # garbage; cursor of another list
+            try:
+                manager.get_all_inspections(response=Response(), cursor=cursor, db=db)
+            except HTTPException as e:
+                assert e.status_code == 400
+            else:
+                raise AssertionError(f"cursor {cursor!r} accepted")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_checks(__file__, "PAGINATION CHECKS")
@@ -0,0 +1,80 @@
+"""
+Password hashing checks.
+Verifies the Argon2 profile selection, silent re-hashing of hashes made with
+older parameters, and the hashing pool's fast rejection when saturated.
+
+Run with: python test_password_hashing.py  (or pytest test_password_hashing.py)
+"""
+import asyncio
+import threading
+
+from argon2 import PasswordHasher
+
+from checks import run_checks
+import hashing
+
+def test_profile_parameters():
+    params = hashing.get_argon2_params("owasp")
+    assert params == {"time_cost": 2, "memory_cost": 19456, "parallelism": 1}
+    try:
+        hashing.get_argon2_params("unknown")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown profile accepted")
+
+def test_outdated_hash_is_rehashed():
+    old_hash = PasswordHasher(time_cost=1, memory_cost=1024, parallelism=1).hash("secret123")
+    valid, new_hash = asyncio.run(hashing.verify_and_rehash_async("secret123", old_hash))
+    assert valid and new_hash and new_hash != old_hash
+    assert not hashing.get_password_hasher().check_needs_rehash(new_hash)
+    assert hashing.verify_password("secret123", new_hash)
+
+def test_current_hash_is_kept():
+    current_hash = hashing.hash_password("secret123")
+    assert asyncio.run(hashing.verify_and_rehash_async("secret123", current_hash)) == (True, None)
+
+def test_wrong_or_invalid_hash_is_rejected():
+    current_hash = hashing.hash_password("secret123")
+    assert asyncio.run(hashing.verify_and_rehash_async("wrong", current_hash)) == (False, None)
+    assert hashing.verify_password("secret123", "not-an-argon2-hash") is False
+
+def test_saturated_pool_rejects_immediately():
+    pool = hashing.HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    running = [pool.submit(release.wait), pool.submit(release.wait)]
+    try:
+        pool.submit(release.wait)
+    except hashing.HashingPoolSaturated:
+        pass
+    else:
+        raise AssertionError("third call was queued instead of rejected")
+    finally:
+        release.set()
+    for future in running:
+        future.result()
+    stats = pool.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 2 and stats["in_flight"] == 0
+
+def test_cancelled_queued_hash_frees_its_slot():
+    pool = hashing.HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    running = pool.submit(release.wait)
+    async def cancel_queued_hash():
+        task = asyncio.ensure_future(pool.run_async(release.wait))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    try:
+        asyncio.run(cancel_queued_hash())
+    finally:
+        release.set()
+    running.result()
+    assert pool.stats()["in_flight"] == 0, "slot of the cancelled hash was never released"
+    pool.submit(release.wait).result()   # and the pool still accepts work
+
+if __name__ == "__main__":
+    run_checks(__file__, "PASSWORD HASHING CHECKS")
@@ -0,0 +1,121 @@
+"""
+Principal cache checks.
+Calls auth.get_current_user directly against a throwaway SQLite database and
+verifies that repeated requests skip the user query, and that profile
+changes, deactivation and deletion are visible on the very next request.
+
+Run with: python test_principal_cache.py  (or pytest test_principal_cache.py)
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from auth import create_access_token, get_current_user
+from checks import CheckDatabase, add_users, run_checks
+from principal_cache import principal_cache, PrincipalCache
+from query_stats import track_queries
+import models
+
+database = CheckDatabase("principal")
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db)
+    db.commit()
+    db.close()
+
+def token_for(user_id, username):
+    return create_access_token({"sub": username, "user_id": user_id, "role": "inspector"})
+
+def current_user(token):
+    """Resolve a token the way a request does; returns (user attributes, statements run)"""
+    db = database.session()
+    try:
+        with track_queries() as stats:
+            user = get_current_user(token=token, db=db)
+        return {"id": user.id, "username": user.username, "is_active": user.is_active}, stats.count
+    finally:
+        db.close()
+
+def update_user(user_id, **values):
+    db = database.session()
+    user = db.get(models.User, user_id)
+    for key, value in values.items():
+        setattr(user, key, value)
+    db.commit()
+    db.close()
+
+def test_repeated_requests_skip_user_query():
+    principal_cache.clear()
+    token = token_for(2, "inspector")
+    user, first = current_user(token)
+    _, second = current_user(token)
+    assert user["username"] == "inspector"
+    assert first == 1 and second == 0, (first, second)
+
+def test_cached_user_can_be_modified():
+    principal_cache.clear()
+    token = token_for(2, "inspector")
+    current_user(token)
+    db = database.session()
+    user = get_current_user(token=token, db=db)
+    user.phone = "555-0100"
+    db.commit()
+    db.close()
+    db = database.session()
+    assert db.get(models.User, 2).phone == "555-0100"
+    db.close()
+
+def test_profile_change_is_visible_immediately():
+    principal_cache.clear()
+    token = token_for(2, "inspector")
+    current_user(token)
+    update_user(2, username="inspector_renamed", is_active=0)
+    user, count = current_user(token)
+    assert count == 1, "expected a fresh user query after the update"
+    assert user["username"] == "inspector_renamed" and user["is_active"] == 0
+    update_user(2, username="inspector", is_active=1)
+
+def test_deleted_user_is_rejected():
+    principal_cache.clear()
+    db = database.session()
+    db.add(models.User(id=3, username="temp", staff_id="S003", password_hash="x", role=models.RoleEnum.inspector))
+    db.commit()
+    db.close()
+    token = token_for(3, "temp")
+    current_user(token)
+    db = database.session()
+    db.delete(db.get(models.User, 3))
+    db.commit()
+    db.close()
+    try:
+        current_user(token)
+    except HTTPException as e:
+        assert e.status_code == 401
+    else:
+        raise AssertionError("deleted user was still authenticated")
+
+def test_stale_snapshot_is_not_cached():
+    cache = PrincipalCache(maxsize=10, ttl=30)
+    generation = cache.generation(2)
+    cache.invalidate_user(2)   # user changed while the request was loading it
+    cache.put("token", 2, {"id": 2}, generation)
+    assert cache.get("token") is None
+
+def test_entry_never_outlives_token():
+    cache = PrincipalCache(maxsize=10, ttl=30)
+    cache.put("expired", 2, {"id": 2}, cache.generation(2), token_expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+
+def test_cache_is_bounded():
+    cache = PrincipalCache(maxsize=2, ttl=30)
+    for i in range(3):
+        cache.put(f"token{i}", i, {"id": i}, cache.generation(i))
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1
+    assert cache.get("token0") is None
+
+if __name__ == "__main__":
+    run_checks(__file__, "PRINCIPAL CACHE CHECKS")
@@ -0,0 +1,171 @@
+"""
+Query budget checks for the API routes.
+Seeds a throwaway SQLite database with several inspectors, inspections,
+reports, message threads and reminders, points the app's database
+dependencies at it, calls each route through a TestClient and fails when
+it runs more SQL statements than its declared budget (read from the
+X-Query-Count header). Budgets include the one statement spent on
+authentication. Lazy loads raise during the checks (see conftest.py), so a
+route that lazy-loads per row fails outright.
+
+Run with: python test_query_budgets.py  (or pytest test_query_budgets.py)
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import InvalidRequestError, OperationalError
+from sqlalchemy.orm import joinedload
+
+from checks import CheckDatabase, add_users, run_checks
+from db import get_db, get_read_db
+from bootstrap import bootstrap_lock, init_default_locations
+from auth import get_password_hash
+from query_stats import assert_route_query_budget, track_queries
+import models
+import main
+
+database = CheckDatabase("budget")
+
+def get_test_db():
+    db = database.session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+PASSWORD = "password123"
+
+# (path, role, budget)
+ROUTE_BUDGETS = [
+    ("/dashboard/stats", "inspector", 2),
+    ("/dashboard/stats?period=month", "manager", 2),
+    ("/dashboard/my-tasks", "inspector", 2),
+    ("/dashboard/history", "inspector", 3),   # page + total_count
+    ("/dashboard/inspections/all?limit=5&include_total=true", "inspector", 3),
+    ("/dashboard/inspections/all", "manager", 2),
+    ("/dashboard/inspections/completed", "manager", 2),
+    ("/dashboard/inspections/pending-review", "manager", 2),
+    ("/dashboard/inspections/scheduled", "manager", 2),
+    ("/dashboard/inspections/completed-this-month", "manager", 2),
+    ("/dashboard/inspections/recent", "manager", 2),
+    ("/dashboard/bootstrap", "manager", 6),
+    ("/dashboard/bootstrap", "inspector", 6),
+    ("/manager/inspections", "manager", 2),
+    ("/manager/inspections?limit=5&include_total=true", "manager", 3),
+    ("/manager/pending/inspections", "manager", 2),
+    ("/manager/pending/reports", "manager", 2),
+    ("/manager/inspectors", "manager", 4),   # inspectors + counters + reports
+    ("/messaging/unread-count", "inspector", 2),
+    ("/messaging/threads", "inspector", 3),   # threads + their first/latest messages
+    ("/messaging/my-messages", "inspector", 2),
+    ("/messaging/inspection/1", "inspector", 2),
+    ("/messaging/reminder/my-reminders", "inspector", 2),
+    ("/messaging/reminder/pending", "inspector", 2),
+    ("/messaging/users", "inspector", 2),
+    ("/api/locations", "inspector", 2),
+    ("/profile/users", "manager", 2),
+]
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    with bootstrap_lock(database.engine) as conn:   # what the app lifespan does at startup
+        init_default_locations(conn)
+    db = database.session()
+    users = add_users(db, inspectors=4, password_hash=get_password_hash(PASSWORD))
+    inspectors = users[1:]
+    statuses = list(models.InspectionStatusEnum)
+    for i in range(24):
+        inspector = inspectors[i % len(inspectors)]
+        inspection = models.Inspection(
+            title=f"Inspection {i}",
+            location="Building A",
+            inspector_id=inspector.id,
+            status=statuses[i % len(statuses)],
+            scheduled_date=date.today() - timedelta(days=i),
+            completion_date=date.today() if statuses[i % len(statuses)] == models.InspectionStatusEnum.completed else None,
+            created_at=datetime.now(),
+        )
+        db.add(inspection)
+        db.flush()
+        db.add(models.Report(title=f"Report {i}", inspection_id=inspection.id, created_by=inspector.id,
+                             status=models.ReportStatusEnum.approved if i % 2 else models.ReportStatusEnum.pending_review))
+        db.add(models.Reminder(inspection_id=inspection.id, user_id=inspector.id, title=f"Reminder {i}",
+                               remind_at=datetime.now() - timedelta(hours=1)))
+        for sender, receiver in ((users[0], inspector), (inspector, users[0])):
+            user_ids = sorted([sender.id, receiver.id])
+            db.add(models.Message(
+                thread_id=f"inspection_{inspection.id}_user_{user_ids[0]}_{user_ids[1]}",
+                inspection_id=inspection.id, sender_id=sender.id, receiver_id=receiver.id,
+                content=f"Message about inspection {i}", created_at=datetime.now(),
+            ))
+    db.commit()
+    db.close()
+
+@pytest.fixture(scope="module")
+def client():
+    main.app.dependency_overrides[get_db] = get_test_db
+    main.app.dependency_overrides[get_read_db] = get_test_db
+    try:
+        yield TestClient(main.app)
+    finally:
+        main.app.dependency_overrides.clear()
+
+@pytest.fixture(scope="module")
+def headers(client):
+    """Authorization headers per role, from a real login"""
+    def login(username):
+        response = client.post("/auth/login", json={"username": username, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return {"manager": login("manager"), "inspector": login("inspector1")}
+
+def test_route_query_budgets(client, headers):
+    failures = []
+    for path, role, budget in ROUTE_BUDGETS:
+        try:
+            assert_route_query_budget(client, "GET", path, budget, headers=headers[role])
+        except AssertionError as e:
+            failures.append(str(e))
+    assert not failures, "\n".join(failures)
+
+def test_metrics_are_manager_only(client, headers):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=headers["inspector"]).status_code == 403
+    response = client.get("/metrics", headers=headers["manager"])
+    assert response.status_code == 200 and "login_throttle" in response.json()
+    assert "/metrics" not in main.app.openapi()["paths"]
+
+def test_lazy_loads_raise():
+    db = database.session()
+    try:
+        report = db.query(models.Report).first()
+        try:
+            report.inspection
+        except InvalidRequestError as e:
+            assert "lazy='raise'" in str(e), e
+        else:
+            raise AssertionError("lazy load of Report.inspection ran a query instead of raising")
+    finally:
+        db.close()
+    db = database.session()
+    try:
+        report = db.query(models.Report).options(joinedload(models.Report.inspection)).first()
+        assert report.inspection.title, "eager-loaded relationship not available"
+    finally:
+        db.close()
+
+def test_failed_statements_are_counted_and_released():
+    with CheckDatabase("errors").engine.connect() as conn:
+        with track_queries() as stats:
+            for _ in range(3):
+                try:
+                    conn.execute(text("SELECT * FROM missing_table"))
+                except OperationalError:
+                    pass
+        assert stats.count == 3
+        assert conn.info["query_start_time"] == [], "start times of failed statements left on the connection"
+
+if __name__ == "__main__":
+    run_checks(__file__, "QUERY BUDGET CHECKS")
@@ -0,0 +1,146 @@
+"""
+Query plan checks for the hot role-filtered queries.
+Runs the real route functions against a throwaway SQLite database, captures
+every SELECT they issue and asserts on EXPLAIN QUERY PLAN that none of them
+falls back to a full table scan. SQLite only: skipped when
+TEST_DATABASE_URL points the checks at PostgreSQL.
+
+Run with: python test_query_plans.py  (or pytest test_query_plans.py)
+"""
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import Response
+from sqlalchemy import event
+
+from checks import SQLITE_ONLY, CheckDatabase, add_users, run_checks
+from db import Base
+import models
+import dashboard
+import manager
+import messaging
+
+pytestmark = SQLITE_ONLY   # EXPLAIN QUERY PLAN output
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+database = CheckDatabase("plans")
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db)
+    db.flush()
+    for i in range(20):
+        db.add(models.Inspection(
+            title=f"Inspection {i}",
+            location="Building A",
+            inspector_id=2,
+            status=list(models.InspectionStatusEnum)[i % 4],
+            scheduled_date=date(2025, 1 + i % 12, 1),
+            created_at=datetime.now(),
+        ))
+    db.flush()
+    db.add(models.Message(thread_id="user_1_2", sender_id=1, receiver_id=2, content="hello", created_at=datetime.now()))
+    db.add(models.Reminder(inspection_id=1, user_id=2, title="Follow up", remind_at=datetime.now() - timedelta(hours=1)))
+    db.commit()
+    db.close()
+
+def query_plans(route, **kwargs):
+    """Call a route function and return (sql, plan details) for every SELECT it runs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    db = database.session()
+    event.listen(database.engine, "before_cursor_execute", capture)
+    try:
+        user_id = kwargs.pop("user_id", None)
+        if user_id is not None:
+            kwargs["current_user"] = db.get(models.User, user_id)
+            statements.clear()
+        route(db=db, **kwargs)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", capture)
+        db.close()
+
+    plans = []
+    with database.engine.connect() as conn:
+        raw = conn.connection.driver_connection
+        for statement, parameters in statements:
+            rows = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+def assert_no_full_scan(route, **kwargs):
+    plans = query_plans(route, **kwargs)
+    assert plans, f"{route.__name__} issued no queries"
+    for statement, details in plans:
+        for detail in details:
+            scan = FULL_SCAN.match(detail)
+            # Scanning a subquery's result (anon_N) reads no table directly
+            assert not (scan and scan.group(1) in Base.metadata.tables), (
+                f"{route.__name__} does a full table scan ({detail}):\n{statement}"
+            )
+    return plans
+
+def assert_uses_index(plans, index_name):
+    details = [detail for _, statement_details in plans for detail in statement_details]
+    assert any(index_name in detail for detail in details), f"{index_name} not used: {details}"
+
+def test_my_tasks_uses_inspector_index():
+    plans = assert_no_full_scan(dashboard.get_my_tasks, user_id=2, response=Response())
+    assert_uses_index(plans, "ix_inspections_inspector_scheduled_id")
+
+def test_scheduled_uses_inspector_index():
+    plans = assert_no_full_scan(dashboard.get_scheduled, user_id=2, response=Response())
+    assert_uses_index(plans, "ix_inspections_inspector_status_scheduled")
+
+def test_pending_inspections_uses_status_index():
+    plans = assert_no_full_scan(manager.get_pending_inspections)
+    assert_uses_index(plans, "ix_inspections_status_created")
+
+def test_paged_lists_read_pages_in_index_order():
+    for route, index_name in (
+        (dashboard.get_all_inspections, "ix_inspections_scheduled_id"),
+        (dashboard.get_completed_inspections, "ix_inspections_status_completion_id"),
+        (dashboard.get_pending_review_inspections, "ix_inspections_status_created"),
+    ):
+        plans = assert_no_full_scan(route, user_id=1, response=Response())
+        assert_uses_index(plans, index_name)
+        assert not any("TEMP B-TREE" in detail for _, details in plans for detail in details), (
+            f"{route.__name__} sorts the whole list instead of reading one page: {plans}")
+    plans = assert_no_full_scan(manager.get_all_inspections, response=Response())
+    assert_uses_index(plans, "ix_inspections_created_id")
+
+def test_history_date_filters_seek_the_inspector_index():
+    for filters in ({"month": 3, "year": 2025}, {"year": 2025}, {"month": 3},
+                    {"date_from": date(2025, 2, 1), "date_to": date(2025, 4, 30)}):
+        plans = assert_no_full_scan(dashboard.get_inspection_history, user_id=2, response=Response(), **filters)
+        details = [detail for _, statement_details in plans for detail in statement_details]
+        assert any("ix_inspections_inspector_scheduled_id (inspector_id=? AND scheduled_date>? AND scheduled_date<?)"
+                   in detail for detail in details), (filters, details)
+
+def test_completed_this_month_seeks_completion_indexes():
+    plans = assert_no_full_scan(dashboard.get_completed_this_month, user_id=2)
+    assert_uses_index(plans, "ix_inspections_inspector_status_completion")
+    plans = assert_no_full_scan(dashboard.get_completed_this_month, user_id=1)
+    assert_uses_index(plans, "ix_inspections_status_completion_id")
+
+def test_unread_count_uses_receiver_index():
+    plans = assert_no_full_scan(messaging.get_unread_count, user_id=2)
+    assert_uses_index(plans, "ix_messages_receiver_status")
+
+def test_threads_use_thread_index():
+    plans = assert_no_full_scan(messaging.get_threads, user_id=2)
+    assert_uses_index(plans, "ix_messages_thread_created")
+
+def test_pending_reminders_use_reminder_index():
+    plans = assert_no_full_scan(messaging.get_pending_reminders, user_id=2)
+    assert_uses_index(plans, "ix_reminders_user_status_remind")
+
+if __name__ == "__main__":
+    run_checks(__file__, "QUERY PLAN CHECKS")
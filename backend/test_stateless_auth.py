@@ -0,0 +1,117 @@
+"""
+Stateless auth checks (AUTH_MODE=stateless).
+Calls the auth dependencies and /auth/refresh handler directly against a
+throwaway SQLite database and verifies that manager-only authorization runs
+no SQL, that refresh tokens re-check the user and are single use, and that
+access and refresh tokens cannot stand in for each other.
+
+Run with: python test_stateless_auth.py  (or pytest test_stateless_auth.py)
+"""
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+
+import auth
+from checks import CheckDatabase, add_users, run_checks
+import manager
+import schemas
+from query_stats import track_queries
+import models
+
+database = CheckDatabase("stateless")
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db)
+    db.commit()
+    db.close()
+
+@contextmanager
+def stateless():
+    previous, auth.AUTH_MODE = auth.AUTH_MODE, "stateless"
+    try:
+        yield
+    finally:
+        auth.AUTH_MODE = previous
+
+def login_tokens(user_id):
+    db = database.session()
+    try:
+        return auth.issue_tokens(db.get(models.User, user_id))
+    finally:
+        db.close()
+
+def call(dependency, *args):
+    """Run a handler with a fresh session; returns (result or HTTPException, statements run)"""
+    db = database.session()
+    try:
+        with track_queries() as stats:
+            try:
+                result = dependency(*args, db=db)
+            except HTTPException as e:
+                result = e
+        return result, stats.count
+    finally:
+        db.close()
+
+def set_active(user_id, is_active):
+    db = database.session()
+    db.get(models.User, user_id).is_active = is_active
+    db.commit()
+    db.close()
+
+def test_manager_authorization_runs_no_queries():
+    with stateless():
+        tokens = login_tokens(1)
+        principal, count = call(auth.get_current_principal, tokens["access_token"])
+        assert count == 0, f"{count} statements to authorize a manager"
+        assert manager.require_manager(principal).username == "manager"
+        inspector, _ = call(auth.get_current_principal, login_tokens(2)["access_token"])
+        try:
+            manager.require_manager(inspector)
+        except HTTPException as e:
+            assert e.status_code == 403
+        else:
+            raise AssertionError("inspector passed require_manager")
+
+def test_refresh_rotates_tokens():
+    with stateless():
+        tokens = login_tokens(2)
+        assert tokens["refresh_token"]
+        new_tokens, _ = call(auth.refresh, schemas.RefreshRequest(refresh_token=tokens["refresh_token"]))
+        assert isinstance(new_tokens, dict) and new_tokens["refresh_token"] != tokens["refresh_token"]
+        reused, _ = call(auth.refresh, schemas.RefreshRequest(refresh_token=tokens["refresh_token"]))
+        assert isinstance(reused, HTTPException) and reused.status_code == 401, "refresh token reused"
+
+def test_refresh_rechecks_deactivated_user():
+    with stateless():
+        tokens = login_tokens(2)
+        set_active(2, 0)
+        try:
+            result, _ = call(auth.refresh, schemas.RefreshRequest(refresh_token=tokens["refresh_token"]))
+            assert isinstance(result, HTTPException) and result.status_code == 403
+        finally:
+            set_active(2, 1)
+
+def test_token_types_are_not_interchangeable():
+    with stateless():
+        tokens = login_tokens(1)
+        as_access, _ = call(auth.get_current_principal, tokens["refresh_token"])
+        assert isinstance(as_access, HTTPException) and as_access.status_code == 401
+        as_refresh, _ = call(auth.refresh, schemas.RefreshRequest(refresh_token=tokens["access_token"]))
+        assert isinstance(as_refresh, HTTPException) and as_refresh.status_code == 401
+
+def test_database_mode_is_unchanged():
+    tokens = login_tokens(1)
+    assert "refresh_token" not in tokens
+    user, _ = call(auth.get_current_principal, tokens["access_token"])
+    assert isinstance(user, models.User) and user.username == "manager"
+    with stateless():
+        # Tokens issued before switching modes fall back to the user row
+        user, _ = call(auth.get_current_principal, tokens["access_token"])
+        assert isinstance(user, models.User)
+
+if __name__ == "__main__":
+    run_checks(__file__, "STATELESS AUTH CHECKS")
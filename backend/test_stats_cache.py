@@ -0,0 +1,99 @@
+"""
+Stats cache checks.
+Calls the statistics routes directly against a throwaway SQLite database and
+verifies that repeated polls are served without SQL, that inspection and
+report transitions drop exactly the affected entries, and that the cache
+stays bounded.
+
+Run with: python test_stats_cache.py  (or pytest test_stats_cache.py)
+"""
+from datetime import date
+
+import pytest
+
+from checks import CheckDatabase, add_users, run_checks
+import dashboard
+import manager
+import models
+from query_stats import track_queries
+from stats_cache import StatsCache, stats_cache
+
+database = CheckDatabase("stats_cache")
+Status = models.InspectionStatusEnum
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db, inspectors=2)
+    for i in range(6):
+        db.add(models.Inspection(id=i + 1, title=f"Inspection {i}", inspector_id=2 + i % 2,
+                                 status=Status.pending_review, scheduled_date=date.today()))
+    db.commit()
+    db.close()
+
+def call(route, **kwargs):
+    """Run a route with a fresh session; returns (response, statements run)"""
+    db = database.session()
+    try:
+        with track_queries() as stats:
+            result = route(db=db, **kwargs)
+        return result, stats.count
+    finally:
+        db.close()
+
+def user(user_id):
+    db = database.session()
+    try:
+        found = db.get(models.User, user_id)
+        db.expunge(found)
+        return found
+    finally:
+        db.close()
+
+def approve(inspection_id):
+    call(manager.approve_inspection, inspection_id=inspection_id, notes=None, current_user=user(1))
+
+def test_repeated_polls_skip_sql():
+    stats_cache.clear()
+    manager_user = user(1)
+    first, first_count = call(dashboard.get_dashboard_stats, period="month", current_user=manager_user)
+    second, second_count = call(dashboard.get_dashboard_stats, period="month", current_user=manager_user)
+    assert first_count >= 1 and second_count == 0, (first_count, second_count)
+    assert first == second
+    _, list_count = call(manager.get_inspectors, period="all")
+    _, cached_list_count = call(manager.get_inspectors, period="all")
+    assert list_count >= 1 and cached_list_count == 0
+
+def test_transition_refreshes_manager_view():
+    stats_cache.clear()
+    manager_user = user(1)
+    before, _ = call(dashboard.get_dashboard_stats, period="all", current_user=manager_user)
+    approve(1)
+    after, count = call(dashboard.get_dashboard_stats, period="all", current_user=manager_user)
+    assert count >= 1, "stale stats served after an approval"
+    assert after["completed"] == before["completed"] + 1
+
+def test_only_affected_inspector_is_dropped():
+    stats_cache.clear()
+    call(manager.get_inspector_stats, inspector_id=2, period="all")
+    call(manager.get_inspector_stats, inspector_id=3, period="all")
+    approve(2)   # inspection 2 belongs to inspector 3
+    _, unaffected = call(manager.get_inspector_stats, inspector_id=2, period="all")
+    refreshed, affected = call(manager.get_inspector_stats, inspector_id=3, period="all")
+    assert unaffected == 0 and affected >= 1, (unaffected, affected)
+    assert refreshed["completed_inspections"] == 1
+
+def test_result_computed_during_invalidation_is_not_cached():
+    cache = StatsCache(maxsize=10, ttl=30)
+    cache.get_or_compute(("k", 1, "all", None), lambda: cache.invalidate([1]) or "stale")
+    assert cache.get_or_compute(("k", 1, "all", None), lambda: "fresh") == "fresh"
+
+def test_cache_is_bounded():
+    cache = StatsCache(maxsize=2, ttl=30)
+    for i in range(3):
+        cache.get_or_compute(("k", i, "all", None), lambda: i)
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1 and stats["misses"] == 3
+
+if __name__ == "__main__":
+    run_checks(__file__, "STATS CACHE CHECKS")
@@ -0,0 +1,112 @@
+"""
+Token revocation checks.
+Runs auth.get_current_user against a throwaway SQLite database and verifies
+that deactivation (per-user "not before"), a password change and logout
+(per-token jti) take effect on the next request without reading the users
+table, that tokens issued afterwards still work, and that other workers pick
+revocations up on their next sync.
+
+Run with: python test_token_revocation.py  (or pytest test_token_revocation.py)
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from auth import create_access_token, decode_access_token, get_current_user, get_password_hash
+from checks import CheckDatabase, add_users, run_checks
+import models
+from principal_cache import principal_cache
+from profile import PasswordUpdateRequest, update_my_password
+from revocation import RevocationStore, revocation_store
+from query_stats import track_queries
+
+database = CheckDatabase("revocation")
+
+@pytest.fixture(scope="module", autouse=True)
+def data(check_database):
+    db = database.session()
+    add_users(db, inspectors=2)   # inspector1 is id 2, inspector2 id 3
+    db.commit()
+    db.close()
+
+def token_for(user_id):
+    return create_access_token({"sub": f"inspector{user_id - 1}", "user_id": user_id, "role": "inspector"})
+
+def is_accepted(token):
+    db = database.session()
+    try:
+        get_current_user(token=token, db=db)
+        return True
+    except HTTPException as e:
+        assert e.status_code == 401
+        return False
+    finally:
+        db.close()
+
+def revoke(action, *args):
+    db = database.session()
+    action(db, *args)
+    db.commit()
+    db.close()
+
+def test_revoked_user_tokens_are_rejected_immediately():
+    token = token_for(2)
+    assert is_accepted(token)   # now cached by the principal cache
+    revoke(revocation_store.revoke_user, 2)
+    assert not is_accepted(token)
+    assert is_accepted(token_for(2)), "token issued after the revocation must work"
+
+def test_logout_revokes_only_that_token():
+    token, other = token_for(3), token_for(3)
+    claims = decode_access_token(token)
+    revoke(revocation_store.revoke_token, claims["jti"], 3, claims["exp"])
+    assert not is_accepted(token)
+    assert is_accepted(other)
+
+def test_revocation_check_does_not_read_users():
+    token = token_for(3)
+    claims = decode_access_token(token)
+    revoke(revocation_store.revoke_token, claims["jti"], 3, claims["exp"])
+    principal_cache.clear()
+    with track_queries() as stats:
+        assert not is_accepted(token)
+    assert stats.count == 0, f"{stats.count} statements for a revoked token"
+
+def test_other_workers_pick_up_revocations_on_sync():
+    other_worker = RevocationStore(engine=database.engine, sync_seconds=0)
+    other_worker.sync()
+    token = token_for(2)
+    claims = decode_access_token(token)
+    assert not other_worker.is_revoked(2, claims["jti"], claims["iat"])
+    time.sleep(0.01)
+    revoke(revocation_store.revoke_user, 2)
+    assert not other_worker.is_revoked(2, claims["jti"], claims["iat"])
+    other_worker.sync()
+    assert other_worker.is_revoked(2, claims["jti"], claims["iat"])
+
+def test_password_change_revokes_older_tokens():
+    token = token_for(3)
+    assert is_accepted(token)
+    db = database.session()
+    user = db.get(models.User, 3)
+    user.password_hash = get_password_hash("old-secret")
+    db.commit()
+    time.sleep(0.01)
+    result = update_my_password(
+        PasswordUpdateRequest(current_password="old-secret", new_password="new-secret"),
+        current_user=user, db=db,
+    )
+    db.close()
+    assert not is_accepted(token), "token issued before the password change still works"
+    assert is_accepted(result["access_token"]), "token returned by the change must work"
+
+def test_expired_rows_are_purged():
+    store = RevocationStore(engine=database.engine, sync_seconds=0)
+    revoke(revocation_store.revoke_token, "expired-jti", 2, time.time() - 1)
+    assert store.purge_expired() >= 1
+    store.sync()
+    assert "expired-jti" not in store._jtis
+
+if __name__ == "__main__":
+    run_checks(__file__, "TOKEN REVOCATION CHECKS")
@@ -0,0 +1,97 @@
+"""
+Write queue checks.
+Runs a WriteQueue against a throwaway database and verifies that
+writes whose callers gave up (cancelled task, timed-out run_write) are
+skipped instead of killing the writer thread, that a batch failing outside
+any single write does not stop later writes, and that run_write waits a
+bounded time.
+
+Run with: python test_write_queue.py  (or pytest test_write_queue.py)
+"""
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+from sqlalchemy import text
+
+from checks import CHECKS_ON_SQLITE, CheckDatabase, run_checks
+import write_queue
+from write_queue import WriteQueue, enable_sqlite_savepoints
+
+database = CheckDatabase("write_queue")
+
+@pytest.fixture
+def writes():
+    engine = database.create_engine(pool_size=1, max_overflow=0)
+    if CHECKS_ON_SQLITE:
+        enable_sqlite_savepoints(engine)   # as get_write_queue() does
+    yield WriteQueue(engine, max_delay_ms=0)
+    engine.dispose()
+
+def select_one(session):
+    return session.execute(text("SELECT 1")).scalar()
+
+def block_writer(writes):
+    """Occupy the writer thread until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+    def wait(session):
+        started.set()
+        release.wait(5)
+    blocking = writes.submit(wait)
+    assert started.wait(5)
+    return blocking, release
+
+def test_cancelled_task_does_not_kill_writer(writes):
+    ran = []
+    async def cancel_queued_write():
+        task = asyncio.ensure_future(asyncio.wrap_future(writes.submit(ran.append)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    blocking, release = block_writer(writes)
+    asyncio.run(cancel_queued_write())
+    release.set()
+    blocking.result(5)
+    assert writes.submit(select_one).result(5) == 1, "writer stopped after a cancelled write"
+    assert ran == [], "cancelled write was run"
+
+def test_failed_batch_does_not_kill_writer(writes):
+    session_factory = writes._session_factory
+    def broken_factory():
+        raise RuntimeError("database unavailable")
+    writes._session_factory = broken_factory
+    try:
+        with pytest.raises(RuntimeError):
+            writes.submit(select_one).result(5)
+    finally:
+        writes._session_factory = session_factory
+    assert writes.submit(select_one).result(5) == 1
+
+def test_run_write_wait_is_bounded(writes, monkeypatch):
+    monkeypatch.setattr(write_queue, "WRITE_QUEUE_ENABLED", True)
+    monkeypatch.setattr(write_queue, "WRITE_QUEUE_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(write_queue, "_write_queue", writes)
+    ran = []
+    blocking, release = block_writer(writes)
+    try:
+        with pytest.raises(TimeoutError):
+            write_queue.run_write(None, ran.append)
+    finally:
+        release.set()
+    blocking.result(5)
+    assert writes.submit(select_one).result(5) == 1
+    assert ran == [], "timed-out write was still run"
+
+def test_cancelled_future_reports_cancelled(writes):
+    blocking, release = block_writer(writes)
+    future = writes.submit(select_one)
+    assert future.cancel()
+    release.set()
+    blocking.result(5)
+    with pytest.raises(CancelledError):
+        future.result(5)
+
+if __name__ == "__main__":
+    run_checks(__file__, "WRITE QUEUE CHECKS")
@@ -0,0 +1,17 @@
+"""
+Non-blocking file upload helpers for async routes
+"""
+from pathlib import Path
+
+import anyio
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+async def save_upload_file(upload: UploadFile, destination: Path) -> Path:
+    """Stream an upload to disk in chunks without blocking the event loop"""
+    await anyio.Path(destination.parent).mkdir(parents=True, exist_ok=True)
+    async with await anyio.open_file(destination, "wb") as buffer:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
+    return destination
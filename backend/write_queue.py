@@ -0,0 +1,189 @@
+"""
+Group-Commit Write Queue
+Optional single-writer queue for high-frequency small writes (sending a
+message, marking it read, dismissing a reminder).
+
+Callers hand over a function that performs their write on a Session. One
+writer thread collects concurrent submissions for up to
+WRITE_QUEUE_MAX_DELAY_MS (or WRITE_QUEUE_MAX_BATCH writes), runs each one
+inside its own SAVEPOINT and commits the whole batch once - one fsync for
+many writes. Every caller gets its own result, or its own exception, only
+after the batch has been committed.
+
+Enable with WRITE_QUEUE_ENABLED=true. When disabled (the default),
+run_write() simply runs the function on the request session and commits, as
+before. The queue trades throughput for tail latency: in bench_write_queue.py
+(16 clients, SQLite) p99 latency fell from about 340-500 ms to about 40 ms,
+but writes/sec dropped by 0-40% (wal 755 -> 456 and 674 -> 582, wal_durable
+530 -> 448 and 618 -> 621 across runs), since every write now waits up to
+WRITE_QUEUE_MAX_DELAY_MS for its batch.
+
+A caller that stops waiting (cancelled request, WRITE_QUEUE_TIMEOUT_SECONDS
+elapsed) cancels its write if the writer has not started it yet.
+"""
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from db import DATABASE_URL, create_db_engine, is_sqlite_url
+
+WRITE_QUEUE_ENABLED = os.getenv("WRITE_QUEUE_ENABLED", "false").lower() in ("1", "true", "yes")
+WRITE_QUEUE_MAX_BATCH = int(os.getenv("WRITE_QUEUE_MAX_BATCH", 64))
+WRITE_QUEUE_MAX_DELAY_MS = float(os.getenv("WRITE_QUEUE_MAX_DELAY_MS", 2))
+WRITE_QUEUE_TIMEOUT_SECONDS = float(os.getenv("WRITE_QUEUE_TIMEOUT_SECONDS", 30))   # caller's wait for its commit
+
+logger = logging.getLogger(__name__)
+
+def enable_sqlite_savepoints(engine):
+    """
+    pysqlite only emits BEGIN lazily before DML, so a leading SAVEPOINT would
+    become the outer transaction. Take over transaction control and start
+    every transaction with BEGIN IMMEDIATE (the writer needs the lock anyway).
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+class WriteQueue:
+    """Batches submitted write functions into shared commits on one writer thread"""
+
+    def __init__(self, engine, max_batch: int = WRITE_QUEUE_MAX_BATCH, max_delay_ms: float = WRITE_QUEUE_MAX_DELAY_MS):
+        self._session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        self._max_batch = max_batch
+        self._max_delay = max_delay_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"writes": 0, "failed_writes": 0, "batches": 0, "max_batch_size": 0}
+
+    def submit(self, fn) -> Future:
+        """Queue fn(session) for the next batch; the Future resolves after its commit."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["avg_batch_size"] = round(stats["writes"] / stats["batches"], 2) if stats["batches"] else 0
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._commit_batch(batch)
+            except Exception as e:
+                # Never let one batch kill the writer: every later write would hang
+                logger.exception("Write queue batch failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _commit_batch(self, batch):
+        # Drop writes whose callers gave up; the rest can no longer be cancelled
+        batch = [(fn, future) for fn, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes = []
+        session = self._session_factory()
+        try:
+            for fn, future in batch:
+                # A failing write only rolls back its own savepoint
+                savepoint = session.begin_nested()
+                try:
+                    result = fn(session)
+                    savepoint.commit()
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    savepoint.rollback()
+                    outcomes.append((future, None, e))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            outcomes = [(future, None, exc or e) for future, _, exc in outcomes]
+            outcomes += [(future, None, e) for _, future in batch[len(outcomes):]]
+        finally:
+            session.close()
+
+        failed = sum(1 for _, _, exc in outcomes if exc is not None)
+        with self._stats_lock:
+            self._stats["writes"] += len(outcomes) - failed
+            self._stats["failed_writes"] += failed
+            self._stats["batches"] += 1
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(batch))
+
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+def get_write_queue() -> WriteQueue:
+    """The process-wide queue, with its own single-connection writer engine."""
+    global _write_queue
+    if _write_queue is None:
+        with _write_queue_lock:
+            if _write_queue is None:
+                writer_engine = create_db_engine(DATABASE_URL, pool_size=1, max_overflow=0)
+                if is_sqlite_url(DATABASE_URL):
+                    enable_sqlite_savepoints(writer_engine)
+                _write_queue = WriteQueue(writer_engine)
+    return _write_queue
+
+def run_write(db: Session, fn):
+    """Run fn(session) and commit - through the write queue when it is enabled."""
+    if WRITE_QUEUE_ENABLED:
+        future = get_write_queue().submit(fn)
+        try:
+            return future.result(timeout=WRITE_QUEUE_TIMEOUT_SECONDS)
+        except TimeoutError:
+            future.cancel()
+            raise
+    result = fn(db)
+    db.commit()
+    return result
+
+async def run_write_async(db, fn):
+    """Async variant of run_write for routes using an AsyncSession."""
+    if WRITE_QUEUE_ENABLED:
+        return await asyncio.wait_for(asyncio.wrap_future(get_write_queue().submit(fn)), WRITE_QUEUE_TIMEOUT_SECONDS)
+    result = await db.run_sync(fn)
+    await db.commit()
+    return result
@@ -53,13 +53,12 @@ class _DashboardModuleState extends State<DashboardModule> {
     });
 
     try {
-      final stats =
-          await DashboardService.getStats(period: _selectedPeriod.toShortString());
-      final inspections = await DashboardService.getRecentInspections(limit: 5);
+      final bootstrap = await DashboardService.getBootstrap(
+          period: _selectedPeriod.toShortString(), limit: 5);
 
       setState(() {
-        _statsData = stats;
-        _recentInspections = inspections;
+        _statsData = bootstrap['stats'];
+        _recentInspections = bootstrap['recent_inspections'] ?? [];
         _loading = false;
       });
     } catch (e) {
@@ -39,6 +39,9 @@ class AuthService {
     return response;
   }
 
+  // Store a token issued outside login (e.g. after a password change)
+  static Future<void> saveToken(String token) => _saveToken(token);
+
   // Save token to local storage
   static Future<void> _saveToken(String token) async {
     final prefs = await SharedPreferences.getInstance();
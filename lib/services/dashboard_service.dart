@@ -19,6 +19,22 @@ class DashboardService {
     return response;
   }
 
+  // Get everything the dashboard shows on launch in one request:
+  // stats, recent_inspections, recent_reports, unread_count, pending_reminders
+  static Future<Map<String, dynamic>> getBootstrap({String period = "all", int limit = 5}) async {
+    final token = await AuthService.getToken();
+
+    final response = await ApiService.get(
+      url: '${ApiConfig.baseUrl}/dashboard/bootstrap?period=$period&limit=$limit',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': 'Bearer $token',
+      },
+    );
+
+    return response;
+  }
+
   // Get inspector's assigned tasks
   static Future<List<dynamic>> getMyTasks() async {
     final token = await AuthService.getToken();
@@ -82,7 +82,12 @@ class ProfileService {
     );
 
     if (response.statusCode == 200) {
-      return json.decode(response.body);
+      final result = json.decode(response.body);
+      // The change revokes every older token, including this one
+      if (result['access_token'] != null) {
+        await AuthService.saveToken(result['access_token']);
+      }
+      return result;
     } else {
       final error = json.decode(response.body);
       throw Exception(error['detail'] ?? 'Failed to update password');